@@ -0,0 +1,328 @@
+"""
+Load-test the read API server (src/api_server.py).
+
+Serves a generated workspace (--db, or one generated in memory and written
+to a temporary file), then has --concurrency clients issue a fixed mix of
+agent requests for --duration seconds after a --warmup:
+
+    project tasks     /projects/{gid}/tasks with assignee/completion fields
+    task              /tasks/{gid} with notes, custom fields and tags
+    stories           /tasks/{gid}/stories
+    my open tasks     /tasks?assignee=..&workspace=..&completed_since=now
+    subtasks          /tasks/{gid}/subtasks
+    sections          /projects/{gid}/sections
+    tag tasks         /tags/{gid}/tasks
+    user teams        /users/{gid}/teams
+    field settings    /projects/{gid}/custom_field_settings
+
+Requests are drawn from --urls distinct URLs (fixed seed), so the response
+cache hit rate follows from --urls against --cache-size. With --conditional
+clients send the ETag they last saw (If-None-Match) and get 304s.
+
+Reports requests/s, p50/p99 latency (ms) overall and per request kind,
+and the share of responses served from the server's cache.
+
+Usage:
+    python benchmarks/bench_api.py --tasks-per-project 120 --concurrency 32
+    python benchmarks/bench_api.py --db output/asana_simulation.sqlite --cache-size 0
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import aiohttp
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.append(str(SRC_DIR))
+
+# Fixed clock so workspaces are comparable between runs
+REFERENCE_TIME = "2026-01-01T00:00:00"
+
+TASK_FIELDS = "name,notes,assignee,completed,due_on,custom_fields,tags"
+PAGE_FIELDS = "name,assignee,completed,due_on"
+
+# kind -> (weight, URL template, sample query for {gid})
+REQUEST_MIX = {
+    "project tasks": (
+        20,
+        "/projects/{gid}/tasks?limit=50&opt_fields=" + PAGE_FIELDS,
+        "SELECT project_id FROM projects",
+    ),
+    "task": (25, "/tasks/{gid}?opt_fields=" + TASK_FIELDS, "SELECT task_id FROM tasks"),
+    "stories": (
+        15,
+        "/tasks/{gid}/stories",
+        "SELECT DISTINCT task_id FROM comments",
+    ),
+    "my open tasks": (
+        10,
+        "/tasks?assignee={gid}&workspace={workspace}&completed_since=now"
+        "&limit=50&opt_fields=" + PAGE_FIELDS,
+        "SELECT DISTINCT assignee_id FROM tasks WHERE assignee_id IS NOT NULL",
+    ),
+    "subtasks": (
+        10,
+        "/tasks/{gid}/subtasks",
+        "SELECT DISTINCT parent_task_id FROM subtasks",
+    ),
+    "sections": (5, "/projects/{gid}/sections", "SELECT project_id FROM projects"),
+    "tag tasks": (5, "/tags/{gid}/tasks?limit=50", "SELECT tag_id FROM tags"),
+    "user teams": (
+        5,
+        "/users/{gid}/teams",
+        "SELECT DISTINCT user_id FROM team_memberships",
+    ),
+    "field settings": (
+        5,
+        "/projects/{gid}/custom_field_settings",
+        "SELECT project_id FROM projects",
+    ),
+}
+
+
+def percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def build_workload(db_path: Path, count: int, seed: int = 0) -> list:
+    """
+    Draw count (kind, path) requests following REQUEST_MIX.
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+    workspace = conn.execute("SELECT org_id FROM organizations").fetchone()[0]
+    gids = {
+        kind: [row[0] for row in conn.execute(sample)]
+        for kind, (_, _, sample) in REQUEST_MIX.items()
+    }
+    conn.close()
+
+    kinds = [kind for kind in REQUEST_MIX if gids[kind]]
+    weights = [REQUEST_MIX[kind][0] for kind in kinds]
+
+    workload = []
+    for kind in rng.choices(kinds, weights, k=count):
+        template = REQUEST_MIX[kind][1]
+        path = template.format(gid=rng.choice(gids[kind]), workspace=workspace)
+        workload.append((kind, path))
+
+    return workload
+
+
+def generate_database(args, path: Path) -> float:
+    os.environ.update(
+        {
+            "NUM_USERS": str(args.users),
+            "NUM_TEAMS": str(args.teams),
+            "PROJECTS_PER_TEAM": str(args.projects_per_team),
+            "TASKS_PER_PROJECT": str(args.tasks_per_project),
+            "REFERENCE_TIME": os.environ.get("REFERENCE_TIME", REFERENCE_TIME),
+        }
+    )
+
+    from loguru import logger
+
+    logger.remove()
+
+    from main import generate_in_memory, load_config
+    from utils.db import persist_database
+
+    start = time.perf_counter()
+    conn = generate_in_memory(load_config())
+    persist_database(conn, path)
+    conn.close()
+
+    return time.perf_counter() - start
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db_path: Path, port: int, pool_size: int, cache_size: int):
+    env = {
+        **os.environ,
+        "DB_PATH": str(db_path),
+        "API_HOST": "127.0.0.1",
+        "API_PORT": str(port),
+        "API_POOL_SIZE": str(pool_size),
+        "API_CACHE_SIZE": str(cache_size),
+    }
+    return subprocess.Popen(
+        [sys.executable, str(SRC_DIR / "api_server.py")],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base: str, server, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise RuntimeError("API server exited during startup")
+            try:
+                async with session.get(f"{base}/workspaces") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+
+    raise RuntimeError(f"API server not ready after {timeout}s")
+
+
+async def client(session, base, workload, rng, deadline, conditional, samples):
+    etags = {}
+
+    while time.monotonic() < deadline:
+        kind, path = rng.choice(workload)
+        headers = {}
+        if conditional and path in etags:
+            headers["If-None-Match"] = etags[path]
+
+        start = time.perf_counter()
+        async with session.get(base + path, headers=headers) as response:
+            await response.read()
+        elapsed = time.perf_counter() - start
+
+        if "ETag" in response.headers:
+            etags[path] = response.headers["ETag"]
+
+        if samples is not None:
+            samples.append(
+                (kind, elapsed, response.status, response.headers.get("X-Cache"))
+            )
+
+
+async def load(base, workload, args) -> tuple:
+    """
+    Run the warmup, then the measured phase.
+
+    Returns:
+        tuple: (samples, measured seconds)
+    """
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+
+        async def phase(seconds: float, samples):
+            deadline = time.monotonic() + seconds
+            await asyncio.gather(
+                *(
+                    client(
+                        session,
+                        base,
+                        workload,
+                        random.Random(i),
+                        deadline,
+                        args.conditional,
+                        samples,
+                    )
+                    for i in range(args.concurrency)
+                )
+            )
+
+        await phase(args.warmup, None)
+
+        samples = []
+        start = time.perf_counter()
+        await phase(args.duration, samples)
+
+        return samples, time.perf_counter() - start
+
+
+def report(samples: list, seconds: float):
+    by_kind = defaultdict(list)
+    for sample in samples:
+        by_kind[sample[0]].append(sample)
+
+    print(
+        f"\n{'request':<16} {'count':>8} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'cached':>7} {'errors':>7}"
+    )
+
+    for kind in [*REQUEST_MIX, "all"]:
+        rows = samples if kind == "all" else by_kind.get(kind)
+        if not rows:
+            continue
+
+        latencies = [elapsed * 1000 for _, elapsed, _, _ in rows]
+        cached = sum(1 for *_, cache in rows if cache == "hit")
+        errors = sum(1 for _, _, status, _ in rows if status >= 400)
+
+        print(
+            f"{kind:<16} {len(rows):>8,} {percentile(latencies, 0.50):>8.2f} "
+            f"{percentile(latencies, 0.99):>8.2f} "
+            f"{cached / len(rows):>6.0%} {errors:>7,}"
+        )
+
+    statuses = Counter(status for _, _, status, _ in samples)
+    print(
+        f"\n{len(samples):,} requests in {seconds:.1f}s: "
+        f"{len(samples) / seconds:,.0f} requests/s "
+        f"(status {', '.join(f'{s}: {n:,}' for s, n in sorted(statuses.items()))})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", type=Path, help="Serve this database")
+    parser.add_argument("--tasks-per-project", type=int, default=120)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--teams", type=int, default=25)
+    parser.add_argument("--projects-per-team", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=2)
+    parser.add_argument("--urls", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--conditional", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-api-") as workdir:
+        db_path = args.db
+        if db_path is None:
+            db_path = Path(workdir) / "workspace.sqlite"
+            seconds = generate_database(args, db_path)
+            print(f"Generated {db_path.stat().st_size / 2**20:.1f} MiB in {seconds:.2f}s")
+
+        workload = build_workload(db_path, args.urls)
+
+        port = free_port()
+        base = f"http://127.0.0.1:{port}/api/1.0"
+        server = start_server(db_path, port, args.pool_size, args.cache_size)
+
+        try:
+            asyncio.run(wait_ready(base, server))
+            print(
+                f"{args.concurrency} clients, {len(set(workload)):,} distinct URLs, "
+                f"pool {args.pool_size}, cache {args.cache_size}"
+                f"{', conditional' if args.conditional else ''}"
+            )
+            samples, seconds = asyncio.run(load(base, workload, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+    report(samples, seconds)
+
+
+if __name__ == "__main__":
+    main()
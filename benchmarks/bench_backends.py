@@ -0,0 +1,118 @@
+"""
+Compare the pure-Python and NumPy generation backends for tasks and subtasks.
+
+Rows are built exactly as the pipeline builds them (same shard functions),
+but not written anywhere, so the numbers isolate row construction.
+
+Usage:
+    python benchmarks/bench_backends.py --tasks 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from generators.projects import PROJECT_TYPES  # noqa: E402
+from generators.sections import DEFAULT_SECTIONS, project_section_ids  # noqa: E402
+from generators.subtasks import _subtask_shard  # noqa: E402
+from generators.tasks import _task_shard  # noqa: E402
+from utils.graph import PackedUuids, WorkspaceGraph  # noqa: E402
+from utils.parallel import iter_chunks  # noqa: E402
+from utils.random import EntityIds  # noqa: E402
+
+
+def synthetic_graph(args, num_projects: int) -> WorkspaceGraph:
+    """
+    Registry of users, projects and sections for the task stage (one
+    empty team, so tasks are assigned across all users).
+    """
+    graph = WorkspaceGraph()
+    graph.user_ids = PackedUuids(EntityIds(args.seed, "user", args.users))
+    graph.team_members.add_row([])
+    graph.project_ids = EntityIds(args.seed, "project", num_projects)
+    graph.section_ids = PackedUuids()
+
+    for project_index in range(num_projects):
+        graph.project_teams.append(0)
+        graph.project_types.append(project_index % len(PROJECT_TYPES))
+        graph.section_ids.extend(project_section_ids(args.seed, project_index))
+        graph.project_sections.add_run(len(DEFAULT_SECTIONS))
+
+    return graph
+
+
+def run_backend(backend: str, args) -> dict:
+    num_projects = max(1, args.tasks // args.tasks_per_project)
+
+    config = {
+        "random_seed": args.seed,
+        "tasks_per_project": args.tasks_per_project,
+        "history_days": 180,
+        "subtask_ratio": 0.3,
+        "backend": backend,
+    }
+    graph = synthetic_graph(args, num_projects)
+
+    start = time.perf_counter()
+    task_ids = []
+    for project_index in range(num_projects):
+        task_ids.extend(
+            row[0] for row in _task_shard(project_index, (graph, config))
+        )
+    task_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    context = (graph.user_ids, config)
+    num_subtasks = sum(
+        len(rows)
+        for rows, _ in (
+            _subtask_shard(shard, context) for shard in iter_chunks(task_ids)
+        )
+    )
+    subtask_seconds = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "tasks": len(task_ids),
+        "task_seconds": task_seconds,
+        "subtasks": num_subtasks,
+        "subtask_seconds": subtask_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--tasks-per-project", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--backends", nargs="+", default=["python", "numpy"]
+    )
+    args = parser.parse_args()
+
+    results = [run_backend(backend, args) for backend in args.backends]
+
+    print(f"{'backend':<8} {'tasks/s':>12} {'subtasks/s':>12} {'total s':>9}")
+    for r in results:
+        print(
+            f"{r['backend']:<8} "
+            f"{r['tasks'] / r['task_seconds']:>12,.0f} "
+            f"{r['subtasks'] / r['subtask_seconds']:>12,.0f} "
+            f"{r['task_seconds'] + r['subtask_seconds']:>9.2f}"
+        )
+
+    if len(results) > 1:
+        base, *others = results
+        for r in others:
+            speedup = (base["task_seconds"] + base["subtask_seconds"]) / (
+                r["task_seconds"] + r["subtask_seconds"]
+            )
+            print(f"{r['backend']} speedup over {base['backend']}: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Show that custom-field generation scales linearly with the project count.
+
+Builds every project's custom fields exactly as the pipeline does
+(_custom_field_shard over the registry's project -> tasks runs), without a
+database, for growing project counts at a fixed tasks-per-project. The
+"legacy" column samples from the whole workspace's tasks per project (the
+previous behaviour, O(projects x total tasks)) for comparison.
+
+Usage:
+    python benchmarks/bench_custom_fields.py --projects 100 1000 10000
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from generators.custom_fields import (  # noqa: E402
+    _custom_field_shard,
+    build_custom_fields,
+)
+from generators.projects import PROJECT_TYPES  # noqa: E402
+from utils.graph import WorkspaceGraph  # noqa: E402
+
+
+def task_graph(num_projects: int, tasks_per_project: int) -> WorkspaceGraph:
+    graph = WorkspaceGraph()
+    graph.task_ids = range(1, num_projects * tasks_per_project + 1)
+
+    for p in range(num_projects):
+        graph.project_types.append(p % len(PROJECT_TYPES))
+        graph.project_tasks.add_run(tasks_per_project)
+
+    return graph
+
+
+def project_type(graph: WorkspaceGraph, p: int) -> str:
+    return PROJECT_TYPES[graph.project_types[p]]
+
+
+def time_scoped(num_projects: int, graph: WorkspaceGraph, config: dict) -> tuple:
+    start = time.perf_counter()
+    values = 0
+    for p in range(num_projects):
+        shard = (p, p + 1, project_type(graph, p), graph.tasks(p))
+        _, value_rows = _custom_field_shard(shard, config)
+        values += len(value_rows)
+    return time.perf_counter() - start, values
+
+
+def time_legacy(num_projects: int, graph: WorkspaceGraph, config: dict) -> float:
+    start = time.perf_counter()
+    for p in range(num_projects):
+        build_custom_fields(p, p + 1, project_type(graph, p), graph.task_ids, config)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--projects", type=int, nargs="+", default=[100, 1000, 10000]
+    )
+    parser.add_argument("--tasks-per-project", type=int, default=120)
+    parser.add_argument(
+        "--legacy-max-projects",
+        type=int,
+        default=100,
+        help="Skip the quadratic legacy path above this many projects",
+    )
+    args = parser.parse_args()
+
+    config = {"random_seed": 42}
+
+    print(
+        f"{'projects':>9} {'tasks':>10} {'values':>9} {'scoped s':>9} "
+        f"{'us/project':>11} {'exponent':>9} {'legacy s':>9}"
+    )
+
+    previous = None
+    for num_projects in sorted(args.projects):
+        graph = task_graph(num_projects, args.tasks_per_project)
+        seconds, values = time_scoped(num_projects, graph, config)
+
+        exponent = ""
+        if previous is not None:
+            exponent = f"{math.log(seconds / previous[1]) / math.log(num_projects / previous[0]):.2f}"
+        previous = (num_projects, seconds)
+
+        legacy = "-"
+        if num_projects <= args.legacy_max_projects:
+            legacy = f"{time_legacy(num_projects, graph, config):.2f}"
+
+        print(
+            f"{num_projects:>9,} {len(graph.task_ids):>10,} {values:>9,} {seconds:>9.2f} "
+            f"{seconds / num_projects * 1e6:>11,.0f} {exponent:>9} {legacy:>9}"
+        )
+
+    print("\nexponent = log-log slope versus the previous row (1.0 = linear)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+"""
+Benchmark every generation stage and the full main() pipeline at scale tiers.
+
+Each tier runs in a fresh process against a temporary database, so peak
+RSS is measured per tier. For every stage the benchmark records wall time,
+rows written, rows/sec, peak RSS and DB size after the stage; an end-to-end
+`src/main.py` run is recorded as the "pipeline" stage.
+
+Results are written as JSON and compared with a stored baseline: a stage
+whose throughput drops, or whose peak RSS or DB size grows, by more than
+the tolerance is reported as a regression and the script exits with 1.
+
+Usage:
+    python benchmarks/bench_pipeline.py --tiers small medium
+    python benchmarks/bench_pipeline.py --tiers small medium --update-baseline
+    python benchmarks/bench_pipeline.py --tiers large --env WORKERS=4
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_OUTPUT = ROOT / "output" / "benchmarks" / "pipeline.json"
+
+# Fixed clock so DB sizes are comparable between runs
+REFERENCE_TIME = "2026-01-01T00:00:00"
+
+TIERS = {
+    "small": {
+        "NUM_USERS": 100,
+        "NUM_TEAMS": 5,
+        "PROJECTS_PER_TEAM": 2,
+        "TASKS_PER_PROJECT": 50,
+    },
+    "medium": {
+        "NUM_USERS": 500,
+        "NUM_TEAMS": 25,
+        "PROJECTS_PER_TEAM": 4,
+        "TASKS_PER_PROJECT": 120,
+    },
+    "large": {
+        "NUM_USERS": 5000,
+        "NUM_TEAMS": 100,
+        "PROJECTS_PER_TEAM": 5,
+        "TASKS_PER_PROJECT": 200,
+    },
+    "xl": {
+        "NUM_USERS": 50000,
+        "NUM_TEAMS": 500,
+        "PROJECTS_PER_TEAM": 10,
+        "TASKS_PER_PROJECT": 200,
+    },
+}
+
+# Stages faster than this in the baseline are too noisy to compare on time
+MIN_COMPARABLE_SECONDS = 0.5
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    """Peak resident set size in MiB (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(who).ru_maxrss
+    if sys.platform == "darwin":
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def db_size(db_path: Path) -> int:
+    """Size of the database plus any journal/WAL side files, in bytes."""
+    return sum(
+        path.stat().st_size
+        for path in (
+            db_path,
+            Path(f"{db_path}-journal"),
+            Path(f"{db_path}-wal"),
+        )
+        if path.exists()
+    )
+
+
+def count_rows(conn, tables) -> int:
+    return sum(
+        conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in tables
+    )
+
+
+# -----------
+# Tier worker
+# -----------
+def run_tier(tier: str, workdir: Path) -> dict:
+    """
+    Run one tier in this process: every stage, then the full main().
+    """
+    os.environ.update({k: str(v) for k, v in TIERS[tier].items()})
+    os.environ.setdefault("REFERENCE_TIME", REFERENCE_TIME)
+
+    sys.path.insert(0, str(SRC))
+
+    from loguru import logger
+
+    logger.remove()
+
+    from main import STAGE_TABLES, init_database, load_config, run_pipeline
+    from utils.dates import parse_reference_time, set_reference_time
+
+    db_path = workdir / "stages.sqlite"
+    os.environ["DB_PATH"] = str(db_path)
+
+    config = load_config()
+    conn = init_database(
+        config["db_path"], config["storage_profile"], config["load_mode"]
+    )
+    set_reference_time(parse_reference_time(config["reference_time"]))
+
+    stages = []
+
+    def timed_stage(name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        wall = time.perf_counter() - start
+
+        # Bulk mode defers commits; counting sees the open transaction
+        rows = count_rows(conn, STAGE_TABLES[name])
+
+        stages.append(
+            {
+                "stage": name,
+                "rows": rows,
+                "wall_seconds": round(wall, 4),
+                "rows_per_sec": round(rows / wall, 1) if wall > 0 else None,
+                "peak_rss_mb": peak_rss_mb(),
+                "db_bytes": db_size(db_path),
+            }
+        )
+        return result
+
+    run_pipeline(conn, config, stage=timed_stage)
+    conn.commit()
+    conn.close()
+
+    stages[-1]["db_bytes"] = db_size(db_path)
+    total_rows = sum(stage["rows"] for stage in stages)
+
+    # End-to-end run of the real entry point in a child process
+    pipeline_db = workdir / "pipeline.sqlite"
+    env = dict(os.environ, DB_PATH=str(pipeline_db))
+
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, str(SRC / "main.py")],
+        env=env,
+        cwd=workdir,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    wall = time.perf_counter() - start
+
+    stages.append(
+        {
+            "stage": "pipeline",
+            "rows": total_rows,
+            "wall_seconds": round(wall, 4),
+            "rows_per_sec": round(total_rows / wall, 1),
+            "peak_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+            "db_bytes": db_size(pipeline_db),
+        }
+    )
+
+    return {
+        "tier": tier,
+        "scale": TIERS[tier],
+        "config": {
+            key: config[key]
+            for key in (
+                "batch_size",
+                "workers",
+                "storage_profile",
+                "backend",
+                "load_mode",
+            )
+        },
+        "stages": stages,
+    }
+
+
+def spawn_tier(tier: str, extra_env: dict) -> dict:
+    """
+    Run one tier in a fresh interpreter and return its results.
+    """
+    with tempfile.TemporaryDirectory(prefix=f"bench-{tier}-") as workdir:
+        proc = subprocess.run(
+            [sys.executable, __file__, "--run-tier", tier, "--workdir", workdir],
+            env=dict(os.environ, **extra_env),
+            capture_output=True,
+            text=True,
+        )
+
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Tier {tier!r} failed (exit {proc.returncode})")
+
+    return json.loads(proc.stdout)
+
+
+# -----------------
+# Baseline handling
+# -----------------
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """
+    Return human-readable regressions of results against the baseline.
+    """
+    regressions = []
+
+    for tier in results:
+        base_tier = baseline.get("tiers", {}).get(tier["tier"])
+        if base_tier is None:
+            continue
+
+        if base_tier["config"] != tier["config"]:
+            print(
+                f"[{tier['tier']}] config differs from baseline "
+                f"({base_tier['config']}); skipping comparison"
+            )
+            continue
+
+        base_stages = {s["stage"]: s for s in base_tier["stages"]}
+
+        for stage in tier["stages"]:
+            base = base_stages.get(stage["stage"])
+            if base is None:
+                continue
+
+            label = f"[{tier['tier']}] {stage['stage']}"
+
+            if (
+                base["wall_seconds"] >= MIN_COMPARABLE_SECONDS
+                and base["rows_per_sec"]
+                and stage["rows_per_sec"] < base["rows_per_sec"] * (1 - tolerance)
+            ):
+                regressions.append(
+                    f"{label}: {stage['rows_per_sec']:,.0f} rows/s vs "
+                    f"baseline {base['rows_per_sec']:,.0f}"
+                )
+
+            for metric in ("peak_rss_mb", "db_bytes"):
+                if stage[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{label}: {metric} {stage[metric]:,} vs "
+                        f"baseline {base[metric]:,}"
+                    )
+
+    return regressions
+
+
+def print_results(results: list):
+    print(
+        f"{'tier':<7} {'stage':<14} {'rows':>10} {'wall s':>8} "
+        f"{'rows/s':>11} {'peak MiB':>9} {'db MiB':>8}"
+    )
+    for tier in results:
+        for s in tier["stages"]:
+            print(
+                f"{tier['tier']:<7} {s['stage']:<14} {s['rows']:>10,} "
+                f"{s['wall_seconds']:>8.2f} {s['rows_per_sec'] or 0:>11,.0f} "
+                f"{s['peak_rss_mb']:>9.1f} {s['db_bytes'] / 2**20:>8.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tiers", nargs="+", choices=list(TIERS), default=["small", "medium"]
+    )
+    parser.add_argument(
+        "--env",
+        nargs="*",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra generator settings, e.g. WORKERS=4 LOAD_MODE=bulk",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown/growth before failing (default 0.25)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as the new baseline instead of comparing",
+    )
+    parser.add_argument("--run-tier", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_tier:
+        print(json.dumps(run_tier(args.run_tier, args.workdir)))
+        return
+
+    extra_env = dict(item.split("=", 1) for item in args.env)
+    results = [spawn_tier(tier, extra_env) for tier in args.tiers]
+
+    print_results(results)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "tiers": {tier["tier"]: tier for tier in results},
+    }
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {args.output}")
+
+    if args.update_baseline:
+        baseline = (
+            json.loads(args.baseline.read_text())
+            if args.baseline.exists()
+            else {"tiers": {}}
+        )
+        baseline.update({k: v for k, v in report.items() if k != "tiers"})
+        baseline["tiers"].update(report["tiers"])
+        args.baseline.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline")
+        return
+
+    regressions = compare(
+        results, json.loads(args.baseline.read_text()), args.tolerance
+    )
+
+    if regressions:
+        print(f"\nPERFORMANCE REGRESSIONS (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+
+    print(f"\nNo regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Measure common agent queries before and after the post-load index build.
+
+Generates the workspace once per size (generate_in_memory, which builds
+the schema's INDEXES section and runs ANALYZE), then times each query on
+two copies of it:
+
+    before  the schema's secondary indexes and sqlite_stat1 dropped
+            (primary keys only, as before the post-load phase existed)
+    after   the database as generated
+
+Query parameters (projects, users, tasks, tags) are drawn from the
+generated data with a fixed seed, so both columns run the same workload.
+Times are medians over --repeats executions, in ms; "index" is the
+secondary index the "after" plan searches (EXPLAIN QUERY PLAN), or "-".
+
+Usage:
+    python benchmarks/bench_queries.py --tasks-per-project 50 200 800
+"""
+
+import argparse
+import os
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+# Fixed clock so workspaces are comparable between runs
+REFERENCE_TIME = "2026-01-01T00:00:00"
+
+# name -> (SQL, query drawing one parameter tuple's values)
+QUERIES = {
+    "tasks in project by section": (
+        """
+        SELECT t.task_id, t.name, s.name
+        FROM tasks t
+        JOIN sections s ON s.section_id = t.section_id
+        WHERE t.project_id = ?
+        ORDER BY s.position, t.created_at
+        """,
+        "SELECT project_id FROM projects",
+    ),
+    "my open tasks": (
+        """
+        SELECT task_id, name, due_date
+        FROM tasks
+        WHERE assignee_id = ? AND completed = 0
+        ORDER BY due_date
+        """,
+        "SELECT user_id FROM users",
+    ),
+    "comments on task": (
+        """
+        SELECT comment_id, user_id, body, created_at
+        FROM comments
+        WHERE task_id = ?
+        ORDER BY created_at
+        """,
+        "SELECT task_id FROM tasks",
+    ),
+    "tasks with tag": (
+        """
+        SELECT t.task_id, t.name
+        FROM task_tags tt
+        JOIN tasks t ON t.task_id = tt.task_id
+        WHERE tt.tag_id = ?
+        """,
+        "SELECT tag_id FROM tags",
+    ),
+    "subtasks of task": (
+        """
+        SELECT subtask_id, name, completed
+        FROM subtasks
+        WHERE parent_task_id = ?
+        """,
+        "SELECT task_id FROM tasks",
+    ),
+    "my teams": (
+        """
+        SELECT tm.team_id, te.name
+        FROM team_memberships tm
+        JOIN teams te ON te.team_id = tm.team_id
+        WHERE tm.user_id = ?
+        """,
+        "SELECT user_id FROM users",
+    ),
+    "custom field values of task": (
+        """
+        SELECT f.name, v.value
+        FROM custom_field_values v
+        JOIN custom_fields f ON f.field_id = v.field_id
+        WHERE v.task_id = ?
+        """,
+        "SELECT task_id FROM tasks",
+    ),
+}
+
+_PLAN_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+
+
+def drop_secondary_indexes(conn: sqlite3.Connection):
+    names = [
+        name
+        for (name,) in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND sql IS NOT NULL"
+        )
+    ]
+    for name in names:
+        conn.execute(f"DROP INDEX {name}")
+
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+    ).fetchone():
+        conn.execute("DROP TABLE sqlite_stat1")
+    conn.commit()
+
+
+def plan_index(conn: sqlite3.Connection, sql: str, params: tuple) -> str:
+    indexes = [
+        match.group(1)
+        for *_, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        for match in [_PLAN_INDEX.search(detail)]
+        if match and not match.group(1).startswith("sqlite_autoindex")
+    ]
+    return ",".join(indexes) or "-"
+
+
+def median_ms(conn: sqlite3.Connection, sql: str, params: list, repeats: int):
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        conn.execute(sql, params[i % len(params)]).fetchall()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tasks-per-project", type=int, nargs="+", default=[50, 200, 800]
+    )
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--teams", type=int, default=25)
+    parser.add_argument("--projects-per-team", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument(
+        "--profile", choices=["standard", "compact"], default="standard"
+    )
+    args = parser.parse_args()
+
+    os.environ.update(
+        {
+            "NUM_USERS": str(args.users),
+            "NUM_TEAMS": str(args.teams),
+            "PROJECTS_PER_TEAM": str(args.projects_per_team),
+            "STORAGE_PROFILE": args.profile,
+            "REFERENCE_TIME": os.environ.get("REFERENCE_TIME", REFERENCE_TIME),
+        }
+    )
+
+    from loguru import logger
+
+    logger.remove()
+
+    from main import generate_in_memory, load_config
+
+    for tasks_per_project in sorted(args.tasks_per_project):
+        os.environ["TASKS_PER_PROJECT"] = str(tasks_per_project)
+        config = load_config()
+
+        start = time.perf_counter()
+        conn = generate_in_memory(config)
+        generate = time.perf_counter() - start
+
+        image = conn.serialize()
+        conn.close()
+
+        after = sqlite3.connect(":memory:")
+        after.deserialize(image)
+        before = sqlite3.connect(":memory:")
+        before.deserialize(image)
+        drop_secondary_indexes(before)
+
+        tasks = after.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        print(
+            f"\n{tasks:,} tasks, {len(image) / 2**20:.1f} MiB "
+            f"({args.profile}), generated in {generate:.2f}s"
+        )
+        print(
+            f"{'query':<30} {'before ms':>10} {'after ms':>10} "
+            f"{'speedup':>8}  index"
+        )
+
+        rng = random.Random(0)
+        for name, (sql, sample) in QUERIES.items():
+            values = [row[0] for row in after.execute(sample)]
+            params = [(rng.choice(values),) for _ in range(args.repeats)]
+
+            before_ms = median_ms(before, sql, params, args.repeats)
+            after_ms = median_ms(after, sql, params, args.repeats)
+
+            print(
+                f"{name:<30} {before_ms:>10.3f} {after_ms:>10.3f} "
+                f"{before_ms / after_ms:>7.1f}x  "
+                f"{plan_index(after, sql, params[0])}"
+            )
+
+        before.close()
+        after.close()
+
+
+if __name__ == "__main__":
+    main()
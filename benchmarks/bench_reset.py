@@ -0,0 +1,147 @@
+"""
+Measure episode-reset latency against database size.
+
+Generates the workspace once per size (generate_snapshot), then times
+handing out a pristine, queryable copy of it with every method:
+
+    file copy    shutil.copyfile of the .sqlite file + connect
+    clone        WorkspaceSnapshot.clone (reflink where supported) + connect
+    backup       reset(method="backup"): SQLite backup API into :memory:
+    deserialize  reset(): the serialized image into :memory:
+    pool         EpisodePool.acquire() when each episode takes
+                 --episode-ms (the next copy is prepared meanwhile)
+
+Every reset is followed by one query (COUNT(*) of tasks) so lazily loaded
+pages are paid for. Times are medians over --repeats resets, in ms.
+
+Usage:
+    python benchmarks/bench_reset.py --tasks-per-project 50 200 800
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+# Fixed clock so DB sizes are comparable between runs
+REFERENCE_TIME = "2026-01-01T00:00:00"
+
+
+def median_ms(reset, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn = reset()
+        conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+        times.append(time.perf_counter() - start)
+        conn.close()
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--tasks-per-project", type=int, nargs="+", default=[50, 200, 800]
+    )
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--teams", type=int, default=25)
+    parser.add_argument("--projects-per-team", type=int, default=4)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument(
+        "--episode-ms",
+        type=float,
+        default=500,
+        help="Simulated episode length between pool acquisitions",
+    )
+    args = parser.parse_args()
+
+    os.environ.update(
+        {
+            "NUM_USERS": str(args.users),
+            "NUM_TEAMS": str(args.teams),
+            "PROJECTS_PER_TEAM": str(args.projects_per_team),
+            "REFERENCE_TIME": os.environ.get("REFERENCE_TIME", REFERENCE_TIME),
+        }
+    )
+
+    from loguru import logger
+
+    logger.remove()
+
+    from main import generate_snapshot, load_config
+    from utils.episodes import EpisodePool, WorkspaceSnapshot
+
+    print(
+        f"{'tasks':>8} {'DB MiB':>7} {'generate s':>10} {'file copy':>10} "
+        f"{'clone':>16} {'backup':>8} {'deserialize':>12} {'pool':>6}"
+    )
+
+    with tempfile.TemporaryDirectory(prefix="bench-reset-") as workdir:
+        workdir = Path(workdir)
+
+        for tasks_per_project in sorted(args.tasks_per_project):
+            os.environ["TASKS_PER_PROJECT"] = str(tasks_per_project)
+            config = load_config()
+
+            start = time.perf_counter()
+            snapshot = generate_snapshot(config)
+            generate = time.perf_counter() - start
+
+            seed_db = workdir / "seed.sqlite"
+            snapshot.clone(seed_db)
+            on_disk = WorkspaceSnapshot.from_file(seed_db)
+            episode_db = workdir / "episode.sqlite"
+
+            def file_copy():
+                shutil.copyfile(seed_db, episode_db)
+                return sqlite3.connect(episode_db)
+
+            clone_kind = []
+
+            def clone():
+                episode_db.unlink(missing_ok=True)
+                clone_kind.append(on_disk.clone(episode_db))
+                return sqlite3.connect(episode_db)
+
+            copy_ms = median_ms(file_copy, args.repeats)
+            clone_ms = median_ms(clone, args.repeats)
+            backup_ms = median_ms(lambda: snapshot.reset("backup"), args.repeats)
+            deserialize_ms = median_ms(snapshot.reset, args.repeats)
+
+            pool = EpisodePool(snapshot)
+
+            pool_times = []
+            for _ in range(args.repeats):
+                time.sleep(args.episode_ms / 1000)  # the episode
+                start = time.perf_counter()
+                conn = pool.acquire()
+                conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+                pool_times.append(time.perf_counter() - start)
+                conn.close()
+            pool_ms = statistics.median(pool_times) * 1000
+
+            pool.close()
+            snapshot.close()
+
+            tasks = args.teams * args.projects_per_team * tasks_per_project
+            print(
+                f"{tasks:>8,} {snapshot.size / 2**20:>7.1f} {generate:>10.2f} "
+                f"{copy_ms:>10.2f} {clone_ms:>6.2f} ({clone_kind[-1]:>7}) "
+                f"{backup_ms:>8.2f} {deserialize_ms:>12.2f} {pool_ms:>6.2f}"
+            )
+
+            seed_db.unlink()
+            episode_db.unlink(missing_ok=True)
+
+    print("\nReset columns are median ms per fresh, queried copy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Measure the throughput and variety of the description/comment text engine.
+
+For every project type, renders --count task descriptions and comment
+bodies (consecutive keys, like the generators use) on one core:
+
+    render       TextEngine.render() per text
+    batch        TextEngine.render_many() over all keys at once
+
+and reports texts/min, mean length and the number of distinct texts (the
+previous fixed templates gave one description per task name and ten
+comment bodies in total). Also times compiling the grammar against
+loading the cached tables from data/text_grammars.json.
+
+Usage:
+    python benchmarks/bench_text.py --count 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from loguru import logger
+
+logger.remove()
+
+from generators.projects import PROJECT_TYPES  # noqa: E402
+from generators.tasks import TASK_NAMES  # noqa: E402
+from generators.text_grammar import (  # noqa: E402
+    GRAMMAR,
+    SLOTS,
+    TEXT_GRAMMARS_FILE,
+    task_slot,
+    text_engine,
+)
+from utils.random import derive_seed  # noqa: E402
+from utils.text import compile_grammar, load_text_engine  # noqa: E402
+
+
+def timed(fn, repeats: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    engine = text_engine()
+    n = args.count
+
+    compile_s = timed(lambda: compile_grammar(GRAMMAR, PROJECT_TYPES, SLOTS), 5)
+    load_s = timed(
+        lambda: load_text_engine(GRAMMAR, PROJECT_TYPES, SLOTS, TEXT_GRAMMARS_FILE), 5
+    )
+    with tempfile.TemporaryDirectory(prefix="bench-text-") as workdir:
+        cold_s = timed(
+            lambda: load_text_engine(
+                GRAMMAR, PROJECT_TYPES, SLOTS, Path(workdir) / "grammars.json"
+            )
+        )
+
+    print(
+        f"Grammar: {len(GRAMMAR)} symbols; compile {compile_s * 1000:.1f} ms, "
+        f"cold load (compile + write) {cold_s * 1000:.1f} ms, "
+        f"cached load {load_s * 1000:.1f} ms"
+    )
+    print(
+        f"\n{'type':<12} {'root':<12} {'render/min':>12} {'batch/min':>12} "
+        f"{'mean len':>9} {'distinct':>9}"
+    )
+
+    totals = []
+    for project_type in PROJECT_TYPES:
+        names = TASK_NAMES[project_type]
+
+        for root in ("description", "comment"):
+            first = derive_seed(args.seed, "bench_text", project_type, root)
+            keys = range(first, first + n)
+
+            if root == "description":
+                slot_rows = [(task_slot(names[i % len(names)]),) for i in range(n)]
+            else:
+                slot_rows = [()] * n
+
+            render = engine.render
+            texts = []
+
+            def one_by_one():
+                texts[:] = [
+                    render(project_type, root, key, *slots)
+                    for key, slots in zip(keys, slot_rows)
+                ]
+
+            render_s = timed(one_by_one)
+            batch_s = timed(
+                lambda: engine.render_many(project_type, root, keys, slot_rows)
+            )
+            totals.append(render_s)
+
+            print(
+                f"{project_type:<12} {root:<12} {n / render_s * 60:>12,.0f} "
+                f"{n / batch_s * 60:>12,.0f} "
+                f"{sum(map(len, texts)) / n:>9.0f} "
+                f"{len(set(texts)):>9,}"
+            )
+
+    print(f"\nOverall: {len(totals) * n / sum(totals) * 60:,.0f} texts/min on one core")
+
+
+if __name__ == "__main__":
+    main()
@@ -161,3 +161,65 @@ CREATE TABLE custom_field_values (
     FOREIGN KEY (field_id) REFERENCES custom_fields(field_id),
     FOREIGN KEY (task_id) REFERENCES tasks(task_id)
 );
+
+-- =====================
+-- ACTIVITY EVENTS
+-- =====================
+-- Simulated history of every task (ACTIVITY_EVENTS=true). section_id and
+-- assignee_id hold the task's state after the event.
+CREATE TABLE activity_events (
+    event_id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    event_type TEXT CHECK (
+        event_type IN (
+            'created',
+            'assigned',
+            'unassigned',
+            'section_changed',
+            'commented',
+            'completed'
+        )
+    ) NOT NULL,
+    actor_id TEXT,
+    section_id TEXT,
+    assignee_id TEXT,
+    occurred_at TIMESTAMP NOT NULL,
+    FOREIGN KEY (task_id) REFERENCES tasks(task_id),
+    FOREIGN KEY (actor_id) REFERENCES users(user_id),
+    FOREIGN KEY (section_id) REFERENCES sections(section_id),
+    FOREIGN KEY (assignee_id) REFERENCES users(user_id)
+);
+
+-- =====================================================================
+-- INDEXES
+-- Built after the data is loaded (one sorted pass each), then ANALYZE.
+-- Foreign-key and filter columns of the common agent queries.
+-- =====================================================================
+
+-- Tasks of a project by section; open tasks by creation time (ADVANCE_DAYS)
+CREATE INDEX idx_tasks_project_section ON tasks(project_id, section_id);
+CREATE INDEX idx_tasks_open ON tasks(project_id, created_at)
+WHERE completed_at IS NULL;
+
+-- "My tasks": open/completed tasks of an assignee by due date
+CREATE INDEX idx_tasks_assignee ON tasks(assignee_id, completed, due_date);
+
+CREATE INDEX idx_subtasks_parent ON subtasks(parent_task_id);
+CREATE INDEX idx_comments_task ON comments(task_id, created_at);
+
+-- Tasks with a tag (the primary key serves tags of a task)
+CREATE INDEX idx_task_tags_tag ON task_tags(tag_id, task_id);
+
+-- Custom field values of a task (the primary key serves values of a field)
+CREATE INDEX idx_custom_field_values_task ON custom_field_values(task_id);
+CREATE INDEX idx_custom_fields_project ON custom_fields(project_id);
+
+CREATE INDEX idx_sections_project ON sections(project_id, position);
+CREATE INDEX idx_projects_team ON projects(team_id);
+
+-- Teams of a user (the primary key serves members of a team)
+CREATE INDEX idx_team_memberships_user ON team_memberships(user_id, team_id);
+
+-- History of a task; workspace activity by time
+CREATE INDEX idx_activity_events_task ON activity_events(task_id, occurred_at);
+CREATE INDEX idx_activity_events_time ON activity_events(occurred_at);
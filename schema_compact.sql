@@ -0,0 +1,374 @@
+PRAGMA foreign_keys = ON;
+
+-- =====================================================================
+-- COMPACT STORAGE PROFILE
+--
+-- Same entities as schema.sql, stored with INTEGER PRIMARY KEY rowids,
+-- integer epoch timestamps (seconds; dates as days since 1970-01-01),
+-- WITHOUT ROWID join tables and small lookup tables for enums.
+--
+-- The views at the bottom expose every table of schema.sql with its
+-- original name and column names, so existing queries keep working.
+-- =====================================================================
+
+-- ==============
+-- LOOKUP TABLES
+-- ==============
+CREATE TABLE roles (
+    role_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+INSERT INTO roles (role_id, name) VALUES
+    (1, 'admin'),
+    (2, 'member');
+
+CREATE TABLE project_types (
+    project_type_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+INSERT INTO project_types (project_type_id, name) VALUES
+    (1, 'engineering'),
+    (2, 'marketing'),
+    (3, 'operations');
+
+CREATE TABLE field_types (
+    field_type_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+INSERT INTO field_types (field_type_id, name) VALUES
+    (1, 'text'),
+    (2, 'number'),
+    (3, 'enum');
+
+CREATE TABLE event_types (
+    event_type_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+INSERT INTO event_types (event_type_id, name) VALUES
+    (1, 'created'),
+    (2, 'assigned'),
+    (3, 'unassigned'),
+    (4, 'section_changed'),
+    (5, 'commented'),
+    (6, 'completed');
+
+-- Filled by the sections generator
+CREATE TABLE section_names (
+    section_name_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+-- Filled by the custom fields generator
+CREATE TABLE field_options (
+    option_id INTEGER PRIMARY KEY,
+    value TEXT UNIQUE NOT NULL
+);
+
+-- =========================
+-- ORGANIZATIONS / WORKSPACES
+-- =========================
+CREATE TABLE organizations_compact (
+    org_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    domain TEXT UNIQUE,
+    created_at INTEGER NOT NULL
+);
+
+-- =====
+-- USERS
+-- =====
+CREATE TABLE users_compact (
+    user_id INTEGER PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organizations_compact(org_id),
+    full_name TEXT NOT NULL,
+    email TEXT UNIQUE NOT NULL,
+    role_id INTEGER NOT NULL REFERENCES roles(role_id),
+    joined_at INTEGER NOT NULL
+);
+
+-- =====
+-- TEAMS
+-- =====
+CREATE TABLE teams_compact (
+    team_id INTEGER PRIMARY KEY,
+    org_id INTEGER NOT NULL REFERENCES organizations_compact(org_id),
+    name TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+
+CREATE TABLE team_memberships_compact (
+    team_id INTEGER NOT NULL REFERENCES teams_compact(team_id),
+    user_id INTEGER NOT NULL REFERENCES users_compact(user_id),
+    PRIMARY KEY (team_id, user_id)
+) WITHOUT ROWID;
+
+-- =========
+-- PROJECTS
+-- =========
+CREATE TABLE projects_compact (
+    project_id INTEGER PRIMARY KEY,
+    team_id INTEGER NOT NULL REFERENCES teams_compact(team_id),
+    name TEXT NOT NULL,
+    project_type_id INTEGER NOT NULL REFERENCES project_types(project_type_id),
+    created_at INTEGER NOT NULL,
+    due_date INTEGER
+);
+
+-- =========
+-- SECTIONS
+-- =========
+CREATE TABLE sections_compact (
+    section_id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects_compact(project_id),
+    section_name_id INTEGER NOT NULL REFERENCES section_names(section_name_id),
+    position INTEGER NOT NULL
+);
+
+-- =====
+-- TASKS
+-- =====
+CREATE TABLE tasks_compact (
+    task_id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects_compact(project_id),
+    section_id INTEGER REFERENCES sections_compact(section_id),
+    assignee_id INTEGER REFERENCES users_compact(user_id),
+    name TEXT NOT NULL,
+    description TEXT,
+    due_date INTEGER,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL,
+    completed_at INTEGER
+);
+
+-- =========
+-- SUBTASKS
+-- =========
+CREATE TABLE subtasks_compact (
+    subtask_id INTEGER PRIMARY KEY,
+    parent_task_id INTEGER NOT NULL REFERENCES tasks_compact(task_id),
+    assignee_id INTEGER REFERENCES users_compact(user_id),
+    name TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL,
+    completed_at INTEGER
+);
+
+-- ==========
+-- COMMENTS
+-- ==========
+CREATE TABLE comments_compact (
+    comment_id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL REFERENCES tasks_compact(task_id),
+    user_id INTEGER NOT NULL REFERENCES users_compact(user_id),
+    body TEXT NOT NULL,
+    created_at INTEGER NOT NULL
+);
+
+-- =====
+-- TAGS
+-- =====
+CREATE TABLE tags_compact (
+    tag_id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL
+);
+
+CREATE TABLE task_tags_compact (
+    task_id INTEGER NOT NULL REFERENCES tasks_compact(task_id),
+    tag_id INTEGER NOT NULL REFERENCES tags_compact(tag_id),
+    PRIMARY KEY (task_id, tag_id)
+) WITHOUT ROWID;
+
+-- =============
+-- CUSTOM FIELDS
+-- =============
+CREATE TABLE custom_fields_compact (
+    field_id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects_compact(project_id),
+    name TEXT NOT NULL,
+    field_type_id INTEGER NOT NULL REFERENCES field_types(field_type_id)
+);
+
+-- Enum values reference field_options; numbers are stored inline
+CREATE TABLE custom_field_values_compact (
+    field_id INTEGER NOT NULL REFERENCES custom_fields_compact(field_id),
+    task_id INTEGER NOT NULL REFERENCES tasks_compact(task_id),
+    option_id INTEGER REFERENCES field_options(option_id),
+    number_value INTEGER,
+    PRIMARY KEY (field_id, task_id)
+) WITHOUT ROWID;
+
+-- =====================
+-- ACTIVITY EVENTS
+-- =====================
+CREATE TABLE activity_events_compact (
+    event_id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL REFERENCES tasks_compact(task_id),
+    event_type_id INTEGER NOT NULL REFERENCES event_types(event_type_id),
+    actor_id INTEGER REFERENCES users_compact(user_id),
+    section_id INTEGER REFERENCES sections_compact(section_id),
+    assignee_id INTEGER REFERENCES users_compact(user_id),
+    occurred_at INTEGER NOT NULL
+);
+
+-- =====================================================================
+-- INDEXES
+-- Built after the data is loaded (one sorted pass each), then ANALYZE.
+-- Foreign-key and filter columns of the common agent queries.
+-- =====================================================================
+
+-- Tasks of a project by section; open tasks by creation time (ADVANCE_DAYS)
+CREATE INDEX idx_tasks_project_section ON tasks_compact(project_id, section_id);
+CREATE INDEX idx_tasks_open ON tasks_compact(project_id, created_at)
+WHERE completed_at IS NULL;
+
+-- "My tasks": open/completed tasks of an assignee by due date
+CREATE INDEX idx_tasks_assignee ON tasks_compact(assignee_id, completed, due_date);
+
+CREATE INDEX idx_subtasks_parent ON subtasks_compact(parent_task_id);
+CREATE INDEX idx_comments_task ON comments_compact(task_id, created_at);
+
+-- Tasks with a tag (the primary key serves tags of a task)
+CREATE INDEX idx_task_tags_tag ON task_tags_compact(tag_id, task_id);
+
+-- Custom field values of a task (the primary key serves values of a field)
+CREATE INDEX idx_custom_field_values_task ON custom_field_values_compact(task_id);
+CREATE INDEX idx_custom_fields_project ON custom_fields_compact(project_id);
+
+CREATE INDEX idx_sections_project ON sections_compact(project_id, position);
+CREATE INDEX idx_projects_team ON projects_compact(team_id);
+
+-- Teams of a user (the primary key serves members of a team)
+CREATE INDEX idx_team_memberships_user ON team_memberships_compact(user_id, team_id);
+
+-- History of a task; workspace activity by time
+CREATE INDEX idx_activity_events_task ON activity_events_compact(task_id, occurred_at);
+CREATE INDEX idx_activity_events_time ON activity_events_compact(occurred_at);
+
+-- =====================================================================
+-- COMPATIBILITY VIEWS (original table and column names)
+-- =====================================================================
+CREATE VIEW organizations AS
+SELECT
+    org_id,
+    name,
+    domain,
+    strftime('%Y-%m-%dT%H:%M:%S', created_at, 'unixepoch') AS created_at
+FROM organizations_compact;
+
+CREATE VIEW users AS
+SELECT
+    u.user_id,
+    u.org_id,
+    u.full_name,
+    u.email,
+    r.name AS role,
+    strftime('%Y-%m-%dT%H:%M:%S', u.joined_at, 'unixepoch') AS joined_at
+FROM users_compact u
+JOIN roles r ON r.role_id = u.role_id;
+
+CREATE VIEW teams AS
+SELECT
+    team_id,
+    org_id,
+    name,
+    strftime('%Y-%m-%dT%H:%M:%S', created_at, 'unixepoch') AS created_at
+FROM teams_compact;
+
+CREATE VIEW team_memberships AS
+SELECT team_id, user_id
+FROM team_memberships_compact;
+
+CREATE VIEW projects AS
+SELECT
+    p.project_id,
+    p.team_id,
+    p.name,
+    t.name AS project_type,
+    strftime('%Y-%m-%dT%H:%M:%S', p.created_at, 'unixepoch') AS created_at,
+    date(p.due_date * 86400, 'unixepoch') AS due_date
+FROM projects_compact p
+JOIN project_types t ON t.project_type_id = p.project_type_id;
+
+CREATE VIEW sections AS
+SELECT
+    s.section_id,
+    s.project_id,
+    n.name,
+    s.position
+FROM sections_compact s
+JOIN section_names n ON n.section_name_id = s.section_name_id;
+
+CREATE VIEW tasks AS
+SELECT
+    task_id,
+    project_id,
+    section_id,
+    assignee_id,
+    name,
+    description,
+    date(due_date * 86400, 'unixepoch') AS due_date,
+    completed,
+    strftime('%Y-%m-%dT%H:%M:%S', created_at, 'unixepoch') AS created_at,
+    strftime('%Y-%m-%dT%H:%M:%S', completed_at, 'unixepoch') AS completed_at
+FROM tasks_compact;
+
+CREATE VIEW subtasks AS
+SELECT
+    subtask_id,
+    parent_task_id,
+    assignee_id,
+    name,
+    completed,
+    strftime('%Y-%m-%dT%H:%M:%S', created_at, 'unixepoch') AS created_at,
+    strftime('%Y-%m-%dT%H:%M:%S', completed_at, 'unixepoch') AS completed_at
+FROM subtasks_compact;
+
+CREATE VIEW comments AS
+SELECT
+    comment_id,
+    task_id,
+    user_id,
+    body,
+    strftime('%Y-%m-%dT%H:%M:%S', created_at, 'unixepoch') AS created_at
+FROM comments_compact;
+
+CREATE VIEW tags AS
+SELECT tag_id, name
+FROM tags_compact;
+
+CREATE VIEW task_tags AS
+SELECT task_id, tag_id
+FROM task_tags_compact;
+
+CREATE VIEW custom_fields AS
+SELECT
+    f.field_id,
+    f.project_id,
+    f.name,
+    t.name AS field_type
+FROM custom_fields_compact f
+JOIN field_types t ON t.field_type_id = f.field_type_id;
+
+CREATE VIEW custom_field_values AS
+SELECT
+    v.field_id,
+    v.task_id,
+    COALESCE(o.value, CAST(v.number_value AS TEXT)) AS value
+FROM custom_field_values_compact v
+LEFT JOIN field_options o ON o.option_id = v.option_id;
+
+CREATE VIEW activity_events AS
+SELECT
+    a.event_id,
+    a.task_id,
+    t.name AS event_type,
+    a.actor_id,
+    a.section_id,
+    a.assignee_id,
+    strftime('%Y-%m-%dT%H:%M:%S', a.occurred_at, 'unixepoch') AS occurred_at
+FROM activity_events_compact a
+JOIN event_types t ON t.event_type_id = a.event_type_id;
@@ -0,0 +1,138 @@
+"""
+Load a PostgreSQL dump into a throwaway local server and check it.
+
+Starts a temporary cluster (initdb + pg_ctl, listening only on a Unix
+socket in a temp directory), loads the dump with psql in ON_ERROR_STOP
+mode, then compares every table's row count with the SQLite database of
+the same run. Nothing outside the temp directory is touched.
+
+Needs the PostgreSQL server binaries (initdb, pg_ctl, psql) on PATH or in
+--pg-bin. initdb refuses to run as root.
+
+Usage:
+    OUTPUT_SINKS=sqlite,postgres python src/main.py
+    python scripts/verify_pg_dump.py \\
+        --dump output/export/asana_simulation.pg.sql \\
+        --sqlite output/asana_simulation.sqlite
+"""
+
+import argparse
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def find_binary(name: str, pg_bin: Path = None) -> str:
+    if pg_bin is not None:
+        return str(pg_bin / name)
+
+    path = shutil.which(name)
+    if path is None:
+        raise SystemExit(f"{name} not found on PATH (use --pg-bin)")
+    return path
+
+
+def run(args: list, **kwargs) -> str:
+    proc = subprocess.run(args, capture_output=True, text=True, **kwargs)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stdout + proc.stderr)
+        raise SystemExit(f"{Path(args[0]).name} failed (exit {proc.returncode})")
+    return proc.stdout
+
+
+def sqlite_counts(db_path: Path) -> dict:
+    conn = sqlite3.connect(db_path)
+    tables = [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )
+    ]
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in tables
+    }
+    conn.close()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dump", type=Path, required=True)
+    parser.add_argument("--sqlite", type=Path, help="SQLite DB of the same run")
+    parser.add_argument("--pg-bin", type=Path, help="Directory of initdb/pg_ctl/psql")
+    args = parser.parse_args()
+
+    initdb = find_binary("initdb", args.pg_bin)
+    pg_ctl = find_binary("pg_ctl", args.pg_bin)
+    psql = find_binary("psql", args.pg_bin)
+
+    with tempfile.TemporaryDirectory(prefix="pgverify-") as tmp:
+        data_dir = Path(tmp) / "data"
+        socket_dir = Path(tmp)
+
+        run([initdb, "-D", str(data_dir), "-U", "postgres", "-A", "trust"])
+        run(
+            [
+                pg_ctl,
+                "-D", str(data_dir),
+                "-l", str(Path(tmp) / "server.log"),
+                "-o", f"-c listen_addresses='' -k {socket_dir}",
+                "-w",
+                "start",
+            ]
+        )
+
+        try:
+            psql_args = [psql, "-h", str(socket_dir), "-U", "postgres", "-X", "-q"]
+
+            start = time.perf_counter()
+            run(psql_args + ["-v", "ON_ERROR_STOP=1", "-f", str(args.dump)])
+            print(f"Loaded {args.dump} in {time.perf_counter() - start:.2f}s")
+
+            tables = run(
+                psql_args
+                + [
+                    "-At",
+                    "-c",
+                    "SELECT tablename FROM pg_tables "
+                    "WHERE schemaname = 'public' ORDER BY tablename",
+                ]
+            ).split()
+
+            pg_counts = {
+                table: int(
+                    run(psql_args + ["-At", "-c", f"SELECT COUNT(*) FROM {table}"])
+                )
+                for table in tables
+            }
+        finally:
+            run([pg_ctl, "-D", str(data_dir), "-m", "fast", "-w", "stop"])
+
+    expected = sqlite_counts(args.sqlite) if args.sqlite else {}
+    mismatches = 0
+
+    for table, count in pg_counts.items():
+        status = ""
+        if table in expected and expected[table] != count:
+            status = f"  MISMATCH (sqlite: {expected[table]})"
+            mismatches += 1
+        print(f"{table:<32} {count:>10,}{status}")
+
+    missing = sorted(set(expected) - set(pg_counts))
+    for table in missing:
+        print(f"{table:<32} {'missing':>10}")
+
+    if mismatches or missing:
+        raise SystemExit("PostgreSQL dump does not match the SQLite database")
+
+    print("PostgreSQL dump verified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1044 @@
+"""Asana-shaped read-only REST API over a generated workspace."""
+
+import asyncio
+import base64
+import hashlib
+import json
+import sqlite3
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlencode
+
+from aiohttp import web
+from loguru import logger
+
+
+API_PREFIX = "/api/1.0"
+
+# Asana caps page sizes at 100
+MAX_PAGE_LIMIT = 100
+
+
+class ApiError(Exception):
+    """Request error reported to the client as {"errors": [...]}."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# =========
+# RESOURCES
+# =========
+
+def _column(column: str):
+    return lambda row: row[column]
+
+
+def _flag(column: str):
+    return lambda row: bool(row[column])
+
+
+def _const(value):
+    return lambda row: value
+
+
+def _ref(resource_type: str, column: str):
+    def field(row):
+        value = row[column]
+        if value is None:
+            return None
+        return {"gid": str(value), "resource_type": resource_type}
+    return field
+
+
+def _task_memberships(row):
+    membership = {"project": _ref("project", "project_id")(row)}
+    membership["section"] = _ref("section", "section_id")(row)
+    return [membership]
+
+
+def _custom_field(row):
+    return {
+        "gid": str(row["field_id"]),
+        "resource_type": "custom_field",
+        "name": row["name"],
+        "type": row["field_type"],
+    }
+
+
+def _in_list(column: str, keys: list) -> str:
+    return f"{column} IN ({', '.join('?' * len(keys))})"
+
+
+def _task_custom_fields(conn, keys: list) -> dict:
+    values = {key: [] for key in keys}
+
+    for task_id, field_id, name, field_type, value in conn.execute(
+        f"""
+        SELECT v.task_id, f.field_id, f.name, f.field_type, v.value
+        FROM custom_field_values v
+        JOIN custom_fields f ON f.field_id = v.field_id
+        WHERE {_in_list("v.task_id", keys)}
+        ORDER BY v.task_id, f.field_id
+        """,
+        keys,
+    ):
+        item = {
+            "gid": str(field_id),
+            "resource_type": "custom_field",
+            "name": name,
+            "type": field_type,
+            "display_value": value,
+        }
+        if field_type == "number":
+            item["number_value"] = float(value) if value is not None else None
+        elif field_type == "enum":
+            item["enum_value"] = {"name": value} if value is not None else None
+        else:
+            item["text_value"] = value
+        values[task_id].append(item)
+
+    return values
+
+
+def _task_tags(conn, keys: list) -> dict:
+    tags = {key: [] for key in keys}
+
+    for task_id, tag_id, name in conn.execute(
+        f"""
+        SELECT tt.task_id, t.tag_id, t.name
+        FROM task_tags tt
+        JOIN tags t ON t.tag_id = tt.tag_id
+        WHERE {_in_list("tt.task_id", keys)}
+        ORDER BY tt.task_id, t.name
+        """,
+        keys,
+    ):
+        tags[task_id].append(
+            {"gid": str(tag_id), "resource_type": "tag", "name": name}
+        )
+
+    return tags
+
+
+def _task_num_subtasks(conn, keys: list) -> dict:
+    counts = dict.fromkeys(keys, 0)
+    counts.update(
+        conn.execute(
+            f"""
+            SELECT parent_task_id, COUNT(*)
+            FROM subtasks
+            WHERE {_in_list("parent_task_id", keys)}
+            GROUP BY parent_task_id
+            """,
+            keys,
+        )
+    )
+    return counts
+
+
+class Resource:
+    """
+    API resource served from one table (or compact-profile view).
+
+    Args:
+        resource_type (str): Asana resource_type of its objects
+        table (str): Table or view holding one row per object
+        key (str): Column holding the gid
+        fields (dict): API field -> function(row) returning its value
+        compact (tuple): Fields returned without opt_fields
+        related (dict): API field -> function(conn, keys) returning
+            {key: value} for a whole page (fields needing other tables)
+        gid_prefix (str): Prepended to the key to form the gid
+    """
+
+    __slots__ = (
+        "resource_type", "table", "key", "fields", "compact", "related",
+        "gid_prefix",
+    )
+
+    def __init__(
+        self,
+        resource_type: str,
+        table: str,
+        key: str,
+        fields: dict,
+        compact: tuple = ("name",),
+        related: dict = None,
+        gid_prefix: str = "",
+    ):
+        self.resource_type = resource_type
+        self.table = table
+        self.key = key
+        self.fields = fields
+        self.compact = compact
+        self.related = related or {}
+        self.gid_prefix = gid_prefix
+
+    def key_of(self, gid: str):
+        """
+        Return the key a gid refers to (None if it is not one of ours).
+        """
+        if not gid.startswith(self.gid_prefix):
+            return None
+        return gid[len(self.gid_prefix):]
+
+    def field_names(self) -> set:
+        return set(self.fields) | set(self.related)
+
+
+RESOURCES = {
+    "workspace": Resource(
+        "workspace",
+        "organizations",
+        "org_id",
+        {
+            "name": _column("name"),
+            "email_domains": lambda row: [row["domain"]] if row["domain"] else [],
+            "is_organization": _const(True),
+            "created_at": _column("created_at"),
+        },
+    ),
+    "user": Resource(
+        "user",
+        "users",
+        "user_id",
+        {
+            "name": _column("full_name"),
+            "email": _column("email"),
+            "role": _column("role"),
+            "joined_at": _column("joined_at"),
+            "workspaces": lambda row: [_ref("workspace", "org_id")(row)],
+        },
+    ),
+    "team": Resource(
+        "team",
+        "teams",
+        "team_id",
+        {
+            "name": _column("name"),
+            "organization": _ref("workspace", "org_id"),
+            "created_at": _column("created_at"),
+        },
+    ),
+    "project": Resource(
+        "project",
+        "projects",
+        "project_id",
+        {
+            "name": _column("name"),
+            "team": _ref("team", "team_id"),
+            "project_type": _column("project_type"),
+            "created_at": _column("created_at"),
+            "due_on": _column("due_date"),
+            "archived": _const(False),
+        },
+    ),
+    "section": Resource(
+        "section",
+        "sections",
+        "section_id",
+        {
+            "name": _column("name"),
+            "project": _ref("project", "project_id"),
+            "position": _column("position"),
+        },
+    ),
+    "task": Resource(
+        "task",
+        "tasks",
+        "task_id",
+        {
+            "name": _column("name"),
+            "notes": lambda row: row["description"] or "",
+            "resource_subtype": _const("default_task"),
+            "assignee": _ref("user", "assignee_id"),
+            "completed": _flag("completed"),
+            "completed_at": _column("completed_at"),
+            "created_at": _column("created_at"),
+            "due_on": _column("due_date"),
+            "parent": _const(None),
+            "projects": lambda row: [_ref("project", "project_id")(row)],
+            "memberships": _task_memberships,
+        },
+        related={
+            "custom_fields": _task_custom_fields,
+            "tags": _task_tags,
+            "num_subtasks": _task_num_subtasks,
+        },
+    ),
+    # Subtasks are tasks to the API; /tasks/{gid} falls back to them. Their
+    # keys would collide with task keys in the compact profile (both count
+    # from 1), hence the gid prefix
+    "subtask": Resource(
+        "task",
+        "subtasks",
+        "subtask_id",
+        {
+            "name": _column("name"),
+            "notes": _const(""),
+            "resource_subtype": _const("default_task"),
+            "assignee": _ref("user", "assignee_id"),
+            "completed": _flag("completed"),
+            "completed_at": _column("completed_at"),
+            "created_at": _column("created_at"),
+            "due_on": _const(None),
+            "parent": _ref("task", "parent_task_id"),
+            "projects": _const([]),
+            "memberships": _const([]),
+        },
+        related={
+            "custom_fields": lambda conn, keys: dict.fromkeys(keys, []),
+            "tags": lambda conn, keys: dict.fromkeys(keys, []),
+            "num_subtasks": lambda conn, keys: dict.fromkeys(keys, 0),
+        },
+        gid_prefix="sub_",
+    ),
+    # Comments are the only stories the generator writes
+    "story": Resource(
+        "story",
+        "comments",
+        "comment_id",
+        {
+            "text": _column("body"),
+            "type": _const("comment"),
+            "resource_subtype": _const("comment_added"),
+            "created_at": _column("created_at"),
+            "created_by": _ref("user", "user_id"),
+            "target": _ref("task", "task_id"),
+        },
+        compact=("created_at", "created_by", "resource_subtype", "text"),
+    ),
+    "tag": Resource("tag", "tags", "tag_id", {"name": _column("name")}),
+    "custom_field": Resource(
+        "custom_field",
+        "custom_fields",
+        "field_id",
+        {
+            "name": _column("name"),
+            "type": _column("field_type"),
+            "resource_subtype": _column("field_type"),
+        },
+        compact=("name", "type"),
+    ),
+    "custom_field_setting": Resource(
+        "custom_field_setting",
+        "custom_fields",
+        "field_id",
+        {
+            "custom_field": _custom_field,
+            "project": _ref("project", "project_id"),
+            "is_important": _const(False),
+        },
+        compact=("custom_field",),
+    ),
+}
+
+
+def serialize(conn, resource: Resource, rows: list, fields: tuple) -> list:
+    """
+    Turn rows of a resource's table into API objects with the given fields.
+    """
+    keys = [row[resource.key] for row in rows]
+    related = {
+        name: resource.related[name](conn, keys)
+        for name in fields
+        if name in resource.related and keys
+    }
+
+    objects = []
+    for key, row in zip(keys, rows):
+        item = {
+            "gid": f"{resource.gid_prefix}{key}",
+            "resource_type": resource.resource_type,
+        }
+        for name in fields:
+            if name in related:
+                item[name] = related[name][key]
+            else:
+                field = resource.fields.get(name)
+                item[name] = field(row) if field is not None else None
+        objects.append(item)
+
+    return objects
+
+
+# ==========
+# PAGINATION
+# ==========
+
+def encode_offset(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_offset(token: str, width: int) -> list:
+    """
+    Decode an offset token into the sort key it continues after.
+
+    Raises:
+        ApiError: If the token was not produced for this collection
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        values = None
+
+    if not isinstance(values, list) or len(values) != width:
+        raise ApiError(400, "offset: Your pagination token is invalid.")
+
+    return values
+
+
+def page_args(request: web.Request) -> tuple:
+    """
+    Return (limit, offset) of a collection request.
+    """
+    raw = request.query.get("limit", str(MAX_PAGE_LIMIT))
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        raise ApiError(
+            400, f"limit: Must be between 1 and {MAX_PAGE_LIMIT}, got {raw!r}."
+        )
+
+    return limit, request.query.get("offset")
+
+
+def opt_fields(request: web.Request, resource: Resource) -> tuple:
+    """
+    Return the fields requested with opt_fields (the compact fields by
+    default).
+
+    Raises:
+        ApiError: On a field the resource does not have
+    """
+    raw = request.query.get("opt_fields")
+    if not raw:
+        return resource.compact
+
+    fields = []
+    for name in raw.split(","):
+        name = name.strip().split(".", 1)[0]
+        if name in ("gid", "resource_type") or not name or name in fields:
+            continue
+        if name not in resource.field_names():
+            raise ApiError(
+                400,
+                f"opt_fields: Unknown field {name!r} for {resource.resource_type}. "
+                f"Valid fields: {', '.join(sorted(resource.field_names()))}.",
+            )
+        fields.append(name)
+
+    return tuple(fields)
+
+
+# =======
+# QUERIES
+# =======
+
+def fetch_item(conn, resource: Resource, gid: str, fields: tuple, fallback=None):
+    """
+    Return {"data": object} for one gid.
+
+    Raises:
+        ApiError: 404 if neither resource nor fallback has the gid
+    """
+    for candidate in (resource, fallback):
+        key = candidate.key_of(gid) if candidate is not None else None
+        if key is None:
+            continue
+        row = conn.execute(
+            f"SELECT * FROM {candidate.table} WHERE {candidate.key} = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            return {"data": serialize(conn, candidate, [row], fields)[0]}
+
+    raise ApiError(404, f"{resource.resource_type}: Unknown object: {gid}")
+
+
+def fetch_page(
+    conn,
+    resource: Resource,
+    where: list,
+    params: list,
+    order: tuple,
+    limit: int,
+    offset,
+    fields: tuple,
+    parent=None,
+) -> tuple:
+    """
+    Return one keyset page of a collection.
+
+    Args:
+        where (list): SQL conditions (ANDed) selecting the collection
+        params (list): Their parameters
+        order (tuple): Unique sort key columns
+        limit (int): Page size
+        offset (str): Token of the previous page (None for the first)
+        parent (tuple): (Resource, gid) that must exist, else 404
+
+    Returns:
+        tuple: (objects, offset token of the next page or None)
+    """
+    if parent is not None:
+        parent_resource, parent_gid = parent
+        exists = conn.execute(
+            f"SELECT 1 FROM {parent_resource.table} "
+            f"WHERE {parent_resource.key} = ?",
+            (parent_gid,),
+        ).fetchone()
+        if exists is None:
+            raise ApiError(
+                404,
+                f"{parent_resource.resource_type}: Unknown object: {parent_gid}",
+            )
+
+    where = list(where)
+    params = list(params)
+    if offset is not None:
+        where.append(
+            f"({', '.join(order)}) > ({', '.join('?' * len(order))})"
+        )
+        params.extend(decode_offset(offset, len(order)))
+
+    rows = conn.execute(
+        f"SELECT * FROM {resource.table} "
+        f"{'WHERE ' + ' AND '.join(where) if where else ''} "
+        f"ORDER BY {', '.join(order)} LIMIT ?",
+        (*params, limit + 1),
+    ).fetchall()
+
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = encode_offset([rows[-1][column] for column in order])
+
+    return serialize(conn, resource, rows, fields), next_offset
+
+
+def task_filters(request: web.Request) -> tuple:
+    """
+    Return (where, params) for the completed_since parameter of task
+    collections ("now": incomplete tasks only).
+    """
+    since = request.query.get("completed_since")
+    if not since:
+        return [], []
+
+    if since == "now":
+        return ["completed = 0"], []
+
+    try:
+        instant = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    except ValueError:
+        raise ApiError(400, f"completed_since: Invalid date-time {since!r}.")
+
+    if instant.tzinfo is not None:
+        # Stored timestamps are naive UTC
+        instant = instant.astimezone(timezone.utc).replace(tzinfo=None)
+    return (
+        ["(completed = 0 OR completed_at >= ?)"],
+        [instant.strftime("%Y-%m-%dT%H:%M:%S")],
+    )
+
+
+# ==============
+# POOL AND CACHE
+# ==============
+
+def set_journal_mode(db_path, mode: str) -> tuple:
+    """
+    Switch the database's (persistent) journal mode.
+
+    Returns:
+        tuple: (previous mode, resulting mode)
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        previous = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        current = conn.execute(f"PRAGMA journal_mode = {mode};").fetchone()[0]
+        return previous, current
+    finally:
+        conn.close()
+
+
+def _in_snapshot(conn, func, *args):
+    conn.execute("BEGIN")
+    try:
+        return func(conn, *args)
+    finally:
+        conn.execute("COMMIT")
+
+
+class ReadPool:
+    """
+    Fixed set of read-only SQLite connections, each used by one executor
+    thread at a time, so queries never block the event loop.
+
+    Args:
+        db_path (str): Database file
+        size (int): Connections (and threads)
+    """
+
+    def __init__(self, db_path, size: int = 4):
+        self.size = max(1, size)
+        self._conns = []
+
+        for _ in range(self.size):
+            conn = sqlite3.connect(
+                db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only = ON;")
+            self._conns.append(conn)
+
+        # Sees other connections' commits, to invalidate cached responses
+        self._watch = sqlite3.connect(db_path, check_same_thread=False)
+        self._data_version = self._read_data_version()
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="api-read"
+        )
+        self._idle = None
+
+    def _read_data_version(self) -> int:
+        return self._watch.execute("PRAGMA data_version;").fetchone()[0]
+
+    def changed(self) -> bool:
+        """
+        Return True if another connection committed since the last call.
+        """
+        version = self._read_data_version()
+        if version == self._data_version:
+            return False
+        self._data_version = version
+        return True
+
+    async def run(self, func, *args):
+        """
+        Run func(conn, *args) in one read transaction on an idle connection.
+        """
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for conn in self._conns:
+                self._idle.put_nowait(conn)
+
+        conn = await self._idle.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, _in_snapshot, conn, func, *args
+            )
+        finally:
+            self._idle.put_nowait(conn)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        for conn in self._conns:
+            conn.close()
+        self._watch.close()
+
+
+class ResponseCache:
+    """
+    LRU cache of serialized responses: key -> (body, etag).
+
+    Args:
+        maxsize (int): Entries kept (0 disables caching)
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, body: bytes, etag: str):
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (body, etag)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def etag_of(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: web.Request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def cache_key(request: web.Request) -> str:
+    return f"{request.path}?{urlencode(sorted(request.query.items()))}"
+
+
+# ========
+# HANDLERS
+# ========
+
+POOL = web.AppKey("pool", ReadPool)
+CACHE = web.AppKey("cache", ResponseCache)
+
+
+def _error_response(status: int, message: str) -> web.Response:
+    return web.json_response({"errors": [{"message": message}]}, status=status)
+
+
+def _cached_response(request, body: bytes, etag: str, hit: bool) -> web.Response:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Cache": "hit" if hit else "miss",
+    }
+    if etag_matches(request, etag):
+        return web.Response(status=304, headers=headers)
+
+    return web.Response(
+        body=body, content_type="application/json", headers=headers
+    )
+
+
+@web.middleware
+async def api_middleware(request: web.Request, handler):
+    """
+    Serve GETs from the response cache (with ETags) and report errors in
+    Asana's {"errors": [...]} format.
+    """
+    pool = request.app[POOL]
+    cache = request.app[CACHE]
+
+    if pool.changed():
+        cache.clear()
+
+    key = cache_key(request)
+    entry = cache.get(key)
+    if entry is not None:
+        return _cached_response(request, *entry, hit=True)
+
+    try:
+        body = await handler(request)
+    except ApiError as e:
+        return _error_response(e.status, e.message)
+    except web.HTTPException as e:
+        return _error_response(e.status, e.reason)
+
+    etag = etag_of(body)
+    cache.put(key, body, etag)
+
+    return _cached_response(request, body, etag, hit=False)
+
+
+def _encode(document: dict) -> bytes:
+    return json.dumps(document, separators=(",", ":")).encode("utf-8")
+
+
+def item_handler(name: str, fallback: str = None):
+    """
+    Handler of /<collection>/{gid}.
+    """
+    resource = RESOURCES[name]
+    fallback = RESOURCES[fallback] if fallback else None
+
+    async def handler(request: web.Request) -> bytes:
+        fields = opt_fields(request, resource)
+        document = await request.app[POOL].run(
+            fetch_item, resource, request.match_info["gid"], fields, fallback
+        )
+        return _encode(document)
+
+    return handler
+
+
+def page_document(request: web.Request, objects: list, next_offset) -> dict:
+    next_page = None
+    if next_offset is not None:
+        url = str(request.rel_url.update_query(offset=next_offset))
+        next_page = {
+            "offset": next_offset,
+            "path": url.removeprefix(API_PREFIX),
+            "uri": f"{request.scheme}://{request.host}{url}",
+        }
+
+    return {"data": objects, "next_page": next_page}
+
+
+async def _page(request, resource, where, params, order, parent=None) -> bytes:
+    limit, offset = page_args(request)
+    fields = opt_fields(request, resource)
+
+    if resource.resource_type == "task":
+        task_where, task_params = task_filters(request)
+        where = where + task_where
+        params = params + task_params
+
+    objects, next_offset = await request.app[POOL].run(
+        fetch_page,
+        resource,
+        where,
+        params,
+        order,
+        limit,
+        offset,
+        fields,
+        parent,
+    )
+    return _encode(page_document(request, objects, next_offset))
+
+
+def collection_handler(
+    name: str,
+    where: str = None,
+    parent: str = None,
+    order: tuple = None,
+):
+    """
+    Handler of a collection, optionally scoped to the {gid} in its path.
+
+    Args:
+        name (str): Resource listed
+        where (str): SQL condition whose "?" are bound to {gid}
+        parent (str): Resource that {gid} must exist in
+        order (tuple): Unique sort key (default: the resource's key)
+    """
+    resource = RESOURCES[name]
+    parent = RESOURCES[parent] if parent else None
+    order = order or (resource.key,)
+
+    async def handler(request: web.Request) -> bytes:
+        gid = request.match_info.get("gid")
+        return await _page(
+            request,
+            resource,
+            [where] if where else [],
+            [gid] * where.count("?") if where else [],
+            order,
+            (parent, gid) if parent else None,
+        )
+
+    return handler
+
+
+# Task filters of GET /tasks: parameter -> (condition, scoping resource)
+TASK_QUERY_FILTERS = {
+    "project": ("project_id = ?", "project"),
+    # Through the project so idx_tasks_project_section serves the lookup
+    "section": (
+        "project_id = (SELECT project_id FROM sections WHERE section_id = ?) "
+        "AND section_id = ?",
+        "section",
+    ),
+    "tag": ("task_id IN (SELECT task_id FROM task_tags WHERE tag_id = ?)", "tag"),
+    "assignee": ("assignee_id = ?", "user"),
+}
+
+
+async def tasks_handler(request: web.Request) -> bytes:
+    """
+    GET /tasks: tasks of exactly one project, section, tag or
+    assignee (+ workspace).
+    """
+    given = [name for name in TASK_QUERY_FILTERS if request.query.get(name)]
+
+    if len(given) != 1:
+        raise ApiError(
+            400,
+            "Must specify exactly one of project, tag, section, "
+            "or assignee + workspace",
+        )
+
+    name = given[0]
+    if name == "assignee" and not request.query.get("workspace"):
+        raise ApiError(400, "workspace: Missing input (required with assignee)")
+
+    condition, parent = TASK_QUERY_FILTERS[name]
+    gid = request.query[name]
+
+    return await _page(
+        request,
+        RESOURCES["task"],
+        [condition],
+        [gid] * condition.count("?"),
+        (RESOURCES["task"].key,),
+        (RESOURCES[parent], gid),
+    )
+
+
+ROUTES = [
+    ("/workspaces", collection_handler("workspace")),
+    ("/workspaces/{gid}", item_handler("workspace")),
+    ("/workspaces/{gid}/users", collection_handler("user", "org_id = ?", "workspace")),
+    ("/workspaces/{gid}/teams", collection_handler("team", "org_id = ?", "workspace")),
+    # Tags are global to the (single-organization) database
+    ("/workspaces/{gid}/tags", collection_handler("tag", parent="workspace")),
+    ("/users/{gid}", item_handler("user")),
+    (
+        "/users/{gid}/teams",
+        collection_handler(
+            "team",
+            "team_id IN (SELECT team_id FROM team_memberships WHERE user_id = ?)",
+            "user",
+        ),
+    ),
+    ("/teams/{gid}", item_handler("team")),
+    (
+        "/teams/{gid}/users",
+        collection_handler(
+            "user",
+            "user_id IN (SELECT user_id FROM team_memberships WHERE team_id = ?)",
+            "team",
+        ),
+    ),
+    ("/teams/{gid}/projects", collection_handler("project", "team_id = ?", "team")),
+    ("/projects/{gid}", item_handler("project")),
+    (
+        "/projects/{gid}/sections",
+        collection_handler(
+            "section", "project_id = ?", "project", ("position", "section_id")
+        ),
+    ),
+    ("/projects/{gid}/tasks", collection_handler("task", "project_id = ?", "project")),
+    (
+        "/projects/{gid}/custom_field_settings",
+        collection_handler("custom_field_setting", "project_id = ?", "project"),
+    ),
+    ("/sections/{gid}", item_handler("section")),
+    (
+        "/sections/{gid}/tasks",
+        collection_handler("task", TASK_QUERY_FILTERS["section"][0], "section"),
+    ),
+    ("/tasks", tasks_handler),
+    ("/tasks/{gid}", item_handler("task", fallback="subtask")),
+    (
+        "/tasks/{gid}/subtasks",
+        collection_handler("subtask", "parent_task_id = ?", "task"),
+    ),
+    (
+        "/tasks/{gid}/stories",
+        collection_handler(
+            "story", "task_id = ?", "task", ("created_at", "comment_id")
+        ),
+    ),
+    (
+        "/tasks/{gid}/tags",
+        collection_handler(
+            "tag", "tag_id IN (SELECT tag_id FROM task_tags WHERE task_id = ?)", "task"
+        ),
+    ),
+    ("/tags/{gid}", item_handler("tag")),
+    (
+        "/tags/{gid}/tasks",
+        collection_handler("task", TASK_QUERY_FILTERS["tag"][0], "tag"),
+    ),
+    ("/custom_fields/{gid}", item_handler("custom_field")),
+    ("/stories/{gid}", item_handler("story")),
+]
+
+
+def create_app(db_path, pool_size: int = 4, cache_size: int = 1024) -> web.Application:
+    """
+    Build the API application over a generated database.
+
+    Args:
+        db_path (str): Generated SQLite database
+        pool_size (int): Read connections (and threads)
+        cache_size (int): Responses kept in the LRU cache (0 disables it)
+
+    Returns:
+        web.Application: Ready for web.run_app
+
+    Raises:
+        FileNotFoundError: If the database does not exist
+    """
+    db_path = Path(db_path)
+    if not db_path.exists():
+        raise FileNotFoundError(f"{db_path} not found; generate it first")
+
+    # WAL lets readers and an ADVANCE_DAYS writer run side by side; the
+    # database's own journal mode is put back on shutdown
+    previous, mode = set_journal_mode(db_path, "WAL")
+    if mode.lower() != "wal":
+        logger.warning(f"Could not enable WAL mode (journal_mode={mode})")
+
+    app = web.Application(middlewares=[api_middleware])
+    app[POOL] = ReadPool(db_path, pool_size)
+    app[CACHE] = ResponseCache(cache_size)
+
+    for path, handler in ROUTES:
+        app.router.add_get(API_PREFIX + path, handler)
+
+    async def close_pool(app):
+        app[POOL].close()
+        if previous.lower() != mode.lower():
+            try:
+                set_journal_mode(db_path, previous)
+            except sqlite3.OperationalError as e:
+                logger.warning(
+                    f"{db_path} stays in WAL mode "
+                    f"(could not restore journal_mode={previous}: {e})"
+                )
+
+    app.on_cleanup.append(close_pool)
+
+    return app
+
+
+def main():
+    from main import load_config
+
+    logger.remove()
+    logger.add(sys.stderr, level="INFO")
+
+    config = load_config()
+    app = create_app(
+        config["db_path"], config["api_pool_size"], config["api_cache_size"]
+    )
+
+    logger.info(
+        f"Serving {config['db_path']} on "
+        f"http://{config['api_host']}:{config['api_port']}{API_PREFIX}"
+    )
+    web.run_app(
+        app,
+        host=config["api_host"],
+        port=config["api_port"],
+        access_log=None,
+        print=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""Discrete-event simulation of task activity (ACTIVITY_EVENTS)."""
+
+import heapq
+from itertools import chain
+
+from loguru import logger
+
+from utils.compact import EVENT_TYPE_IDS, is_compact
+from utils.db import execute_batches, get_batch_size
+from utils.dates import iso_timestamp
+from utils.parallel import map_shards
+from utils.random import entity_rng, probability
+
+
+# Section positions (DEFAULT_SECTIONS order)
+BACKLOG, TODO, IN_PROGRESS, IN_REVIEW = 0, 1, 2, 3
+
+# Share of tasks that start in "To Do" rather than "Backlog"
+START_IN_TODO = 0.5
+
+# Share of tasks that reach review and get sent back to "In Progress" once
+REWORK_PROBABILITY = 0.15
+
+# Unassigned tasks: share that had an assignee who was later removed
+LATER_UNASSIGNED = 0.2
+
+# Assigned tasks: share first assigned to someone else, and share created
+# unassigned (the rest keep their assignee from creation)
+FIRST_ASSIGNED_ELSEWHERE = 0.2
+CREATED_UNASSIGNED = 0.1
+
+# Ordering of events of one task that fall on the same second
+_CREATED, _ACTIVE, _COMPLETED = 0, 1, 2
+
+# Kinds of scheduled events
+_CREATION, _TRANSITION, _COMMENT, _COMPLETION = 0, 1, 2, 3
+
+
+def plan_task(final_section: int, final_assignee, members, rng) -> tuple:
+    """
+    Draw the path of one task to its final section and assignee.
+
+    Args:
+        final_section (int): Position of the task's section
+        final_assignee: The task's assignee (None when unassigned)
+        members: Users the project's work goes to
+        rng: The task's activity stream
+
+    Returns:
+        tuple: (starting section, starting assignee, transitions), where
+            transitions is the ordered list of ("section", position) and
+            ("assignee", user) changes
+    """
+
+    if final_section == BACKLOG or not probability(START_IN_TODO, rng):
+        start = BACKLOG
+    else:
+        start = TODO
+
+    transitions = [
+        ("section", position) for position in range(start + 1, final_section + 1)
+    ]
+
+    # Sent back from review once: ... -> In Review -> In Progress -> In Review
+    if final_section >= IN_REVIEW and probability(REWORK_PROBABILITY, rng):
+        review = IN_REVIEW - start - 1
+        transitions[review + 1:review + 1] = [
+            ("section", IN_PROGRESS),
+            ("section", IN_REVIEW),
+        ]
+
+    changes = []
+    if final_assignee is None:
+        assignee = None
+        if probability(LATER_UNASSIGNED, rng):
+            assignee = rng.choice(members)
+            changes.append(("assignee", None))
+    else:
+        draw = rng.random()
+        if draw < FIRST_ASSIGNED_ELSEWHERE:
+            assignee = rng.choice(members)
+        elif draw < FIRST_ASSIGNED_ELSEWHERE + CREATED_UNASSIGNED:
+            assignee = None
+        else:
+            assignee = final_assignee
+
+        if assignee != final_assignee:
+            changes.append(("assignee", final_assignee))
+
+    # Assignment changes happen anywhere along the section path
+    for change in changes:
+        transitions.insert(rng.randint(0, len(transitions)), change)
+
+    return start, assignee, transitions
+
+
+def simulate_project(tasks: list, section_ids: list, members) -> list:
+    """
+    Run the event simulation of one project.
+
+    Args:
+        tasks (list): One (task key, activity window, completed_at epoch
+            or None, comments as (author, epoch) pairs, plan from
+            plan_task(), activity stream) tuple per task
+        section_ids (list): Section IDs of the project, in position order
+        members: Users the project's work goes to
+
+    Returns:
+        list: (task key, event type, actor, section ID, assignee, epoch)
+            tuples, in time order
+    """
+
+    # (time, same-second rank, sequence, kind, task slot, payload); the
+    # sequence number keeps ties in scheduling order
+    heap = [
+        (task[1][0], _CREATED, slot, _CREATION, slot, None)
+        for slot, task in enumerate(tasks)
+    ]
+    heapq.heapify(heap)
+    sequence = len(heap)
+
+    # Per task: [section position, assignee, pending transitions]
+    state = [None] * len(tasks)
+
+    events = []
+    append = events.append
+
+    while heap:
+        at, _, _, kind, slot, payload = heapq.heappop(heap)
+        key, window, completed_at, comments, plan, rng = tasks[slot]
+
+        if kind == _CREATION:
+            section, assignee, transitions = plan
+            task = state[slot] = [section, assignee, transitions[::-1]]
+            actor = assignee if assignee is not None else rng.choice(members)
+            event_type = "created"
+
+            for author, posted_at in comments:
+                heapq.heappush(
+                    heap, (posted_at, _ACTIVE, sequence, _COMMENT, slot, author)
+                )
+                sequence += 1
+            if completed_at is not None:
+                heapq.heappush(
+                    heap, (completed_at, _COMPLETED, sequence, _COMPLETION, slot, None)
+                )
+                sequence += 1
+        else:
+            task = state[slot]
+            section, assignee, pending = task
+
+            if kind == _TRANSITION:
+                field, value = pending.pop()
+                if field == "section":
+                    task[0] = section = value
+                    actor = assignee if assignee is not None else rng.choice(members)
+                    event_type = "section_changed"
+                else:
+                    task[1] = assignee = value
+                    actor = rng.choice(members)
+                    event_type = "unassigned" if value is None else "assigned"
+            elif kind == _COMMENT:
+                actor = payload
+                event_type = "commented"
+            else:
+                actor = assignee if assignee is not None else rng.choice(members)
+                event_type = "completed"
+
+        append((key, event_type, actor, section_ids[section], assignee, at))
+
+        # Schedule the task's next transition: the earliest of the
+        # `remaining` uniform instants left in (now, window end]
+        if kind == _CREATION or kind == _TRANSITION:
+            remaining = len(task[2])
+            if remaining:
+                next_at = at + int(
+                    (window[1] - at) * (1 - rng.random() ** (1 / remaining))
+                )
+                heapq.heappush(
+                    heap, (next_at, _ACTIVE, sequence, _TRANSITION, slot, None)
+                )
+                sequence += 1
+
+    return events
+
+
+def prepare_task(
+    key,
+    task_index: int,
+    window: tuple,
+    completed_at,
+    comments: list,
+    final_section: int,
+    final_assignee,
+    members,
+    config: dict,
+) -> tuple:
+    """
+    Draw the activity plan of task #task_index from its activity stream.
+
+    Args:
+        key: Task ID (or integer key) events refer to
+        task_index (int): Global index of the task
+        window (tuple): (start, end) epoch seconds of the task's activity
+            (see tasks.activity_window)
+        completed_at: Completion time (epoch seconds), None while open
+        comments (list): (author, epoch seconds) of the task's comments,
+            in posting order
+        final_section (int): Position of the task's section
+        final_assignee: The task's assignee (None when unassigned)
+        members: Users the project's work goes to
+        config (dict): Configuration values
+
+    Returns:
+        tuple: One entry of simulate_project()'s tasks
+    """
+    rng = entity_rng(config["random_seed"], "activity", task_index)
+    plan = plan_task(final_section, final_assignee, members, rng)
+
+    return key, window, completed_at, comments, plan, rng
+
+
+def project_activity(project_index: int, graph, config: dict) -> list:
+    """
+    Simulate the activity of one project's tasks.
+
+    Task state and comments come from the registry (recorded by the tasks
+    and comments stages), so no row is rebuilt. A task's events depend on
+    its own stream only, so they are the same when the task is simulated
+    on its own (VirtualWorkspace.activity). The project's pending events
+    and its log are held in memory until the project is done.
+
+    Args:
+        project_index (int): Project index
+        graph (WorkspaceGraph): Registry; reads sections, team members,
+            users, task_ids, project_tasks, the tasks' activity windows
+            and state, and their comments
+        config (dict): Configuration values
+
+    Returns:
+        list: Event tuples from simulate_project()
+    """
+
+    section_ids = graph.sections(project_index)
+    members = graph.assignees(graph.project_teams[project_index])
+
+    tasks = []
+    for task_index in graph.project_tasks[project_index]:
+        assignee = graph.task_assignees[task_index]
+        completed_at = graph.task_completed_at[task_index]
+        tasks.append(
+            prepare_task(
+                graph.task_ids[task_index],
+                task_index,
+                (
+                    graph.task_created_at[task_index],
+                    graph.task_active_until[task_index],
+                ),
+                None if completed_at < 0 else completed_at,
+                graph.comments(task_index),
+                graph.task_sections[task_index],
+                None if assignee < 0 else members[assignee],
+                members,
+                config,
+            )
+        )
+
+    return simulate_project(tasks, section_ids, members)
+
+
+def _activity_shard(shard: int, context: tuple) -> list:
+    """
+    Build the activity_events rows of one project (without event_id).
+    """
+    graph, config = context
+    events = project_activity(shard, graph, config)
+
+    if is_compact(config):
+        return [
+            (key, EVENT_TYPE_IDS[event_type], actor, section_id, assignee, at)
+            for key, event_type, actor, section_id, assignee, at in events
+        ]
+
+    return [
+        (key, event_type, actor, section_id, assignee, iso_timestamp(at))
+        for key, event_type, actor, section_id, assignee, at in events
+    ]
+
+
+def generate_activity(conn, graph, config: dict):
+    """
+    Simulate the history of every task into activity_events.
+
+    Runs only with ``config["activity_events"]``; projects are sharded
+    across ``config["workers"]`` processes and events are streamed to the
+    database in batches of ``config["batch_size"]``.
+
+    The log is written project by project, each project's events in time
+    order; it is not in time order across projects (ORDER BY occurred_at
+    for a workspace-wide timeline).
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads users, teams, projects,
+            sections, tasks and the task state and comments the tasks
+            and comments stages recorded
+        config (dict): Configuration values
+    """
+
+    if not config.get("activity_events"):
+        logger.info("Skipping activity events (ACTIVITY_EVENTS=false)")
+        return
+
+    table = "activity_events_compact" if is_compact(config) else "activity_events"
+    event_type = "event_type_id" if is_compact(config) else "event_type"
+
+    query = f"""
+        INSERT INTO {table} (
+            event_id,
+            task_id,
+            {event_type},
+            actor_id,
+            section_id,
+            assignee_id,
+            occurred_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
+    events = chain.from_iterable(
+        map_shards(
+            _activity_shard,
+            range(len(graph.project_ids)),
+            config,
+            (graph, config),
+        )
+    )
+
+    # Keys follow the write order (project by project, each in time order)
+    total = execute_batches(
+        conn,
+        query,
+        ((event_id, *row) for event_id, row in enumerate(events, start=1)),
+        get_batch_size(config),
+    )
+
+    logger.info(f"Generated {total} activity events")
@@ -0,0 +1,562 @@
+"""Move an existing workspace's clock forward (ADVANCE_DAYS)."""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from loguru import logger
+
+from generators.comments import to_compact_comment
+from generators.subtasks import SUBTASK_TEMPLATES, to_compact_subtask
+from generators.tasks import SECTION_WEIGHTS, TASK_NAMES, to_compact_task
+from generators.text_grammar import comment_body, describe_task
+from utils.compact import EVENT_TYPE_IDS, SCHEMA_FILES, is_compact, to_epoch
+from utils.dates import (
+    SECONDS_PER_DAY,
+    iso_date,
+    iso_timestamp,
+    maybe_due_day,
+    reference_epoch,
+    set_reference_time,
+)
+from utils.db import (
+    execute_many,
+    execute_one,
+    index_if_not_exists,
+    single_transaction,
+    split_index_statements,
+)
+from utils.random import entity_rng, probability, random_uuid
+
+
+CLOCK_TABLE = "simulation_clock"
+
+# Share of generated tasks that end up completed (see build_task)
+COMPLETION_RATIO = 0.65
+
+# Mean subtasks per task with subtasks (randint(1, 4)) and comments per
+# commented task (randint(1, 5)), with the share of tasks that get any
+MEAN_SUBTASKS = 2.5
+MEAN_COMMENTS = 3.0
+COMMENT_RATIO = 0.6
+
+
+def daily_rates(config: dict) -> dict:
+    """
+    Expected events per project per simulated day.
+
+    New tasks arrive at the rate that fills tasks_per_project over the
+    history window; completions, subtasks and comments follow from it
+    with the proportions of the initial generation.
+    """
+    tasks = config["tasks_per_project"] / max(1, config["history_days"])
+
+    return {
+        "tasks": tasks,
+        "completions": tasks * COMPLETION_RATIO,
+        "subtasks": tasks * config["subtask_ratio"] * MEAN_SUBTASKS,
+        "comments": tasks * COMMENT_RATIO * MEAN_COMMENTS,
+    }
+
+
+def draw_count(rate: float, rng) -> int:
+    """
+    Draw an event count with mean rate: its whole part, plus one with
+    the probability of its fractional part.
+    """
+    whole = int(rate)
+    return whole + probability(rate - whole, rng)
+
+
+def ensure_indexes(conn, config: dict):
+    """
+    Create the profile schema's indexes a database predating them lacks.
+    """
+    schema_file = Path(__file__).resolve().parents[2] / SCHEMA_FILES[
+        config.get("storage_profile", "standard")
+    ]
+    _, indexes = split_index_statements(schema_file.read_text(encoding="utf-8"))
+
+    for statement in indexes:
+        conn.execute(index_if_not_exists(statement))
+
+
+def workspace_clock(conn) -> tuple:
+    """
+    Return (generation reference time, current time) of a workspace.
+
+    The organization is created at the generation reference time; every
+    simulated day moves the current time to its end_time.
+    """
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {CLOCK_TABLE} (
+            day INTEGER PRIMARY KEY,
+            start_time TIMESTAMP NOT NULL,
+            end_time TIMESTAMP NOT NULL,
+            tasks_created INTEGER NOT NULL,
+            tasks_completed INTEGER NOT NULL,
+            subtasks_created INTEGER NOT NULL,
+            comments_created INTEGER NOT NULL
+        )
+        """
+    )
+
+    row = conn.execute("SELECT created_at FROM organizations").fetchone()
+    if row is None:
+        raise ValueError("Database holds no generated workspace to advance")
+    generated_at = datetime.fromisoformat(row[0])
+
+    row = conn.execute(
+        f"SELECT end_time FROM {CLOCK_TABLE} ORDER BY day DESC LIMIT 1"
+    ).fetchone()
+
+    return generated_at, datetime.fromisoformat(row[0]) if row else generated_at
+
+
+class _Workspace:
+    """
+    Per-project structure of an existing workspace, read once per run.
+    """
+
+    def __init__(self, conn, config: dict):
+        self.conn = conn
+        self.compact = is_compact(config)
+        self.tasks_table = "tasks_compact" if self.compact else "tasks"
+
+        # Projects in generation order (their index keys the streams)
+        self.projects = conn.execute(
+            f"SELECT project_id, team_id, project_type FROM projects "
+            f"ORDER BY {'project_id' if self.compact else 'rowid'}"
+        ).fetchall()
+
+        self.sections = defaultdict(list)
+        for project_id, section_id in conn.execute(
+            "SELECT project_id, section_id FROM sections "
+            "ORDER BY project_id, position"
+        ):
+            self.sections[project_id].append(section_id)
+
+        self._members = {}
+        self._users = None
+
+        # Activity events are logged only where generation logged them,
+        # whatever ACTIVITY_EVENTS says for this run
+        self.events_table = None
+        table = "activity_events_compact" if self.compact else "activity_events"
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        ).fetchone():
+            last_event_id = conn.execute(
+                f"SELECT MAX(event_id) FROM {table}"
+            ).fetchone()[0]
+            if last_event_id is not None:
+                self.events_table = table
+                self.next_event_id = last_event_id + 1
+
+        if config.get("activity_events") and self.events_table is None:
+            logger.warning(
+                "ACTIVITY_EVENTS is set but the workspace has no activity "
+                "events; not logging events"
+            )
+
+        self.next_task_key = None
+        if self.compact:
+            self.next_task_key = conn.execute(
+                "SELECT COALESCE(MAX(task_id), 0) + 1 FROM tasks_compact"
+            ).fetchone()[0]
+
+    def assignees(self, team_id) -> list:
+        """
+        Return the users work in team_id's projects goes to: its members,
+        or every user when the team is empty.
+        """
+        members = self._members.get(team_id)
+
+        if members is None:
+            members = self._members[team_id] = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT user_id FROM team_memberships "
+                    "WHERE team_id = ? ORDER BY user_id",
+                    (team_id,),
+                )
+            ]
+
+        if members:
+            return members
+
+        if self._users is None:
+            self._users = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT user_id FROM users ORDER BY user_id"
+                )
+            ]
+        return self._users
+
+    def timestamp(self, seconds: int):
+        """Format epoch seconds for the tasks table of the profile."""
+        return seconds if self.compact else iso_timestamp(seconds)
+
+    def epoch(self, value) -> int:
+        """Convert a stored tasks timestamp back to epoch seconds."""
+        return value if self.compact else to_epoch(value)
+
+    def event(self, task_id, event_type: str, actor, section_id, assignee_id, at: int):
+        """
+        Build an activity_events row of the profile (keyed once the day's
+        events are sorted).
+        """
+        if self.compact:
+            event_type = EVENT_TYPE_IDS[event_type]
+        return (
+            None,
+            task_id,
+            event_type,
+            actor,
+            section_id,
+            assignee_id,
+            self.timestamp(at),
+        )
+
+    def pick_open_task(self, project_id, pivot: int):
+        """
+        Return (task_id, created_at epoch, section_id, assignee_id) of the
+        first open task of the project created at or after pivot (wrapping
+        around), or None.
+        """
+        query = (
+            f"SELECT task_id, created_at, section_id, assignee_id "
+            f"FROM {self.tasks_table} "
+            f"WHERE project_id = ? AND completed_at IS NULL "
+            f"AND created_at >= ? "
+            f"ORDER BY created_at LIMIT 1"
+        )
+        row = self.conn.execute(
+            query, (project_id, self.timestamp(pivot))
+        ).fetchone()
+
+        if row is None:
+            row = self.conn.execute(
+                f"SELECT task_id, created_at, section_id, assignee_id "
+                f"FROM {self.tasks_table} "
+                f"WHERE project_id = ? AND completed_at IS NULL "
+                f"ORDER BY created_at LIMIT 1",
+                (project_id,),
+            ).fetchone()
+
+        return None if row is None else (row[0], self.epoch(row[1]), *row[2:])
+
+
+def _advance_project(
+    workspace: _Workspace,
+    project_index: int,
+    day: int,
+    rates: dict,
+    config: dict,
+) -> dict:
+    """
+    Simulate one day of one project and write its rows.
+
+    Returns:
+        dict: Rows written per kind of event
+    """
+    conn = workspace.conn
+    compact = workspace.compact
+    project_id, team_id, project_type = workspace.projects[project_index]
+
+    rng = entity_rng(config["random_seed"], f"advance:{day}", project_index)
+
+    day_end = reference_epoch()
+    day_start = day_end - SECONDS_PER_DAY
+    window = config["history_days"] * SECONDS_PER_DAY
+    assignees = workspace.assignees(team_id)
+    sections = workspace.sections[project_id]
+
+    # Activity events (logged when the workspace has activity_events)
+    events = []
+
+    # New tasks
+    task_rows = []
+    for _ in range(draw_count(rates["tasks"], rng)):
+        name = rng.choice(TASK_NAMES[project_type])
+        task_id = random_uuid(rng)
+        section_id = rng.choices(sections, weights=SECTION_WEIGHTS, k=1)[0]
+        description = (
+            describe_task(project_type, name, rng.getrandbits(64))
+            if probability(0.6, rng)
+            else None
+        )
+        created_at = day_end - rng.randrange(SECONDS_PER_DAY)
+        due_day = maybe_due_day(rng)
+        assignee_id = rng.choice(assignees) if probability(0.85, rng) else None
+        # Drawn whether or not events are logged, so the rows match
+        actor = assignee_id if assignee_id is not None else rng.choice(assignees)
+
+        row = (
+            task_id,
+            project_id,
+            section_id,
+            assignee_id,
+            name,
+            description,
+            iso_date(due_day) if due_day is not None else None,
+            False,
+            iso_timestamp(created_at),
+            None,
+        )
+        if compact:
+            row = to_compact_task(
+                workspace.next_task_key, row, created_at, None, due_day
+            )
+            workspace.next_task_key += 1
+        task_rows.append(row)
+        events.append(
+            workspace.event(
+                row[0], "created", actor, section_id, assignee_id, created_at
+            )
+        )
+
+    if task_rows:
+        execute_many(
+            conn,
+            f"""
+            INSERT INTO {workspace.tasks_table} (
+                task_id,
+                project_id,
+                section_id,
+                assignee_id,
+                name,
+                description,
+                due_date,
+                completed,
+                created_at,
+                completed_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            task_rows,
+        )
+
+    def pick():
+        return workspace.pick_open_task(
+            project_id, day_end - rng.randrange(window)
+        )
+
+    # Completions of open tasks
+    completed = 0
+    for _ in range(draw_count(rates["completions"], rng)):
+        task = pick()
+        if task is None:
+            break
+
+        task_id, created_at, section_id, assignee_id = task
+        completed_at = rng.randint(max(created_at, day_start), day_end)
+        actor = assignee_id if assignee_id is not None else rng.choice(assignees)
+        execute_one(
+            conn,
+            f"UPDATE {workspace.tasks_table} "
+            f"SET completed = 1, completed_at = ? WHERE task_id = ?",
+            (workspace.timestamp(completed_at), task_id),
+        )
+        completed += 1
+        events.append(
+            workspace.event(
+                task_id, "completed", actor, section_id, assignee_id, completed_at
+            )
+        )
+
+    # New subtasks and comments on open tasks
+    subtask_rows = []
+    for _ in range(draw_count(rates["subtasks"], rng)):
+        task = pick()
+        if task is None:
+            break
+
+        subtask_id = random_uuid(rng)
+        assignee_id = rng.choice(assignees) if probability(0.75, rng) else None
+        name = rng.choice(SUBTASK_TEMPLATES)
+        created_at = rng.randint(max(task[1], day_start), day_end)
+
+        row = (
+            subtask_id,
+            task[0],
+            assignee_id,
+            name,
+            False,
+            iso_timestamp(created_at),
+            None,
+        )
+        subtask_rows.append(
+            to_compact_subtask(row, created_at, None) if compact else row
+        )
+
+    comment_rows = []
+    for _ in range(draw_count(rates["comments"], rng)):
+        task = pick()
+        if task is None:
+            break
+
+        comment_id = random_uuid(rng)
+        user_id = rng.choice(assignees)
+        body = comment_body(project_type, rng.getrandbits(64))
+        posted_at = rng.randint(max(task[1], day_start), day_end)
+
+        row = (comment_id, task[0], user_id, body, iso_timestamp(posted_at))
+        comment_rows.append(
+            to_compact_comment(row, posted_at) if compact else row
+        )
+        events.append(
+            workspace.event(task[0], "commented", user_id, task[2], task[3], posted_at)
+        )
+
+    if subtask_rows:
+        execute_many(
+            conn,
+            f"""
+            INSERT INTO {"subtasks_compact" if compact else "subtasks"} (
+                subtask_id,
+                parent_task_id,
+                assignee_id,
+                name,
+                completed,
+                created_at,
+                completed_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            subtask_rows,
+        )
+    if comment_rows:
+        execute_many(
+            conn,
+            f"""
+            INSERT INTO {"comments_compact" if compact else "comments"} (
+                comment_id,
+                task_id,
+                user_id,
+                body,
+                created_at
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            comment_rows,
+        )
+    if events and workspace.events_table:
+        events.sort(key=lambda event: event[-1])
+        first = workspace.next_event_id
+        events = [
+            (event_id, *event[1:])
+            for event_id, event in enumerate(events, start=first)
+        ]
+        workspace.next_event_id += len(events)
+        execute_many(
+            conn,
+            f"""
+            INSERT INTO {workspace.events_table} (
+                event_id,
+                task_id,
+                {"event_type_id" if compact else "event_type"},
+                actor_id,
+                section_id,
+                assignee_id,
+                occurred_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            events,
+        )
+
+    return {
+        "tasks_created": len(task_rows),
+        "tasks_completed": completed,
+        "subtasks_created": len(subtask_rows),
+        "comments_created": len(comment_rows),
+    }
+
+
+def advance_workspace(conn, config: dict, days: int) -> dict:
+    """
+    Advance an existing workspace's clock by days and append the activity
+    of those days.
+
+    Every simulated day is committed on its own together with its
+    simulation_clock row, so an interrupted run keeps the days it
+    finished and the next one continues after them.
+
+    Args:
+        conn: SQLite connection to a generated workspace
+        config (dict): Configuration values of the generation run
+        days (int): Number of days to simulate
+
+    Returns:
+        dict: Rows written per kind of event
+
+    Raises:
+        ValueError: If days is not positive, or the database's storage
+            profile differs from the configured one
+    """
+    if days < 1:
+        raise ValueError(f"ADVANCE_DAYS must be positive, got {days}")
+
+    compact_db = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+        "AND name = 'tasks_compact'"
+    ).fetchone() is not None
+    if compact_db != is_compact(config):
+        raise ValueError(
+            "STORAGE_PROFILE does not match the profile of the database"
+        )
+
+    ensure_indexes(conn, config)
+    generated_at, now = workspace_clock(conn)
+    conn.commit()
+
+    workspace = _Workspace(conn, config)
+    rates = daily_rates(config)
+    totals = dict.fromkeys(
+        ("tasks_created", "tasks_completed", "subtasks_created", "comments_created"),
+        0,
+    )
+
+    for _ in range(days):
+        start = now
+        now = set_reference_time(now + timedelta(days=1))
+        day = (now - generated_at).days
+
+        with single_transaction(conn):
+            counts = dict.fromkeys(totals, 0)
+            for project_index in range(len(workspace.projects)):
+                for kind, count in _advance_project(
+                    workspace, project_index, day, rates, config
+                ).items():
+                    counts[kind] += count
+
+            execute_one(
+                conn,
+                f"""
+                INSERT INTO {CLOCK_TABLE} (
+                    day,
+                    start_time,
+                    end_time,
+                    tasks_created,
+                    tasks_completed,
+                    subtasks_created,
+                    comments_created
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (day, start.isoformat(), now.isoformat(), *counts.values()),
+            )
+
+        for kind, count in counts.items():
+            totals[kind] += count
+
+    logger.info(
+        f"Advanced the workspace by {days} days to {now.isoformat()}: "
+        + ", ".join(f"{count} {kind.replace('_', ' ')}" for kind, count in totals.items())
+    )
+
+    return totals
@@ -1,76 +1,178 @@
-import uuid
-import random
+from array import array
 
 from loguru import logger
 
-from utils.db import execute_many
-from utils.dates import random_past_datetime
-from utils.random import seed_everything, probability
+from generators.projects import PROJECT_TYPES
+from generators.text_grammar import comment_body
+from utils.compact import is_compact
+from utils.db import execute_batches, get_batch_size
+from utils.dates import iso_timestamp
+from utils.graph import Adjacency
+from utils.parallel import iter_chunks, map_shards
+from utils.random import entity_rng, probability, random_uuid
+
+
+def build_comments(
+    task_index: int,
+    task_id: str,
+    project_type: str,
+    window: tuple,
+    user_ids: list,
+    config: dict,
+    with_state: bool = False,
+) -> list:
+    """
+    Build the comments on task #task_index from the task's keyed stream.
+
+    Comments are posted while the task is active (within window), in
+    order. Their bodies are rendered from consecutive text keys starting
+    at one 64-bit draw.
+
+    Args:
+        task_index (int): Global index of the task
+        task_id (str): Task ID
+        project_type (str): Type of the task's project (comment vocabulary)
+        window (tuple): (start, end) epoch seconds of the task's activity
+            (see tasks.activity_window)
+        user_ids (list): User IDs (any sequence)
+        config (dict): Configuration values
+        with_state (bool): Give (row, created_at, author) with created_at
+            as epoch seconds and author as the position of the commenter
+            in user_ids
+
+    Returns:
+        list: Rows for the comments table (empty for some tasks)
+    """
+
+    rng = entity_rng(config["random_seed"], "comments", task_index)
+
+    # Only some tasks receive comments
+    if not probability(0.6, rng):
+        return []
+
+    num_comments = rng.randint(1, 5)
+
+    # Positions are sampled exactly like the IDs would be
+    commenters = rng.sample(
+        range(len(user_ids)),
+        k=min(len(user_ids), rng.randint(1, 3))
+    )
+
+    text_key = rng.getrandbits(64)
+    posted = sorted(rng.randint(*window) for _ in range(num_comments))
+
+    rows = []
+
+    for i, created_at in enumerate(posted):
+        comment_id = random_uuid(rng)
+        author = rng.choice(commenters)
+        body = comment_body(project_type, text_key + i)
+
+        row = (
+            comment_id,
+            task_id,
+            user_ids[author],
+            body,
+            iso_timestamp(created_at),
+        )
 
+        rows.append((row, created_at, author) if with_state else row)
 
-COMMENT_TEMPLATES = [
-    "Started working on this.",
-    "Blocked due to dependency, will update.",
-    "PR is up for review.",
-    "This should be ready by EOD.",
-    "Can someone please take a look?",
-    "Following up on this.",
-    "I think this is resolved now.",
-    "Waiting for confirmation from stakeholders.",
-    "Added more details to the description.",
-    "Marking this as done.",
-]
+    return rows
 
 
-def generate_comments(
-    conn,
+def iter_task_comments(
+    first_index: int,
     task_ids: list,
+    tasks: tuple,
     user_ids: list,
-    config: dict = None,
+    config: dict,
+    with_state: bool = False,
 ):
     """
-    Generate comments for a subset of tasks.
+    Lazily yield the comments of each task in a contiguous run.
 
     Args:
-        conn: SQLite connection
+        first_index (int): Global index of task_ids[0]
         task_ids (list): Task IDs
+        tasks (tuple): (project_types, task_created_at, task_active_until)
+            of the registry: every project's PROJECT_TYPES position and
+            every task's activity window, by global index
         user_ids (list): User IDs
-        config (dict, optional): Configuration values
+        config (dict): Configuration values
+        with_state (bool): Passed on to build_comments()
+
+    Yields:
+        list: build_comments() of each task, in order
     """
 
-    if config and "random_seed" in config:
-        seed_everything(config["random_seed"])
+    tasks_per_project = config["tasks_per_project"]
+    project_types, created_at, active_until = tasks
 
-    rows = []
+    for task_index, task_id in enumerate(task_ids, start=first_index):
+        project_type = PROJECT_TYPES[project_types[task_index // tasks_per_project]]
+        window = (created_at[task_index], active_until[task_index])
+        yield build_comments(
+            task_index,
+            task_id,
+            project_type,
+            window,
+            user_ids,
+            config,
+            with_state,
+        )
 
-    for task_id in task_ids:
-        # Only some tasks receive comments
-        if not probability(0.6):
-            continue
 
-        num_comments = random.randint(1, 5)
+def to_compact_comment(row: tuple, created_at: int) -> tuple:
+    """
+    Convert a comments row to the compact storage profile, given
+    created_at as epoch seconds (see build_comments).
 
-        commenters = random.sample(
-            user_ids,
-            k=min(len(user_ids), random.randint(1, 3))
-        )
+    The comment key is left NULL so SQLite assigns the next rowid.
+    """
+    return (None, row[1], row[2], row[3], created_at)
 
-        for _ in range(num_comments):
-            comment_id = str(uuid.uuid4())
-            user_id = random.choice(commenters)
-            body = random.choice(COMMENT_TEMPLATES)
-            created_at = random_past_datetime(180).isoformat()
 
-            rows.append(
-                (
-                    comment_id,
-                    task_id,
-                    user_id,
-                    body,
-                    created_at,
-                )
+def _comment_shard(shard: tuple, context: tuple) -> tuple:
+    """
+    Build the comment rows for one chunk of tasks and, when activity
+    events are simulated, each task's (author, created_at) pairs.
+    """
+    first_index, task_ids = shard
+    tasks, user_ids, config = context
+    compact = is_compact(config)
+
+    rows = []
+    comments = [] if config.get("activity_events") else None
+    for task_comments in iter_task_comments(
+        first_index, task_ids, tasks, user_ids, config, with_state=True
+    ):
+        for row, created_at, _ in task_comments:
+            rows.append(to_compact_comment(row, created_at) if compact else row)
+        if comments is not None:
+            comments.append(
+                [(author, created_at) for _, created_at, author in task_comments]
             )
 
+    return rows, comments
+
+
+def generate_comments(conn, graph, config: dict):
+    """
+    Generate comments for a subset of tasks.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads task_ids, project_types,
+            the tasks' activity windows and user_ids; with activity_events
+            records task_comments, comment_authors and comment_created_at
+        config (dict): Configuration values
+    """
+
+    task_comments = graph.task_comments = Adjacency(contiguous=True)
+    authors = graph.comment_authors = array("i")
+    created = graph.comment_created_at = array("q")
+
     query = """
         INSERT INTO comments (
             comment_id,
@@ -82,6 +184,40 @@ def generate_comments(
         VALUES (?, ?, ?, ?, ?)
     """
 
-    execute_many(conn, query, rows)
-
-    logger.info(f"Generated {len(rows)} comments")
+    if is_compact(config):
+        query = """
+            INSERT INTO comments_compact (
+                comment_id,
+                task_id,
+                user_id,
+                body,
+                created_at
+            )
+            VALUES (?, ?, ?, ?, ?)
+        """
+
+    def iter_rows():
+        for rows, comments in map_shards(
+            _comment_shard,
+            iter_chunks(graph.task_ids),
+            config,
+            (
+                (
+                    graph.project_types,
+                    graph.task_created_at,
+                    graph.task_active_until,
+                ),
+                graph.user_ids,
+                config,
+            ),
+        ):
+            for pairs in comments or ():
+                task_comments.add_run(len(pairs))
+                for author, created_at in pairs:
+                    authors.append(author)
+                    created.append(created_at)
+            yield from rows
+
+    total = execute_batches(conn, query, iter_rows(), get_batch_size(config))
+
+    logger.info(f"Generated {total} comments")
@@ -1,10 +1,10 @@
-import uuid
-import random
-
 from loguru import logger
 
-from utils.db import execute_many
-from utils.random import seed_everything, probability
+from generators.projects import PROJECT_TYPES
+from utils.compact import FIELD_TYPE_IDS, is_compact
+from utils.db import execute_many, get_batch_size
+from utils.parallel import map_shards
+from utils.random import entity_rng, probability, random_uuid
 
 
 CUSTOM_FIELD_TEMPLATES = {
@@ -23,56 +23,169 @@ CUSTOM_FIELD_TEMPLATES = {
 }
 
 
-def generate_custom_fields(
-    conn,
-    project_ids: list,
+# Compact storage profile: field keys are allotted per project with this
+# stride, and every non-numeric value is stored as a field_options key
+FIELD_KEY_STRIDE = max(len(fields) for fields in CUSTOM_FIELD_TEMPLATES.values())
+
+FIELD_OPTION_IDS = {}
+for _fields in CUSTOM_FIELD_TEMPLATES.values():
+    for _, _, _enum_values in _fields:
+        for _value in _enum_values or []:
+            FIELD_OPTION_IDS.setdefault(_value, len(FIELD_OPTION_IDS) + 1)
+FIELD_OPTION_IDS.setdefault("N/A", len(FIELD_OPTION_IDS) + 1)
+
+
+def iter_custom_field_value_rows(
+    fields: list,
     task_ids: list,
-    config: dict = None,
+    rng,
 ):
     """
-    Generate custom fields per project and assign values to tasks.
+    Lazily yield sparse custom field value rows for one project's fields.
 
     Args:
-        conn: SQLite connection
-        project_ids (list): Project IDs
-        task_ids (list): Task IDs
-        config (dict, optional): Configuration values
+        fields (list): (field_id, field_type, enum_values) tuples
+        task_ids (list): Task IDs of the project (any sequence)
+        rng: The project's keyed random stream
+
+    Yields:
+        tuple: A row for the custom_field_values table
     """
 
-    if config and "random_seed" in config:
-        seed_everything(config["random_seed"])
+    if not task_ids:
+        return
 
-    field_rows = []
-    value_rows = []
+    relevant_tasks = rng.sample(
+        task_ids,
+        k=max(1, int(0.2 * len(task_ids)))
+    )
 
-    # Create custom fields per project
-    project_field_map = {}
-
-    for project_id in project_ids:
-        # Randomly assign a project type for field selection
-        project_type = random.choices(
-            ["engineering", "marketing", "operations"],
-            weights=[0.5, 0.3, 0.2],
-            k=1
-        )[0]
-
-        project_field_map[project_id] = []
-
-        for field_name, field_type, enum_values in CUSTOM_FIELD_TEMPLATES[project_type]:
-            field_id = str(uuid.uuid4())
-
-            field_rows.append(
-                (
-                    field_id,
-                    project_id,
-                    field_name,
-                    field_type,
-                )
+    for task_id in relevant_tasks:
+        for field_id, field_type, enum_values in fields:
+            if not probability(0.6, rng):
+                continue
+
+            if field_type == "number":
+                value = str(rng.randint(1, 13))
+            elif field_type == "enum":
+                value = rng.choice(enum_values)
+            else:
+                value = "N/A"
+
+            yield (
+                field_id,
+                task_id,
+                value,
             )
 
-            project_field_map[project_id].append(
-                (field_id, field_type, enum_values)
+
+def build_custom_fields(
+    project_index: int,
+    project_id: str,
+    project_type: str,
+    task_ids: list,
+    config: dict,
+) -> tuple:
+    """
+    Build the field definitions and sparse values of project #project_index.
+
+    Args:
+        project_index (int): Project index
+        project_id (str): Project ID
+        project_type (str): Project type (picks the field templates)
+        task_ids (list): Task IDs of this project only
+        config (dict): Configuration values
+
+    Returns:
+        tuple: (field_rows, value_rows)
+    """
+
+    rng = entity_rng(config["random_seed"], "custom_fields", project_index)
+
+    field_rows = []
+    fields = []
+
+    for field_name, field_type, enum_values in CUSTOM_FIELD_TEMPLATES[project_type]:
+        field_id = random_uuid(rng)
+
+        field_rows.append(
+            (
+                field_id,
+                project_id,
+                field_name,
+                field_type,
             )
+        )
+
+        fields.append((field_id, field_type, enum_values))
+
+    value_rows = list(iter_custom_field_value_rows(fields, task_ids, rng))
+
+    return field_rows, value_rows
+
+
+def to_compact_custom_fields(
+    project_index: int,
+    field_rows: list,
+    value_rows: list,
+) -> tuple:
+    """
+    Convert one project's field and value rows to the compact storage profile.
+    """
+    first_key = project_index * FIELD_KEY_STRIDE + 1
+    field_keys = {}
+    compact_fields = []
+
+    for key, (field_id, project_id, name, field_type) in enumerate(
+        field_rows, start=first_key
+    ):
+        field_keys[field_id] = (key, field_type)
+        compact_fields.append((key, project_id, name, FIELD_TYPE_IDS[field_type]))
+
+    compact_values = []
+
+    for field_id, task_id, value in value_rows:
+        key, field_type = field_keys[field_id]
+
+        if field_type == "number":
+            compact_values.append((key, task_id, None, int(value)))
+        else:
+            compact_values.append((key, task_id, FIELD_OPTION_IDS[value], None))
+
+    return compact_fields, compact_values
+
+
+def _custom_field_shard(shard: tuple, context: tuple) -> tuple:
+    """
+    Build the custom fields of one project.
+    """
+    project_index, project_id, project_type, task_ids = shard
+    config = context
+
+    field_rows, value_rows = build_custom_fields(
+        project_index, project_id, project_type, task_ids, config
+    )
+
+    if is_compact(config):
+        return to_compact_custom_fields(project_index, field_rows, value_rows)
+
+    return field_rows, value_rows
+
+
+def generate_custom_fields(conn, graph, config: dict):
+    """
+    Generate custom fields per project and assign values to tasks.
+
+    Fields follow the project's type and values are only attached to the
+    project's own tasks.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads projects and project_tasks
+        config (dict): Configuration values
+    """
+
+    batch_size = get_batch_size(config)
 
     field_query = """
         INSERT INTO custom_fields (
@@ -84,35 +197,6 @@ def generate_custom_fields(
         VALUES (?, ?, ?, ?)
     """
 
-    execute_many(conn, field_query, field_rows)
-
-    # Assign custom field values to tasks (sparse)
-    for project_id, fields in project_field_map.items():
-        relevant_tasks = random.sample(
-            task_ids,
-            k=max(1, int(0.2 * len(task_ids)))
-        )
-
-        for task_id in relevant_tasks:
-            for field_id, field_type, enum_values in fields:
-                if not probability(0.6):
-                    continue
-
-                if field_type == "number":
-                    value = str(random.randint(1, 13))
-                elif field_type == "enum":
-                    value = random.choice(enum_values)
-                else:
-                    value = "N/A"
-
-                value_rows.append(
-                    (
-                        field_id,
-                        task_id,
-                        value,
-                    )
-                )
-
     value_query = """
         INSERT INTO custom_field_values (
             field_id,
@@ -122,9 +206,70 @@ def generate_custom_fields(
         VALUES (?, ?, ?)
     """
 
-    execute_many(conn, value_query, value_rows)
+    if is_compact(config):
+        execute_many(
+            conn,
+            "INSERT INTO field_options (option_id, value) VALUES (?, ?)",
+            [(option_id, value) for value, option_id in FIELD_OPTION_IDS.items()],
+        )
+
+        field_query = """
+            INSERT INTO custom_fields_compact (
+                field_id,
+                project_id,
+                name,
+                field_type_id
+            )
+            VALUES (?, ?, ?, ?)
+        """
+
+        value_query = """
+            INSERT INTO custom_field_values_compact (
+                field_id,
+                task_id,
+                option_id,
+                number_value
+            )
+            VALUES (?, ?, ?, ?)
+        """
+
+    field_rows = []
+    value_rows = []
+    total_fields = 0
+    total_values = 0
+
+    def flush():
+        # Field definitions must land before the values referencing them
+        execute_many(conn, field_query, field_rows)
+        execute_many(conn, value_query, value_rows)
+
+    shards = (
+        (
+            project_index,
+            project_id,
+            PROJECT_TYPES[graph.project_types[project_index]],
+            graph.tasks(project_index),
+        )
+        for project_index, project_id in enumerate(graph.project_ids)
+    )
+    results = map_shards(_custom_field_shard, shards, config, config)
+
+    for shard_fields, shard_values in results:
+        field_rows.extend(shard_fields)
+        value_rows.extend(shard_values)
+
+        if len(field_rows) + len(value_rows) >= batch_size:
+            flush()
+            total_fields += len(field_rows)
+            total_values += len(value_rows)
+            field_rows.clear()
+            value_rows.clear()
+
+    flush()
+    total_fields += len(field_rows)
+    total_values += len(value_rows)
 
     logger.info(
-        f"Generated {len(field_rows)} custom fields and "
-        f"{len(value_rows)} custom field values"
+        f"Generated {total_fields} custom fields and "
+        f"{total_values} custom field values"
     )
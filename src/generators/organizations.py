@@ -1,36 +1,101 @@
-import uuid
-from datetime import datetime
-
 from loguru import logger
 
+from utils.compact import is_compact, to_epoch
 from utils.db import execute_one
+from utils.dates import iso_timestamp, reference_epoch
+from utils.random import entity_id, entity_rng
+
+
+ORG_NAME = "Acme Cloud Technologies"
+ORG_DOMAIN = "acmecloud.com"
+
+# Name parts of the organizations in multi-org runs (NUM_ORGS)
+ORG_NAME_STEMS = [
+    "Acme", "Apex", "Beacon", "Bluefin", "Cedar", "Cobalt", "Crescent",
+    "Evergreen", "Falcon", "Granite", "Harbor", "Helix", "Horizon", "Ironwood",
+    "Juniper", "Keystone", "Lumen", "Meridian", "Northwind", "Nimbus", "Orbit",
+    "Pinnacle", "Quartz", "Redwood", "Sable", "Summit", "Tidal", "Vertex",
+]
+ORG_NAME_SECTORS = [
+    "Cloud", "Data", "Health", "Logistics", "Analytics", "Software",
+    "Security", "Payments", "Robotics", "Media", "Energy", "Systems",
+]
+ORG_NAME_SUFFIXES = ["Technologies", "Inc.", "Labs", "Group", "Co.", "Solutions"]
 
 
-def generate_organization(conn):
+def build_organization(config: dict = None) -> tuple:
     """
-    Generate a single organization/workspace.
+    Build the organization row.
 
     Returns:
-        org_id (str): UUID of the created organization
+        tuple: A row for the organizations table
     """
 
-    org_id = str(uuid.uuid4())
+    seed = config["random_seed"] if config else 0
+    config = config or {}
+
+    return (
+        entity_id(seed, "organization", 0),
+        config.get("org_name", ORG_NAME),
+        config.get("org_domain", ORG_DOMAIN),
+        iso_timestamp(reference_epoch()),
+    )
+
+
+def org_identity(seed: int, index: int) -> tuple:
+    """
+    Draw the name and email domain of organization #index of a
+    multi-org run.
+
+    Returns:
+        tuple: (name, domain); the domain carries the index, so it is
+            unique across the run
+    """
+    rng = entity_rng(seed, "org_identity", index)
 
-    org_name = "Acme Cloud Technologies"
-    domain = "acmecloud.com"
-    created_at = datetime.utcnow().isoformat()
+    stem = rng.choice(ORG_NAME_STEMS)
+    sector = rng.choice(ORG_NAME_SECTORS)
+    suffix = rng.choice(ORG_NAME_SUFFIXES)
+
+    return (
+        f"{stem} {sector} {suffix}",
+        f"{stem}{sector}{index}.com".lower(),
+    )
+
+
+def generate_organization(conn, graph, config: dict = None):
+    """
+    Generate a single organization/workspace.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; org_id is recorded (UUID, or
+            integer key in the compact storage profile)
+        config (dict, optional): Configuration values
+    """
+
+    row = build_organization(config)
+    org_id, org_name = row[0], row[1]
 
     query = """
         INSERT INTO organizations (org_id, name, domain, created_at)
         VALUES (?, ?, ?, ?)
     """
 
+    if is_compact(config):
+        org_id = 1
+        row = (org_id, row[1], row[2], to_epoch(row[3]))
+        query = """
+            INSERT INTO organizations_compact (org_id, name, domain, created_at)
+            VALUES (?, ?, ?, ?)
+        """
+
     execute_one(
         conn,
         query,
-        (org_id, org_name, domain, created_at)
+        row
     )
 
-    logger.info(f"Organization created: {org_name} ({org_id})")
+    graph.org_id = org_id
 
-    return org_id
+    logger.info(f"Organization created: {org_name} ({org_id})")
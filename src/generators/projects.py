@@ -1,13 +1,25 @@
-import uuid
-import random
-from datetime import datetime
-
 from loguru import logger
 
-from utils.db import execute_many
-from utils.dates import random_past_datetime, random_future_date
-from utils.random import seed_everything
-
+from utils.compact import (
+    PROJECT_TYPE_IDS,
+    entity_keys,
+    is_compact,
+    to_epoch,
+    to_epoch_day,
+)
+from utils.db import execute_batches, get_batch_size
+from utils.dates import (
+    iso_date,
+    iso_timestamp,
+    random_future_day,
+    random_past_timestamp,
+)
+from utils.graph import PackedUuids
+from utils.random import entity_rng, random_uuid
+
+
+# Project types; WorkspaceGraph.project_types stores positions in this tuple
+PROJECT_TYPES = ("engineering", "marketing", "operations")
 
 ENGINEERING_PROJECTS = [
     "Core Platform Refactor",
@@ -35,65 +47,105 @@ OPERATIONS_PROJECTS = [
 ]
 
 
-def generate_projects(conn, team_ids: list, config: dict):
+def build_project(index: int, team_id: str, config: dict) -> tuple:
     """
-    Generate projects for each team.
+    Build project #index from its own keyed random stream.
 
     Args:
-        conn: SQLite connection
-        team_ids (list): List of team IDs
+        index (int): Project index (team_index * projects_per_team + n)
+        team_id (str): Owning team ID
         config (dict): Configuration values
 
     Returns:
-        List[str]: Generated project IDs
+        tuple: A row for the projects table
+    """
+
+    rng = entity_rng(config["random_seed"], "project", index)
+
+    project_id = random_uuid(rng)
+
+    project_type = rng.choices(
+        PROJECT_TYPES,
+        weights=[0.5, 0.3, 0.2],
+        k=1
+    )[0]
+
+    if project_type == "engineering":
+        name = rng.choice(ENGINEERING_PROJECTS)
+    elif project_type == "marketing":
+        name = rng.choice(MARKETING_PROJECTS)
+    else:
+        name = rng.choice(OPERATIONS_PROJECTS)
+
+    created_at = iso_timestamp(
+        random_past_timestamp(config["history_days"], rng)
+    )
+
+    # Not all projects have due dates
+    due_date = (
+        iso_date(random_future_day(120, rng))
+        if rng.random() < 0.7
+        else None
+    )
+
+    return (
+        project_id,
+        team_id,
+        name,
+        project_type,
+        created_at,
+        due_date
+    )
+
+
+def to_compact_project(key: int, row: tuple) -> tuple:
+    """
+    Convert a projects row to the compact storage profile.
+    """
+    _, team_id, name, project_type, created_at, due_date = row
+    return (
+        key,
+        team_id,
+        name,
+        PROJECT_TYPE_IDS[project_type],
+        to_epoch(created_at),
+        to_epoch_day(due_date),
+    )
+
+
+def generate_projects(conn, graph, config: dict):
     """
+    Generate projects for each team.
 
-    seed_everything(config["random_seed"])
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads team_ids, records
+            project_ids (integer keys in the compact storage profile),
+            project_teams and project_types
+        config (dict): Configuration values
+    """
 
     projects_per_team = config["projects_per_team"]
-    history_days = config["history_days"]
-
-    rows = []
-    project_ids = []
-
-    for team_id in team_ids:
-        for _ in range(projects_per_team):
-            project_id = str(uuid.uuid4())
-
-            project_type = random.choices(
-                ["engineering", "marketing", "operations"],
-                weights=[0.5, 0.3, 0.2],
-                k=1
-            )[0]
-
-            if project_type == "engineering":
-                name = random.choice(ENGINEERING_PROJECTS)
-            elif project_type == "marketing":
-                name = random.choice(MARKETING_PROJECTS)
-            else:
-                name = random.choice(OPERATIONS_PROJECTS)
-
-            created_at = random_past_datetime(history_days).isoformat()
-
-            # Not all projects have due dates
-            due_date = (
-                random_future_date(120)
-                if random.random() < 0.7
-                else None
-            )
+    compact = is_compact(config)
 
-            rows.append(
-                (
-                    project_id,
-                    team_id,
-                    name,
-                    project_type,
-                    created_at,
-                    due_date
-                )
-            )
+    project_ids = PackedUuids()
+    type_positions = {name: i for i, name in enumerate(PROJECT_TYPES)}
 
-            project_ids.append(project_id)
+    def iter_rows():
+        for team_index, team_id in enumerate(graph.team_ids):
+            for n in range(projects_per_team):
+                index = team_index * projects_per_team + n
+                row = build_project(index, team_id, config)
+
+                graph.project_teams.append(team_index)
+                graph.project_types.append(type_positions[row[3]])
+
+                if compact:
+                    row = to_compact_project(index + 1, row)
+                else:
+                    project_ids.append(row[0])
+
+                yield row
 
     query = """
         INSERT INTO projects (
@@ -107,8 +159,22 @@ def generate_projects(conn, team_ids: list, config: dict):
         VALUES (?, ?, ?, ?, ?, ?)
     """
 
-    execute_many(conn, query, rows)
+    if compact:
+        query = """
+            INSERT INTO projects_compact (
+                project_id,
+                team_id,
+                name,
+                project_type_id,
+                created_at,
+                due_date
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+
+    execute_batches(conn, query, iter_rows(), get_batch_size(config))
 
-    logger.info(f"Generated {len(project_ids)} projects")
+    num_projects = len(graph.project_teams)
+    graph.project_ids = entity_keys(num_projects) if compact else project_ids
 
-    return project_ids
+    logger.info(f"Generated {num_projects} projects")
@@ -1,7 +1,9 @@
-import uuid
 from loguru import logger
 
-from utils.db import execute_many
+from utils.compact import entity_keys, is_compact
+from utils.db import execute_batches, execute_many, get_batch_size
+from utils.graph import PackedUuids
+from utils.random import entity_id
 
 
 DEFAULT_SECTIONS = [
@@ -13,39 +15,65 @@ DEFAULT_SECTIONS = [
 ]
 
 
-def generate_sections(conn, project_ids: list):
+def project_section_ids(seed: int, project_index: int) -> list:
+    """
+    Return the section IDs of project #project_index, in position order.
+    """
+    first = project_index * len(DEFAULT_SECTIONS)
+
+    return [
+        entity_id(seed, "section", first + offset)
+        for offset in range(len(DEFAULT_SECTIONS))
+    ]
+
+
+def project_section_keys(project_index: int) -> list:
+    """
+    Return the integer section keys of project #project_index
+    (compact storage profile), in position order.
+    """
+    first = project_index * len(DEFAULT_SECTIONS) + 1
+    return list(range(first, first + len(DEFAULT_SECTIONS)))
+
+
+def generate_sections(conn, graph, config: dict = None):
     """
     Generate workflow sections for each project.
 
     Args:
         conn: SQLite connection
-        project_ids (list): List of project IDs
-
-    Returns:
-        Dict[str, List[str]]: Mapping of project_id -> section_ids
+        graph (WorkspaceGraph): Registry; reads project_ids, records
+            section_ids (integer keys in the compact storage profile)
+            and project_sections
+        config (dict, optional): Configuration values
     """
 
-    rows = []
-    section_map = {}
+    seed = config["random_seed"] if config else 0
+    compact = is_compact(config)
 
-    for project_id in project_ids:
-        section_ids = []
+    project_ids = graph.project_ids
+    section_ids = PackedUuids()
 
-        for position, name in enumerate(DEFAULT_SECTIONS, start=1):
-            section_id = str(uuid.uuid4())
+    def iter_rows():
+        for project_index, project_id in enumerate(project_ids):
+            if compact:
+                keys = project_section_keys(project_index)
+            else:
+                keys = project_section_ids(seed, project_index)
+                section_ids.extend(keys)
 
-            rows.append(
-                (
+            for position, (section_id, name) in enumerate(
+                zip(keys, DEFAULT_SECTIONS), start=1
+            ):
+                yield (
                     section_id,
                     project_id,
-                    name,
+                    # Section names are looked up by position when compact
+                    position if compact else name,
                     position
                 )
-            )
-
-            section_ids.append(section_id)
 
-        section_map[project_id] = section_ids
+            graph.project_sections.add_run(len(keys))
 
     query = """
         INSERT INTO sections (
@@ -57,10 +85,28 @@ def generate_sections(conn, project_ids: list):
         VALUES (?, ?, ?, ?)
     """
 
-    execute_many(conn, query, rows)
+    if compact:
+        execute_many(
+            conn,
+            "INSERT INTO section_names (section_name_id, name) VALUES (?, ?)",
+            list(enumerate(DEFAULT_SECTIONS, start=1)),
+        )
+
+        query = """
+            INSERT INTO sections_compact (
+                section_id,
+                project_id,
+                section_name_id,
+                position
+            )
+            VALUES (?, ?, ?, ?)
+        """
+
+    execute_batches(conn, query, iter_rows(), get_batch_size(config))
+
+    num_sections = graph.project_sections.offsets[-1]
+    graph.section_ids = entity_keys(num_sections) if compact else section_ids
 
     logger.info(
         f"Generated sections for {len(project_ids)} projects"
     )
-
-    return section_map
@@ -1,11 +1,15 @@
-import uuid
-import random
-
 from loguru import logger
 
-from utils.db import execute_many
-from utils.dates import random_past_datetime, completion_time
-from utils.random import seed_everything, probability
+from utils.compact import entity_keys, is_compact
+from utils.db import execute_batches, get_batch_size
+from utils.dates import (
+    completion_timestamp,
+    iso_timestamp,
+    random_past_timestamp,
+)
+from utils.graph import PackedUuids
+from utils.parallel import iter_chunks, map_shards
+from utils.random import entity_rng, probability, random_uuid
 
 
 SUBTASK_TEMPLATES = [
@@ -18,65 +22,125 @@ SUBTASK_TEMPLATES = [
 ]
 
 
-def generate_subtasks(
-    conn,
-    task_ids: list,
+def build_subtasks(
+    task_index: int,
+    task_id: str,
     user_ids: list,
     config: dict,
-):
+    with_epochs: bool = False,
+) -> list:
     """
-    Generate subtasks for a subset of tasks.
+    Build the subtasks of task #task_index from the task's keyed stream.
 
     Args:
-        conn: SQLite connection
-        task_ids (list): Parent task IDs
-        user_ids (list): User IDs
+        task_index (int): Global index of the parent task
+        task_id (str): Parent task ID
+        user_ids (list): User IDs (any sequence)
         config (dict): Configuration values
+        with_epochs (bool): Give (row, created_at, completed_at) with the
+            timestamps as epoch seconds
+
+    Returns:
+        list: Rows for the subtasks table (empty for most tasks)
     """
 
-    seed_everything(config["random_seed"])
+    rng = entity_rng(config["random_seed"], "subtasks", task_index)
 
-    subtask_ratio = config["subtask_ratio"]
-    history_days = config["history_days"]
+    # Only some tasks have subtasks
+    if not probability(config["subtask_ratio"], rng):
+        return []
 
+    history_days = config["history_days"]
+    num_subtasks = rng.randint(1, 4)
     rows = []
 
-    for task_id in task_ids:
-        # Only some tasks have subtasks
-        if not probability(subtask_ratio):
-            continue
+    for _ in range(num_subtasks):
+        subtask_id = random_uuid(rng)
+        name = rng.choice(SUBTASK_TEMPLATES)
 
-        num_subtasks = random.randint(1, 4)
+        created_at = random_past_timestamp(history_days, rng)
+        completed = probability(0.6, rng)
+        completed_at = (
+            completion_timestamp(created_at, rng) if completed else None
+        )
 
-        for _ in range(num_subtasks):
-            subtask_id = str(uuid.uuid4())
-            name = random.choice(SUBTASK_TEMPLATES)
+        assignee_id = (
+            rng.choice(user_ids)
+            if probability(0.75, rng)
+            else None
+        )
 
-            created_at = random_past_datetime(history_days)
-            completed = probability(0.6)
-            completed_at = (
-                completion_time(created_at).isoformat()
-                if completed
-                else None
-            )
+        row = (
+            subtask_id,
+            task_id,
+            assignee_id,
+            name,
+            completed,
+            iso_timestamp(created_at),
+            iso_timestamp(completed_at) if completed else None,
+        )
 
-            assignee_id = (
-                random.choice(user_ids)
-                if probability(0.75)
-                else None
-            )
+        rows.append((row, created_at, completed_at) if with_epochs else row)
+
+    return rows
+
+
+def to_compact_subtask(row: tuple, created_at: int, completed_at) -> tuple:
+    """
+    Convert a subtasks row to the compact storage profile, given its
+    epochs (see build_subtasks).
+
+    The subtask key is left NULL so SQLite assigns the next rowid.
+    """
+    return (None, *row[1:5], created_at, completed_at)
+
+
+def _subtask_shard(shard: tuple, context: tuple) -> tuple:
+    """
+    Build the subtask rows for one chunk of parent tasks.
+
+    Returns:
+        tuple: (rows, subtask count of each task in the chunk)
+    """
+    first_index, task_ids = shard
+    user_ids, config = context
+    compact = is_compact(config)
 
-            rows.append(
-                (
-                    subtask_id,
-                    task_id,
-                    assignee_id,
-                    name,
-                    completed,
-                    created_at.isoformat(),
-                    completed_at,
-                )
+    if config.get("backend") == "numpy":
+        from generators.vectorized import numpy_subtask_rows
+
+        rows, counts = numpy_subtask_rows(
+            first_index, task_ids, user_ids, config, compact
+        )
+    else:
+        rows, counts = [], []
+        for task_index, task_id in enumerate(task_ids, start=first_index):
+            task_rows = build_subtasks(
+                task_index, task_id, user_ids, config, compact
             )
+            rows.extend(task_rows)
+            counts.append(len(task_rows))
+
+    if compact:
+        rows = [to_compact_subtask(*row) for row in rows]
+
+    return rows, counts
+
+
+def generate_subtasks(conn, graph, config: dict):
+    """
+    Generate subtasks for a subset of tasks.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads task_ids and user_ids,
+            records subtask_ids (integer keys in the compact storage
+            profile) and task_subtasks
+        config (dict): Configuration values
+    """
+
+    compact = is_compact(config)
+    subtask_ids = PackedUuids()
 
     query = """
         INSERT INTO subtasks (
@@ -91,6 +155,37 @@ def generate_subtasks(
         VALUES (?, ?, ?, ?, ?, ?, ?)
     """
 
-    execute_many(conn, query, rows)
+    if compact:
+        query = """
+            INSERT INTO subtasks_compact (
+                subtask_id,
+                parent_task_id,
+                assignee_id,
+                name,
+                completed,
+                created_at,
+                completed_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+
+    def iter_rows():
+        for rows, counts in map_shards(
+            _subtask_shard,
+            iter_chunks(graph.task_ids),
+            config,
+            (graph.user_ids, config),
+        ):
+            for count in counts:
+                graph.task_subtasks.add_run(count)
+
+            if not compact:
+                subtask_ids.extend(row[0] for row in rows)
+
+            yield from rows
+
+    total = execute_batches(conn, query, iter_rows(), get_batch_size(config))
+
+    graph.subtask_ids = entity_keys(total) if compact else subtask_ids
 
-    logger.info(f"Generated {len(rows)} subtasks")
+    logger.info(f"Generated {total} subtasks")
@@ -1,10 +1,11 @@
-import uuid
-import random
+from itertools import chain
 
 from loguru import logger
 
-from utils.db import execute_many
-from utils.random import seed_everything, probability
+from utils.compact import is_compact
+from utils.db import execute_many, execute_batches, get_batch_size
+from utils.parallel import iter_chunks, map_shards
+from utils.random import entity_id, entity_rng, probability
 
 
 TAG_POOL = [
@@ -22,61 +23,129 @@ TAG_POOL = [
 ]
 
 
-def generate_tags(conn, task_ids: list, config: dict = None):
+def tag_id_map(seed: int, compact: bool = False) -> dict:
     """
-    Generate tags and assign them to tasks.
+    Return the tag name -> tag_id mapping for the given seed
+    (integer keys in the compact storage profile).
+    """
+    if compact:
+        return {tag: index + 1 for index, tag in enumerate(TAG_POOL)}
+
+    return {
+        tag: entity_id(seed, "tag", index)
+        for index, tag in enumerate(TAG_POOL)
+    }
+
+
+def build_task_tags(task_index: int, config: dict) -> list:
+    """
+    Pick the tag names of task #task_index from the task's keyed stream.
+
+    Returns:
+        list: Tag names (empty for some tasks)
+    """
+
+    rng = entity_rng(config["random_seed"], "task_tags", task_index)
+
+    if not probability(0.7, rng):
+        return []
+
+    num_tags = rng.randint(1, 3)
+    return rng.sample(TAG_POOL, num_tags)
+
+
+def iter_task_tag_rows(
+    first_index: int,
+    task_ids: list,
+    tag_ids: dict,
+    config: dict,
+):
+    """
+    Lazily yield task-tag association rows for a contiguous run of tasks.
 
     Args:
-        conn: SQLite connection
+        first_index (int): Global index of task_ids[0]
         task_ids (list): Task IDs
-        config (dict, optional): Configuration values
-    """
+        tag_ids (dict): tag name -> tag_id
+        config (dict): Configuration values
 
-    if config and "random_seed" in config:
-        seed_everything(config["random_seed"])
+    Yields:
+        tuple: A row for the task_tags table
+    """
 
-    # Create tags
-    tag_rows = []
-    tag_ids = {}
+    for task_index, task_id in enumerate(task_ids, start=first_index):
+        for tag in build_task_tags(task_index, config):
+            yield (
+                task_id,
+                tag_ids[tag]
+            )
 
-    for tag in TAG_POOL:
-        tag_id = str(uuid.uuid4())
-        tag_ids[tag] = tag_id
-        tag_rows.append((tag_id, tag))
 
-    tag_query = """
-        INSERT INTO tags (tag_id, name)
-        VALUES (?, ?)
+def _task_tag_shard(shard: tuple, context: tuple) -> list:
+    """
+    Build the task-tag rows for one chunk of tasks.
     """
+    first_index, task_ids = shard
+    tag_ids, config = context
 
-    execute_many(conn, tag_query, tag_rows)
+    return list(iter_task_tag_rows(first_index, task_ids, tag_ids, config))
 
-    # Assign tags to tasks
-    mapping_rows = []
 
-    for task_id in task_ids:
-        if not probability(0.7):
-            continue
+def generate_tags(conn, graph, config: dict):
+    """
+    Generate tags and assign them to tasks.
 
-        num_tags = random.randint(1, 3)
-        chosen_tags = random.sample(TAG_POOL, num_tags)
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads task_ids
+        config (dict): Configuration values
+    """
 
-        for tag in chosen_tags:
-            mapping_rows.append(
-                (
-                    task_id,
-                    tag_ids[tag]
-                )
-            )
+    compact = is_compact(config)
+
+    # Create tags
+    tag_ids = tag_id_map(config["random_seed"], compact)
+    tag_rows = [(tag_id, tag) for tag, tag_id in tag_ids.items()]
+
+    tag_query = """
+        INSERT INTO tags (tag_id, name)
+        VALUES (?, ?)
+    """
 
     mapping_query = """
         INSERT INTO task_tags (task_id, tag_id)
         VALUES (?, ?)
     """
 
-    execute_many(conn, mapping_query, mapping_rows)
+    if compact:
+        tag_query = """
+            INSERT INTO tags_compact (tag_id, name)
+            VALUES (?, ?)
+        """
+
+        mapping_query = """
+            INSERT INTO task_tags_compact (task_id, tag_id)
+            VALUES (?, ?)
+        """
+
+    execute_many(conn, tag_query, tag_rows)
+
+    # Assign tags to tasks
+    total = execute_batches(
+        conn,
+        mapping_query,
+        chain.from_iterable(
+            map_shards(
+                _task_tag_shard,
+                iter_chunks(graph.task_ids),
+                config,
+                (tag_ids, config),
+            )
+        ),
+        get_batch_size(config),
+    )
 
     logger.info(
         f"Generated {len(tag_rows)} tags and "
-        f"{len(mapping_rows)} task-tag associations"
+        f"{total} task-tag associations"
     )
@@ -1,16 +1,22 @@
-import uuid
-import random
-from datetime import datetime
+from array import array
 
 from loguru import logger
 
-from utils.db import execute_many
+from generators.projects import PROJECT_TYPES
+from generators.text_grammar import describe_task
+from utils.compact import entity_keys, is_compact
+from utils.db import execute_many, get_batch_size, iter_batches
 from utils.dates import (
-    random_past_datetime,
-    maybe_due_date,
-    completion_time,
+    completion_timestamp,
+    iso_date,
+    iso_timestamp,
+    maybe_due_day,
+    random_past_timestamp,
+    reference_epoch,
 )
-from utils.random import seed_everything, probability
+from utils.graph import PackedUuids
+from utils.parallel import map_shards
+from utils.random import entity_rng, probability, random_uuid
 
 
 ENGINEERING_TASKS = [
@@ -39,100 +45,261 @@ OPERATIONS_TASKS = [
 ]
 
 
-def generate_tasks(
-    conn,
-    project_ids: list,
-    section_map: dict,
-    user_ids: list,
+TASK_NAMES = {
+    "engineering": ENGINEERING_TASKS,
+    "marketing": MARKETING_TASKS,
+    "operations": OPERATIONS_TASKS,
+}
+
+
+# Section weights in DEFAULT_SECTIONS order (bias toward "To Do" / "In Progress")
+SECTION_WEIGHTS = [0.15, 0.35, 0.25, 0.15, 0.10]
+
+
+def build_task(
+    index: int,
+    project_id: str,
+    project_type: str,
+    sections: list,
+    assignees: list,
     config: dict,
-):
+    with_state: bool = False,
+) -> tuple:
     """
-    Generate tasks for all projects.
+    Build task #index from its own keyed random stream.
 
     Args:
-        conn: SQLite connection
-        project_ids (list): Project IDs
-        section_map (dict): project_id -> list of section_ids
-        user_ids (list): User IDs
+        index (int): Global task index (project_index * tasks_per_project + n)
+        project_id (str): Project ID
+        project_type (str): Project type (picks the task name family
+            and description vocabulary)
+        sections (list): Section IDs of the project
+        assignees (list): User IDs work in the project is assigned to
+            (any sequence)
         config (dict): Configuration values
+        with_state (bool): Also return the task's state as numbers, so
+            callers need not parse the row back: its creation and
+            completion times (epoch seconds), due date (epoch day), and
+            the positions of its section and assignee in sections and
+            assignees
 
     Returns:
-        List[str]: Generated task IDs
+        tuple: A row for the tasks table, or (row, created_at,
+            completed_at, due_day, section, assignee) with with_state
+            (None for a missing completion, due date or assignee)
+    """
+
+    rng = entity_rng(config["random_seed"], "task", index)
+
+    task_id = random_uuid(rng)
+
+    # Choose section (bias toward "To Do" / "In Progress"); positions are
+    # drawn exactly like the IDs would be
+    section = rng.choices(
+        range(len(sections)),
+        weights=SECTION_WEIGHTS,
+        k=1
+    )[0]
+
+    name = rng.choice(TASK_NAMES[project_type])
+
+    described = probability(0.6, rng)
+
+    created_at = random_past_timestamp(config["history_days"], rng)
+    due_day = maybe_due_day(rng)
+
+    # 15% unassigned tasks
+    assignee = (
+        rng.choice(range(len(assignees)))
+        if probability(0.85, rng)
+        else None
+    )
+
+    # Completion logic
+    completed = probability(0.65, rng)
+    completed_at = completion_timestamp(created_at, rng) if completed else None
+
+    # Text key drawn last, so the columns above keep their draws
+    description = (
+        describe_task(project_type, name, rng.getrandbits(64))
+        if described
+        else None
+    )
+
+    row = (
+        task_id,
+        project_id,
+        sections[section],
+        assignees[assignee] if assignee is not None else None,
+        name,
+        description,
+        iso_date(due_day) if due_day is not None else None,
+        completed,
+        iso_timestamp(created_at),
+        iso_timestamp(completed_at) if completed else None,
+    )
+
+    if with_state:
+        return row, created_at, completed_at, due_day, section, assignee
+    return row
+
+
+def iter_task_rows(
+    project_index: int,
+    project_id: str,
+    project_type: str,
+    sections: list,
+    assignees: list,
+    config: dict,
+    with_state: bool = False,
+):
     """
+    Lazily yield the task rows of a single project.
 
-    seed_everything(config["random_seed"])
+    Args:
+        project_index (int): Project index
+        project_id (str): Project ID
+        project_type (str): Project type
+        sections (list): Section IDs of the project
+        assignees (list): User IDs work in the project is assigned to
+        config (dict): Configuration values
+        with_state (bool): Yield build_task()'s (row, *state) instead
+
+    Yields:
+        tuple: A row for the tasks table
+    """
 
     tasks_per_project = config["tasks_per_project"]
-    history_days = config["history_days"]
+    first = project_index * tasks_per_project
 
-    rows = []
-    task_ids = []
-
-    for project_id in project_ids:
-        sections = section_map[project_id]
-
-        for _ in range(tasks_per_project):
-            task_id = str(uuid.uuid4())
-
-            # Choose section (bias toward "To Do" / "In Progress")
-            section_id = random.choices(
-                sections,
-                weights=[0.15, 0.35, 0.25, 0.15, 0.10],
-                k=1
-            )[0]
-
-            # Choose task name based on project type (encoded in name heuristics)
-            project_type_hint = random.random()
-            if project_type_hint < 0.5:
-                name = random.choice(ENGINEERING_TASKS)
-            elif project_type_hint < 0.8:
-                name = random.choice(MARKETING_TASKS)
-            else:
-                name = random.choice(OPERATIONS_TASKS)
-
-            description = (
-                f"This task involves: {name.lower()}.\n\n"
-                f"Acceptance criteria:\n"
-                f"- Requirements implemented\n"
-                f"- Verified and reviewed"
-                if probability(0.6)
-                else None
-            )
+    for index in range(first, first + tasks_per_project):
+        yield build_task(
+            index,
+            project_id,
+            project_type,
+            sections,
+            assignees,
+            config,
+            with_state,
+        )
 
-            created_at = random_past_datetime(history_days)
-            due_date = maybe_due_date()
 
-            # 15% unassigned tasks
-            assignee_id = (
-                random.choice(user_ids)
-                if probability(0.85)
-                else None
-            )
+def activity_window(created_at: int, completed_at) -> tuple:
+    """
+    Return (start, end) epoch seconds of a task's activity: its creation
+    until its completion, or until the reference time while open (a
+    completion past the reference time is capped there).
+    """
+    end = reference_epoch() if completed_at is None else completed_at
+    return created_at, max(created_at, min(end, reference_epoch()))
 
-            # Completion logic
-            completed = probability(0.65)
-            completed_at = (
-                completion_time(created_at).isoformat()
-                if completed
-                else None
-            )
 
-            rows.append(
+def project_task_rows(
+    project_index: int, graph, config: dict, with_state: bool = False
+):
+    """
+    Build the task rows of one project with the configured backend, in
+    the standard storage profile.
+
+    Args:
+        project_index (int): Project index
+        graph (WorkspaceGraph): Registry; reads projects, sections and
+            team members
+        config (dict): Configuration values
+        with_state (bool): Give (row, *state) tuples (see build_task)
+
+    Returns:
+        Iterable of rows for the tasks table
+    """
+    project = (
+        project_index,
+        graph.project_ids[project_index],
+        PROJECT_TYPES[graph.project_types[project_index]],
+        graph.sections(project_index),
+        graph.assignees(graph.project_teams[project_index]),
+        config,
+    )
+
+    if config.get("backend") == "numpy":
+        from generators.vectorized import numpy_task_rows
+
+        return numpy_task_rows(*project, with_state)
+
+    return iter_task_rows(*project, with_state)
+
+
+def to_compact_task(
+    key: int, row: tuple, created_at: int, completed_at, due_day
+) -> tuple:
+    """
+    Convert a tasks row to the compact storage profile, given its epochs
+    (see build_task).
+    """
+    return (key, *row[1:6], due_day, row[7], created_at, completed_at)
+
+
+def _task_shard(shard: int, context: tuple) -> tuple:
+    """
+    Build the task rows of one project, with their activity windows and,
+    when activity events are simulated, the (section, assignee,
+    completed_at) state of each task (-1 for None).
+    """
+    project_index = shard
+    graph, config = context
+
+    compact = is_compact(config)
+    key = project_index * config["tasks_per_project"]
+
+    rows = []
+    windows = []
+    states = [] if config.get("activity_events") else None
+    for row, created_at, completed_at, due_day, section, assignee in (
+        project_task_rows(project_index, graph, config, with_state=True)
+    ):
+        if compact:
+            key += 1
+            row = to_compact_task(key, row, created_at, completed_at, due_day)
+        rows.append(row)
+        windows.append(activity_window(created_at, completed_at))
+        if states is not None:
+            states.append(
                 (
-                    task_id,
-                    project_id,
-                    section_id,
-                    assignee_id,
-                    name,
-                    description,
-                    due_date,
-                    completed,
-                    created_at.isoformat(),
-                    completed_at,
+                    section,
+                    -1 if assignee is None else assignee,
+                    -1 if completed_at is None else completed_at,
                 )
             )
 
-            task_ids.append(task_id)
+    return rows, windows, states
+
+
+def generate_tasks(conn, graph, config: dict):
+    """
+    Generate tasks for all projects.
+
+    Projects are sharded across ``config["workers"]`` processes; rows are
+    streamed to the database in batches of ``config["batch_size"]``.
+    Task names follow the project's type and assignees are drawn from the
+    members of the project's team.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads users, teams, projects and
+            sections, records task_ids (integer keys in the compact
+            storage profile), project_tasks and the tasks' activity
+            windows (task_created_at, task_active_until); with
+            activity_events also task_sections, task_assignees and
+            task_completed_at
+        config (dict): Configuration values
+    """
+
+    compact = is_compact(config)
+    task_ids = PackedUuids()
+    created = graph.task_created_at = array("q")
+    active_until = graph.task_active_until = array("q")
+    sections = graph.task_sections = array("b")
+    assignees = graph.task_assignees = array("i")
+    completed = graph.task_completed_at = array("q")
 
     query = """
         INSERT INTO tasks (
@@ -150,8 +317,46 @@ def generate_tasks(
         VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
 
-    execute_many(conn, query, rows)
+    if compact:
+        query = """
+            INSERT INTO tasks_compact (
+                task_id,
+                project_id,
+                section_id,
+                assignee_id,
+                name,
+                description,
+                due_date,
+                completed,
+                created_at,
+                completed_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+
+    def iter_rows():
+        # One shard = one project, so shard sizes give the project runs
+        for project_rows, windows, states in map_shards(
+            _task_shard, range(len(graph.project_ids)), config, (graph, config)
+        ):
+            graph.project_tasks.add_run(len(project_rows))
+            for start, end in windows:
+                created.append(start)
+                active_until.append(end)
+            for section, assignee, completed_at in states or ():
+                sections.append(section)
+                assignees.append(assignee)
+                completed.append(completed_at)
+            yield from project_rows
+
+    total = 0
+    for batch in iter_batches(iter_rows(), get_batch_size(config)):
+        execute_many(conn, query, batch)
+        total += len(batch)
+
+        if not compact:
+            task_ids.extend(row[0] for row in batch)
 
-    logger.info(f"Generated {len(task_ids)} tasks")
+    graph.task_ids = entity_keys(total) if compact else task_ids
 
-    return task_ids
+    logger.info(f"Generated {total} tasks")
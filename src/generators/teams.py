@@ -1,11 +1,18 @@
-import uuid
-import random
-from datetime import datetime
-
 from loguru import logger
 
-from utils.db import execute_many
-from utils.random import seed_everything
+from utils.compact import entity_keys, is_compact, to_epoch
+from utils.db import execute_many, execute_batches, get_batch_size
+from utils.dates import iso_timestamp, reference_epoch
+from utils.graph import Adjacency, PackedUuids
+from utils.parallel import iter_chunks, map_shards
+from utils.random import entity_rng, random_uuid
+
+
+# Membership models (MEMBERSHIP_MODEL)
+FRACTION_MODEL = "fraction"  # each team holds 10–30% of all users
+BOUNDED_MODEL = "bounded"    # each user joins 1..MAX_TEAMS_PER_USER teams
+
+MEMBERSHIP_MODELS = (FRACTION_MODEL, BOUNDED_MODEL)
 
 
 TEAM_NAME_POOL = [
@@ -29,55 +36,201 @@ TEAM_NAME_POOL = [
 ]
 
 
-def generate_teams(conn, org_id: str, user_ids: list, config: dict):
+def build_team(
+    index: int,
+    org_id: str,
+    num_users: int,
+    config: dict,
+):
     """
-    Generate teams and team memberships.
+    Build team #index and its members from the team's keyed random stream.
 
     Args:
-        conn: SQLite connection
+        index (int): Team index within the organization
         org_id (str): Organization ID
-        user_ids (list): List of user IDs
+        num_users (int): Number of users in the organization
+        config (dict): Configuration values
+
+    Returns:
+        tuple: (team row, list of member user indices)
+    """
+
+    rng = entity_rng(config["random_seed"], "team", index)
+
+    team_id = random_uuid(rng)
+
+    # Pick team names (reuse if num_teams > pool size)
+    name = TEAM_NAME_POOL[index % len(TEAM_NAME_POOL)]
+
+    # Assign users to teams
+    # Each team has 10–30% of total users
+    team_size = rng.randint(
+        int(0.10 * num_users),
+        int(0.30 * num_users)
+    )
+
+    members = rng.sample(range(num_users), team_size)
+
+    row = (
+        team_id,
+        org_id,
+        name,
+        iso_timestamp(reference_epoch())
+    )
+
+    return row, members
+
+
+def build_user_teams(user_index: int, num_teams: int, config: dict) -> list:
+    """
+    Pick the teams of user #user_index (bounded membership model).
+
+    Args:
+        user_index (int): User index
+        num_teams (int): Number of teams
+        config (dict): Configuration values
+
+    Returns:
+        list: Team indices, ascending
+    """
+
+    rng = entity_rng(config["random_seed"], "user_teams", user_index)
+
+    max_teams = min(num_teams, config.get("max_teams_per_user", 3))
+    if max_teams < 1:
+        return []
+
+    return sorted(rng.sample(range(num_teams), rng.randint(1, max_teams)))
+
+
+def _team_member_shard(shard: int, context: tuple) -> list:
+    """
+    Draw the member user indices of one team (fraction model).
+    """
+    team_index = shard
+    num_users, config = context
+
+    if config.get("backend") == "numpy":
+        from generators.vectorized import numpy_team_members
+
+        return numpy_team_members(team_index, num_users, config)
+
+    return build_team(team_index, None, num_users, config)[1]
+
+
+def _user_team_shard(shard: tuple, context: tuple) -> list:
+    """
+    Draw the team indices of one chunk of users (bounded model).
+    """
+    first_index, user_indices = shard
+    num_teams, config = context
+
+    if config.get("backend") == "numpy":
+        from generators.vectorized import numpy_user_teams
+
+        return numpy_user_teams(
+            first_index, len(user_indices), num_teams, config
+        )
+
+    return [
+        build_user_teams(user_index, num_teams, config)
+        for user_index in user_indices
+    ]
+
+
+def draw_memberships(num_users: int, num_teams: int, config: dict) -> Adjacency:
+    """
+    Draw every team membership into a CSR adjacency (team -> member users).
+
+    Draws are sharded across WORKERS: per team in the fraction model, per
+    chunk of users in the bounded one (whose user -> teams rows are then
+    transposed). WorkspaceGraph.user_teams derives the reverse direction
+    when first needed.
+
+    Args:
+        num_users (int): Number of users
+        num_teams (int): Number of teams
         config (dict): Configuration values
 
     Returns:
-        List[str]: Generated team IDs
+        Adjacency: Member user indices of each team
+
+    Raises:
+        ValueError: On an unknown MEMBERSHIP_MODEL
+    """
+
+    model = config.get("membership_model", FRACTION_MODEL)
+
+    if model == FRACTION_MODEL:
+        team_members = Adjacency()
+        for members in map_shards(
+            _team_member_shard, range(num_teams), config, (num_users, config)
+        ):
+            team_members.add_row(members)
+
+        return team_members
+
+    if model == BOUNDED_MODEL:
+        user_teams = Adjacency()
+        for chunk in map_shards(
+            _user_team_shard,
+            iter_chunks(range(num_users)),
+            config,
+            (num_teams, config),
+        ):
+            for teams in chunk:
+                user_teams.add_row(teams)
+
+        return user_teams.transpose(num_teams)
+
+    raise ValueError(
+        f"Unknown membership model {model!r}; expected {list(MEMBERSHIP_MODELS)}"
+    )
+
+
+def generate_teams(conn, graph, config: dict):
     """
+    Generate teams and team memberships.
 
-    seed_everything(config["random_seed"])
+    Memberships are drawn into CSR arrays (see draw_memberships) and
+    streamed to the database from there.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads org_id and user_ids,
+            records team_ids (integer keys in the compact storage
+            profile) and team_members
+        config (dict): Configuration values
+    """
 
     num_teams = config["num_teams"]
-    created_at = datetime.utcnow().isoformat()
+    org_id = graph.org_id
+    user_ids = graph.user_ids
+    compact = is_compact(config)
 
     teams = []
-    memberships = []
-    team_ids = []
+    team_ids = PackedUuids()
 
-    # Pick team names (reuse if num_teams > pool size)
     for i in range(num_teams):
-        team_id = str(uuid.uuid4())
-        name = TEAM_NAME_POOL[i % len(TEAM_NAME_POOL)]
-
-        teams.append(
-            (
-                team_id,
-                org_id,
-                name,
-                created_at
-            )
-        )
-        team_ids.append(team_id)
+        row, _ = build_team(i, org_id, 0, config)
 
-        # Assign users to teams
-        # Each team has 10–30% of total users
-        team_size = random.randint(
-            int(0.10 * len(user_ids)),
-            int(0.30 * len(user_ids))
-        )
+        if compact:
+            row = (i + 1, row[1], row[2], to_epoch(row[3]))
+        else:
+            team_ids.append(row[0])
+
+        teams.append(row)
+
+    graph.team_members = draw_memberships(len(user_ids), num_teams, config)
 
-        members = random.sample(user_ids, team_size)
+    def iter_memberships():
+        # Unpack every user ID once rather than once per membership
+        member_ids = user_ids[:]
 
-        for user_id in members:
-            memberships.append((team_id, user_id))
+        for team_index, row in enumerate(teams):
+            team_id = row[0]
+            for user_index in graph.team_members[team_index]:
+                yield (team_id, member_ids[user_index])
 
     team_query = """
         INSERT INTO teams (team_id, org_id, name, created_at)
@@ -89,12 +242,28 @@ def generate_teams(conn, org_id: str, user_ids: list, config: dict):
         VALUES (?, ?)
     """
 
+    if compact:
+        team_query = """
+            INSERT INTO teams_compact (team_id, org_id, name, created_at)
+            VALUES (?, ?, ?, ?)
+        """
+
+        membership_query = """
+            INSERT INTO team_memberships_compact (team_id, user_id)
+            VALUES (?, ?)
+        """
+
     execute_many(conn, team_query, teams)
-    execute_many(conn, membership_query, memberships)
+    total_memberships = execute_batches(
+        conn,
+        membership_query,
+        iter_memberships(),
+        get_batch_size(config),
+    )
+
+    graph.team_ids = entity_keys(num_teams) if compact else team_ids
 
     logger.info(
-        f"Generated {len(team_ids)} teams and "
-        f"{len(memberships)} team memberships"
+        f"Generated {num_teams} teams and "
+        f"{total_memberships} team memberships"
     )
-
-    return team_ids
@@ -0,0 +1,478 @@
+"""Project-type-aware grammar for task descriptions and comments."""
+
+from functools import lru_cache
+from pathlib import Path
+
+from generators.projects import PROJECT_TYPES
+from utils.text import load_text_engine
+
+
+TEXT_GRAMMARS_FILE = (
+    Path(__file__).resolve().parents[2] / "data" / "text_grammars.json"
+)
+
+SLOTS = ("task",)
+
+GRAMMAR = {
+    # ------------------------------------------------------------------
+    # Task descriptions
+    # ------------------------------------------------------------------
+    "description": [
+        "{context} {goal}\n\n{criteria_heading}\n- {check}\n- {deliverable}",
+        "{goal} {context}\n\n{criteria_heading}\n- {check}\n- {deliverable}\n- {signoff}",
+        "{goal}\n\n{notes_heading} {context} {note}",
+        "{context}\n\n{goal} {note}\n\n{criteria_heading}\n- {deliverable}\n- {signoff}",
+        "{goal} {note}",
+        "{context} {goal}",
+    ],
+    "goal": [
+        "We need to get {task} done {timeframe}.",
+        "Goal: finish {task} {timeframe}.",
+        "This task tracks {task} for {scope}.",
+        "Plan is to wrap up {task} and then {followon}.",
+        "Owner should finish {task} {timeframe}, then {followon}.",
+        "Let's get {task} done for {scope} {timeframe}.",
+    ],
+    "timeframe": [
+        "this sprint",
+        "by end of week",
+        "before the next release",
+        "ahead of the quarterly review",
+        "by the end of the month",
+        "before the holiday freeze",
+        "within two weeks",
+    ],
+    "note": [
+        "See the linked doc for details.",
+        "Coordinate with {contact} before starting.",
+        "Timeline can move if this conflicts with {conflict}.",
+        "Flag blockers in the team channel.",
+        "Estimate is rough; update it once scoped.",
+        "Loop in {contact} for the final review.",
+    ],
+    "conflict": [
+        "other launch work",
+        "the release freeze",
+        "higher-priority escalations",
+        "planned time off",
+        "the quarter-end push",
+    ],
+    "criteria_heading": [
+        "Acceptance criteria:",
+        "Definition of done:",
+        "Done when:",
+        "Checklist:",
+    ],
+    "notes_heading": ["Context:", "Background:", "Notes:"],
+    "signoff": [
+        "Reviewed by {contact}",
+        "Stakeholders signed off",
+        "Status updated in the project",
+        "Follow-up tasks filed",
+    ],
+    # Engineering
+    "engineering.context": [
+        "Right now {component} is {symptom}.",
+        "Customers reported that {component} is {symptom}.",
+        "Since the last deploy, {component} has been {symptom}.",
+        "We have to fix up {component} before we can {dependency_goal}.",
+        "Tech debt in {component} keeps slowing the team down.",
+        "Changes to {component} are risky because it lacks test coverage.",
+        "Part of the {initiative} initiative.",
+    ],
+    "engineering.component": [
+        "the auth service",
+        "the billing API",
+        "the search indexer",
+        "the notifications worker",
+        "the reporting dashboard",
+        "the mobile sync endpoint",
+        "the export pipeline",
+        "the admin console",
+        "the webhook dispatcher",
+        "the permissions module",
+    ],
+    "engineering.symptom": [
+        "timing out under load",
+        "returning intermittent 500s",
+        "slower than our latency budget",
+        "logging too much noise",
+        "dropping events during retries",
+    ],
+    "engineering.dependency_goal": [
+        "enable the new plan tiers",
+        "migrate to the new database cluster",
+        "ship SSO for enterprise accounts",
+        "turn on multi-region failover",
+        "retire the legacy API",
+    ],
+    "engineering.initiative": [
+        "reliability",
+        "performance",
+        "platform migration",
+        "developer productivity",
+        "security hardening",
+    ],
+    "engineering.scope": ["{component}", "the {initiative} work"],
+    "engineering.followon": [
+        "document the rollout",
+        "add monitoring",
+        "clean up the old code path",
+        "share findings in the next sync",
+        "write a short postmortem",
+    ],
+    "engineering.contact": [
+        "the platform team",
+        "SRE on call",
+        "the API owners",
+        "QA",
+        "the security team",
+    ],
+    "engineering.check": [
+        "Tests added and passing in CI",
+        "p95 latency within budget",
+        "No new alerts after rollout",
+        "Code reviewed by two engineers",
+        "Error rate back to baseline",
+        "Feature flag removed",
+    ],
+    "engineering.deliverable": [
+        "Change deployed to production",
+        "Runbook updated",
+        "Alerts added for {component}",
+        "Migration script checked in",
+        "API docs updated",
+    ],
+    # Marketing
+    "marketing.context": [
+        "The {campaign} campaign launches soon and needs {asset}.",
+        "Engagement on {channel} dropped last month.",
+        "Leadership wants a stronger push on {channel} for {audience}.",
+        "Part of the {campaign} campaign targeting {audience}.",
+        "Our content on {channel} underperforms with {audience}.",
+        "Sales asked for {asset} aimed at {audience}.",
+    ],
+    "marketing.campaign": [
+        "spring launch",
+        "product webinar",
+        "customer stories",
+        "annual conference",
+        "free trial conversion",
+        "partner co-marketing",
+    ],
+    "marketing.channel": [
+        "email",
+        "LinkedIn",
+        "the blog",
+        "paid search",
+        "the newsletter",
+        "the website",
+        "the events page",
+    ],
+    "marketing.audience": [
+        "enterprise admins",
+        "new trial users",
+        "existing customers",
+        "mid-market leads",
+        "developers",
+        "churned accounts",
+    ],
+    "marketing.asset": [
+        "refreshed copy",
+        "new visuals",
+        "a landing page",
+        "a one-pager",
+        "a short video",
+        "case study content",
+    ],
+    "marketing.scope": ["the {campaign} campaign", "{channel}", "{audience}"],
+    "marketing.followon": [
+        "report results to the team",
+        "reuse the assets for the next push",
+        "hand off to sales",
+        "set up A/B tests",
+        "update the content calendar",
+    ],
+    "marketing.contact": [
+        "design",
+        "product marketing",
+        "the regional leads",
+        "brand",
+        "sales enablement",
+    ],
+    "marketing.check": [
+        "Copy approved by brand",
+        "Links and UTM tags verified",
+        "Assets sized for {channel}",
+        "Legal review done",
+        "Tracking in place for {metric}",
+    ],
+    "marketing.deliverable": [
+        "Final assets in the shared drive",
+        "Content scheduled for {channel}",
+        "Results summary with {metric}",
+        "Calendar updated",
+        "Brief shared with {contact}",
+    ],
+    "marketing.metric": [
+        "click-through rate",
+        "open rate",
+        "signups",
+        "demo requests",
+        "cost per lead",
+        "traffic",
+    ],
+    # Operations
+    "operations.context": [
+        "The {artifact} is due for review.",
+        "There are open {area} items from the last {audit}.",
+        "New hires keep asking about {area}.",
+        "The {audit} flagged gaps in {area}.",
+        "We owe {contact} an update on {area}.",
+        "The {artifact} is out of date.",
+    ],
+    "operations.area": [
+        "vendor management",
+        "access control",
+        "onboarding",
+        "expense reporting",
+        "office facilities",
+        "procurement",
+        "compliance training",
+    ],
+    "operations.audit": [
+        "SOC 2 audit",
+        "quarterly access review",
+        "budget review",
+        "security assessment",
+        "internal audit",
+    ],
+    "operations.artifact": [
+        "vendor contract",
+        "access report",
+        "policy draft",
+        "onboarding checklist",
+        "monthly report",
+        "equipment inventory",
+    ],
+    "operations.scope": ["{area}", "the {audit}", "the {artifact}"],
+    "operations.followon": [
+        "file the results",
+        "brief the team",
+        "schedule the next review",
+        "update the wiki",
+        "close out the ticket",
+    ],
+    "operations.contact": ["finance", "IT", "HR", "legal", "the office manager"],
+    "operations.check": [
+        "Approved by {contact}",
+        "All owners confirmed",
+        "Exceptions documented",
+        "Numbers reconciled",
+        "Access removed for leavers",
+    ],
+    "operations.deliverable": [
+        "The updated {artifact} in the shared drive",
+        "Summary sent to {contact}",
+        "Wiki page refreshed",
+        "Next review on the calendar",
+        "Evidence filed for the {audit}",
+    ],
+    # ------------------------------------------------------------------
+    # Comments
+    # ------------------------------------------------------------------
+    "comment": [
+        "{status}",
+        "{status} {followup}",
+        "{blocker}",
+        "{question}",
+        "{update}",
+        "{update} {followup}",
+        "{ack}",
+        "{ack} {status}",
+    ],
+    "status": [
+        "Started working on this.",
+        "Picking this up now.",
+        "Making progress, about halfway there.",
+        "This should be ready {eta}.",
+        "Marking this as done.",
+        "Wrapped this up, closing it out.",
+        "Pushed another round of changes.",
+        "I think this is resolved now.",
+        "Added more details to the description.",
+    ],
+    "eta": [
+        "by EOD",
+        "tomorrow morning",
+        "by Friday",
+        "early next week",
+        "after the standup",
+        "before the sync",
+    ],
+    "followup": [
+        "Will update here once {milestone}.",
+        "Ping me if anything looks off.",
+        "Notes are in the linked doc.",
+        "Let me know if the scope changed.",
+        "Happy to pair on this if useful.",
+    ],
+    "blocker": [
+        "Blocked on {dependency}, will update.",
+        "Waiting on {dependency} before moving forward.",
+        "On hold pending {dependency}.",
+        "Can't finish this without {dependency}.",
+        "Waiting for confirmation from stakeholders.",
+    ],
+    "question": [
+        "Can someone please take a look?",
+        "Do we have a decision on {open_point}?",
+        "Who owns {open_point} here?",
+        "Is this still needed {timeframe}?",
+        "Any objections to going ahead with {open_point} as proposed?",
+    ],
+    "ack": [
+        "Thanks, looks good to me.",
+        "Confirmed, works for me.",
+        "Following up on this.",
+        "+1, agreed.",
+        "Thanks for the quick turnaround.",
+    ],
+    "engineering.update": [
+        "PR is up for review.",
+        "Deployed to {env} and {verification}.",
+        "Found the root cause: {root_cause}.",
+        "Added tests for the changes to {component}.",
+        "Rolled back after errors in {env}.",
+    ],
+    "engineering.env": ["staging", "canary", "production", "the dev cluster"],
+    "engineering.verification": [
+        "smoke tests pass",
+        "metrics look normal",
+        "error rates are flat",
+    ],
+    "engineering.root_cause": [
+        "a missing index",
+        "a race in the retry logic",
+        "an expired certificate",
+        "a misconfigured timeout",
+        "a stale feature flag",
+    ],
+    "engineering.milestone": [
+        "CI is green",
+        "the canary finishes",
+        "review is done",
+        "the migration completes",
+    ],
+    "engineering.dependency": [
+        "sign-off from the API owners",
+        "a schema migration",
+        "the infra ticket",
+        "security review",
+        "the upstream library fix",
+    ],
+    "engineering.open_point": [
+        "the rollout plan",
+        "the retry policy",
+        "the API versioning",
+        "the cache TTL",
+    ],
+    "marketing.update": [
+        "Draft is in the doc, feedback welcome.",
+        "Early numbers on {metric}: {trend}.",
+        "Assets uploaded for {channel}.",
+        "Scheduled content for {channel}, going out {weekday}.",
+        "Design sent over the new {asset_short}.",
+    ],
+    "marketing.trend": [
+        "up week over week",
+        "flat so far",
+        "ahead of plan",
+        "below target",
+    ],
+    "marketing.weekday": ["Tuesday", "Thursday morning", "next Monday", "Friday"],
+    "marketing.asset_short": ["banner", "hero image", "email header", "deck"],
+    "marketing.milestone": [
+        "brand signs off",
+        "the post goes live",
+        "we have a week of data",
+        "design delivers the final files",
+    ],
+    "marketing.dependency": [
+        "final copy from product marketing",
+        "legal review",
+        "final designs",
+        "budget approval",
+        "the website release",
+    ],
+    "marketing.open_point": [
+        "the headline",
+        "the launch date",
+        "the target segment",
+        "the budget split",
+    ],
+    "operations.update": [
+        "Sent to {contact} for approval.",
+        "Updated the checklist with the {area} items.",
+        "Filed the paperwork with {contact}.",
+        "Reviewed the {artifact} and left comments.",
+        "Collected sign-offs from all teams except one.",
+    ],
+    "operations.milestone": [
+        "{contact} approves",
+        "the vendor responds",
+        "the numbers are final",
+        "the review meeting happens",
+    ],
+    "operations.dependency": [
+        "a signature from {contact}",
+        "the vendor's quote",
+        "budget approval",
+        "IT provisioning",
+        "the policy update",
+    ],
+    "operations.open_point": [
+        "the renewal terms",
+        "the new policy",
+        "the review cadence",
+        "the approval flow",
+    ],
+}
+
+
+@lru_cache(maxsize=None)
+def text_engine():
+    """
+    Return the engine over the compiled GRAMMAR (built once per process).
+    """
+    return load_text_engine(GRAMMAR, PROJECT_TYPES, SLOTS, TEXT_GRAMMARS_FILE)
+
+
+def task_slot(name: str) -> str:
+    """
+    Return a task name as used inside a sentence (quoted: names are
+    titles like "Fix production bug", not verb phrases).
+    """
+    return f'"{name}"'
+
+
+def describe_task(project_type: str, name: str, key: int) -> str:
+    """
+    Return the description of a task.
+
+    Args:
+        project_type (str): Project type (picks the vocabulary)
+        name (str): Task name
+        key (int): 64-bit text key; equal keys give equal descriptions
+
+    Returns:
+        str: The description
+    """
+    return text_engine().render(project_type, "description", key, task_slot(name))
+
+
+def comment_body(project_type: str, key: int) -> str:
+    """
+    Return the body of a comment on a task in a project of project_type.
+    """
+    return text_engine().render(project_type, "comment", key)
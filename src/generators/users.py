@@ -1,67 +1,99 @@
-import uuid
-import random
-from datetime import datetime
-
-from faker import Faker
 from loguru import logger
 
-from utils.db import execute_many
-from utils.dates import random_past_datetime
-from utils.random import seed_everything
+from utils.compact import ROLE_IDS, entity_keys, is_compact
+from utils.db import execute_batches, get_batch_size
+from utils.dates import iso_timestamp, random_past_timestamp
+from utils.graph import PackedUuids
+from utils.names import email_address, full_name
+from utils.random import entity_rng, random_uuid
 
-fake = Faker()
+EMAIL_DOMAIN = "acmecloud.com"
 
 
-def generate_users(conn, org_id: str, config: dict):
+def build_user(
+    index: int, org_id: str, config: dict, with_epochs: bool = False
+) -> tuple:
     """
-    Generate users for the organization.
+    Build user #index from its own keyed random stream.
 
     Args:
-        conn: SQLite connection
+        index (int): User index within the organization
         org_id (str): Organization ID
         config (dict): Configuration values
+        with_epochs (bool): Also return joined_at as epoch seconds
 
     Returns:
-        List[str]: Generated user IDs
+        tuple: A row for the users table, or (row, joined_at) with
+            with_epochs
     """
 
-    seed_everything(config["random_seed"])
+    seed = config["random_seed"]
+    rng = entity_rng(seed, "user", index)
 
-    num_users = config["num_users"]
-    history_days = config["history_days"]
+    user_id = random_uuid(rng)
 
-    rows = []
-    user_ids = []
+    # Small percentage of admins
+    role = "admin" if rng.random() < 0.05 else "member"
 
-    for i in range(num_users):
-        user_id = str(uuid.uuid4())
-        full_name = fake.name()
+    joined_at = random_past_timestamp(config["history_days"], rng)
 
-        email = (
-            full_name.lower()
-            .replace(" ", ".")
-            .replace("'", "")
-            + f".{i}"
-            + "@acmecloud.com"
-        )
+    # Names come from the cached frequency pools (see utils/names.py)
+    name = full_name(rng)
+    email = email_address(
+        name, index, config.get("org_domain", EMAIL_DOMAIN)
+    )
 
+    row = (
+        user_id,
+        org_id,
+        name,
+        email,
+        role,
+        iso_timestamp(joined_at)
+    )
 
-        # Small percentage of admins
-        role = "admin" if random.random() < 0.05 else "member"
+    if with_epochs:
+        return row, joined_at
+    return row
 
-        joined_at = random_past_datetime(history_days).isoformat()
 
-        rows.append(
-            (
-                user_id,
-                org_id,
-                full_name,
-                email,
-                role,
-                joined_at
-            )
-        )
-        user_ids.append(user_id)
+def to_compact_user(key: int, row: tuple, joined_at: int) -> tuple:
+    """
+    Convert a users row to the compact storage profile, given joined_at
+    as epoch seconds (see build_user).
+    """
+    _, org_id, full_name, email, role, _ = row
+    return (key, org_id, full_name, email, ROLE_IDS[role], joined_at)
+
+
+def generate_users(conn, graph, config: dict):
+    """
+    Generate users for the organization.
+
+    Args:
+        conn: SQLite connection
+        graph (WorkspaceGraph): Registry; reads org_id, records user_ids
+            (integer keys in the compact storage profile)
+        config (dict): Configuration values
+    """
+
+    num_users = config["num_users"]
+    org_id = graph.org_id
+
+    compact = is_compact(config)
+    user_ids = PackedUuids()
+
+    def iter_rows():
+        for i in range(num_users):
+            if compact:
+                row = to_compact_user(
+                    i + 1, *build_user(i, org_id, config, with_epochs=True)
+                )
+            else:
+                row = build_user(i, org_id, config)
+                user_ids.append(row[0])
+
+            yield row
 
     query = """
         INSERT INTO users (
@@ -70,8 +102,16 @@ def generate_users(conn, org_id: str, config: dict):
         VALUES (?, ?, ?, ?, ?, ?)
     """
 
-    execute_many(conn, query, rows)
+    if compact:
+        query = """
+            INSERT INTO users_compact (
+                user_id, org_id, full_name, email, role_id, joined_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?)
+        """
+
+    execute_batches(conn, query, iter_rows(), get_batch_size(config))
 
-    logger.info(f"Generated {len(user_ids)} users")
+    graph.user_ids = entity_keys(num_users) if compact else user_ids
 
-    return user_ids
+    logger.info(f"Generated {len(graph.user_ids)} users")
@@ -0,0 +1,367 @@
+"""NumPy generation backend (GENERATION_BACKEND=numpy)."""
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "GENERATION_BACKEND=numpy requires numpy (pip install numpy)"
+    ) from e
+
+from generators.projects import PROJECT_TYPES
+from generators.subtasks import SUBTASK_TEMPLATES
+from generators.tasks import SECTION_WEIGHTS, TASK_NAMES
+from generators.text_grammar import task_slot, text_engine
+from utils.dates import reference_time
+from utils.random import derive_seed
+
+
+SECONDS_PER_DAY = 86400
+
+_TASK_NAMES = np.array(
+    [name for project_type in PROJECT_TYPES for name in TASK_NAMES[project_type]],
+    dtype=object,
+)
+# Name family of each project type: (first position in _TASK_NAMES, size)
+_FAMILIES = {}
+for _project_type in PROJECT_TYPES:
+    _FAMILIES[_project_type] = (
+        sum(size for _, size in _FAMILIES.values()),
+        len(TASK_NAMES[_project_type]),
+    )
+
+_SECTION_CDF = np.cumsum(SECTION_WEIGHTS) / np.sum(SECTION_WEIGHTS)
+
+_SUBTASK_NAMES = np.array(SUBTASK_TEMPLATES, dtype=object)
+
+
+def batch_rng(seed: int, stage: str, batch_key: int):
+    """
+    Open the Philox stream of one generation batch.
+    """
+    return np.random.Generator(
+        np.random.Philox(key=derive_seed(seed, stage, batch_key))
+    )
+
+
+def uuid_strings(rng, n: int) -> list:
+    """
+    Draw n version-4 UUID strings in one shot.
+    """
+    raw = np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+
+    hexed = raw.tobytes().hex()
+
+    return [
+        f"{hexed[i:i + 8]}-{hexed[i + 8:i + 12]}-{hexed[i + 12:i + 16]}-"
+        f"{hexed[i + 16:i + 20]}-{hexed[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+def _reference():
+    reference = reference_time()
+    unit = "us" if reference.microsecond else "s"
+    return np.datetime64(reference, "us"), unit
+
+
+def _past_datetimes(rng, n: int, days_back: int, reference):
+    """Vectorized random_past_timestamp(), as datetime64 values."""
+    offsets = (
+        rng.integers(0, days_back + 1, n) * SECONDS_PER_DAY
+        + rng.integers(0, SECONDS_PER_DAY + 1, n)
+    )
+    return reference - offsets.astype("timedelta64[s]")
+
+
+def _iso(values, unit: str) -> list:
+    return np.datetime_as_string(values, unit=unit).tolist()
+
+
+def _epochs(values) -> list:
+    """Epoch seconds of datetime64 values."""
+    return values.astype("datetime64[s]").astype(np.int64).tolist()
+
+
+def _completion_times(rng, created):
+    """Vectorized completion_timestamp(), for every row."""
+    return created + rng.integers(1, 15, len(created)).astype("timedelta64[D]")
+
+
+def _completion_column(completion_times, completed, unit: str) -> list:
+    """ISO completion times; None where not completed."""
+    return [
+        value if done else None
+        for value, done in zip(_iso(completion_times, unit), completed.tolist())
+    ]
+
+
+def _completion_epochs(completion_times, completed) -> list:
+    """Completion epoch seconds; None where not completed."""
+    return [
+        epoch if done else None
+        for epoch, done in zip(_epochs(completion_times), completed.tolist())
+    ]
+
+
+def _pick_positions(rng, count: int, n: int, p_assigned: float) -> list:
+    """Positions in a sequence of count users; None where unassigned."""
+    assigned = (rng.random(n) < p_assigned).tolist()
+    picks = rng.integers(0, count, n).tolist()
+    return [
+        pick if has_assignee else None
+        for pick, has_assignee in zip(picks, assigned)
+    ]
+
+
+def _pick_users(rng, user_ids, n: int, p_assigned: float) -> list:
+    return [
+        user_ids[pick] if pick is not None else None
+        for pick in _pick_positions(rng, len(user_ids), n, p_assigned)
+    ]
+
+
+def numpy_team_members(team_index: int, num_users: int, config: dict) -> list:
+    """
+    Draw the member user indices of one team (fraction membership model).
+
+    Args:
+        team_index (int): Team index (keys the batch stream)
+        num_users (int): Number of users
+        config (dict): Configuration values
+
+    Returns:
+        list: 10–30% of the user indices, without repeats
+    """
+
+    rng = batch_rng(config["random_seed"], "team_members_numpy", team_index)
+
+    team_size = int(
+        rng.integers(int(0.10 * num_users), int(0.30 * num_users) + 1)
+    )
+
+    return rng.choice(num_users, team_size, replace=False).tolist()
+
+
+def numpy_user_teams(
+    first_index: int,
+    num_users: int,
+    num_teams: int,
+    config: dict,
+) -> list:
+    """
+    Draw the teams of a contiguous run of users (bounded membership model).
+
+    Args:
+        first_index (int): Index of the run's first user (keys the stream)
+        num_users (int): Users in the run
+        num_teams (int): Number of teams
+        config (dict): Configuration values
+
+    Returns:
+        list: Ascending team indices of each user
+    """
+
+    rng = batch_rng(config["random_seed"], "user_teams_numpy", first_index)
+
+    max_teams = min(num_teams, config.get("max_teams_per_user", 3))
+    if max_teams < 1:
+        return [[] for _ in range(num_users)]
+
+    counts = rng.integers(1, max_teams + 1, num_users).tolist()
+    picks = rng.integers(0, num_teams, (num_users, max_teams)).tolist()
+
+    user_teams = []
+    for count, row in zip(counts, picks):
+        teams = set(row[:count])
+        if len(teams) < count:
+            # Rare collision: redraw this user's teams without replacement
+            teams = rng.choice(num_teams, count, replace=False).tolist()
+        user_teams.append(sorted(teams))
+
+    return user_teams
+
+
+def numpy_task_rows(
+    project_index: int,
+    project_id,
+    project_type: str,
+    sections: list,
+    assignees: list,
+    config: dict,
+    with_state: bool = False,
+) -> list:
+    """
+    Build all task rows of one project column-wise.
+
+    Args:
+        project_index (int): Project index (keys the batch stream)
+        project_id: Project ID
+        project_type (str): Project type (picks the task name family)
+        sections (list): Section IDs of the project
+        assignees (list): User IDs work in the project is assigned to
+            (any sequence)
+        config (dict): Configuration values
+        with_state (bool): Return (row, *state) tuples (see build_task)
+
+    Returns:
+        list: Rows for the tasks table
+    """
+
+    n = config["tasks_per_project"]
+    rng = batch_rng(config["random_seed"], "tasks_numpy", project_index)
+    reference, unit = _reference()
+
+    task_ids = uuid_strings(rng, n)
+
+    # Choose section (bias toward "To Do" / "In Progress")
+    section_idx = np.searchsorted(
+        _SECTION_CDF, rng.random(n), side="right"
+    ).tolist()
+    section_col = [sections[i] for i in section_idx]
+
+    # A name within the project type's family
+    family_start, family_size = _FAMILIES[project_type]
+    name_idx = family_start + (rng.random(n) * family_size).astype(np.int64)
+    names = _TASK_NAMES[name_idx]
+
+    described = rng.random(n) < 0.6
+
+    created = _past_datetimes(rng, n, config["history_days"], reference)
+
+    # 10% no due date, otherwise 1–90 days ahead
+    due = (
+        reference + rng.integers(1, 91, n).astype("timedelta64[D]")
+    ).astype("datetime64[D]")
+    no_due = (rng.random(n) < 0.1).tolist()
+    due_col = [
+        None if missing else value
+        for value, missing in zip(np.datetime_as_string(due).tolist(), no_due)
+    ]
+
+    # 15% unassigned tasks
+    assignee_idx = _pick_positions(rng, len(assignees), n, 0.85)
+    assignee_col = [
+        assignees[pick] if pick is not None else None for pick in assignee_idx
+    ]
+
+    completed = rng.random(n) < 0.65
+    completion_times = _completion_times(rng, created)
+    completed_at = _completion_column(completion_times, completed, unit)
+
+    # Text keys drawn last, so the columns above match earlier releases
+    text_keys = rng.integers(0, 2**64 - 1, n, dtype=np.uint64, endpoint=True)
+    descriptions = [None] * n
+    positions = np.flatnonzero(described).tolist()
+    rendered = text_engine().render_many(
+        project_type,
+        "description",
+        text_keys[positions].tolist(),
+        [(task_slot(name),) for name in names[positions].tolist()],
+    )
+    for i, description in zip(positions, rendered):
+        descriptions[i] = description
+
+    rows = list(
+        zip(
+            task_ids,
+            [project_id] * n,
+            section_col,
+            assignee_col,
+            names.tolist(),
+            descriptions,
+            due_col,
+            completed.tolist(),
+            _iso(created, unit),
+            completed_at,
+        )
+    )
+
+    if with_state:
+        due_days = [
+            None if missing else day
+            for day, missing in zip(due.astype(np.int64).tolist(), no_due)
+        ]
+        return list(
+            zip(
+                rows,
+                _epochs(created),
+                _completion_epochs(completion_times, completed),
+                due_days,
+                section_idx,
+                assignee_idx,
+            )
+        )
+
+    return rows
+
+
+def numpy_subtask_rows(
+    first_index: int,
+    task_ids: list,
+    user_ids: list,
+    config: dict,
+    with_epochs: bool = False,
+) -> list:
+    """
+    Build the subtask rows of a contiguous run of tasks column-wise.
+
+    Args:
+        first_index (int): Global index of task_ids[0] (keys the batch stream)
+        task_ids (list): Parent task IDs
+        user_ids (list): User IDs (any sequence)
+        config (dict): Configuration values
+        with_epochs (bool): Give (row, created_at, completed_at) rows with
+            the timestamps as epoch seconds (see build_subtasks)
+
+    Returns:
+        tuple: (rows for the subtasks table, subtask count of each task)
+    """
+
+    m = len(task_ids)
+    rng = batch_rng(config["random_seed"], "subtasks_numpy", first_index)
+    reference, unit = _reference()
+
+    # Only some tasks have subtasks, 1–4 each
+    has_subtasks = rng.random(m) < config["subtask_ratio"]
+    counts = np.where(has_subtasks, rng.integers(1, 5, m), 0)
+    n = int(counts.sum())
+
+    if n == 0:
+        return [], counts.tolist()
+
+    parents = np.repeat(np.arange(m), counts).tolist()
+
+    subtask_ids = uuid_strings(rng, n)
+    names = _SUBTASK_NAMES[rng.integers(0, len(_SUBTASK_NAMES), n)]
+
+    created = _past_datetimes(rng, n, config["history_days"], reference)
+    completed = rng.random(n) < 0.6
+    completion_times = _completion_times(rng, created)
+    completed_at = _completion_column(completion_times, completed, unit)
+
+    assignees = _pick_users(rng, user_ids, n, 0.75)
+
+    rows = list(
+        zip(
+            subtask_ids,
+            [task_ids[i] for i in parents],
+            assignees,
+            names.tolist(),
+            completed.tolist(),
+            _iso(created, unit),
+            completed_at,
+        )
+    )
+
+    if with_epochs:
+        rows = list(
+            zip(
+                rows,
+                _epochs(created),
+                _completion_epochs(completion_times, completed),
+            )
+        )
+
+    return rows, counts.tolist()
@@ -22,34 +22,297 @@ def load_config():
         "projects_per_team": int(os.getenv("PROJECTS_PER_TEAM", 4)),
         "tasks_per_project": int(os.getenv("TASKS_PER_PROJECT", 120)),
         "subtask_ratio": float(os.getenv("SUBTASK_RATIO", 0.3)),
+        "membership_model": os.getenv("MEMBERSHIP_MODEL", "fraction"),
+        "max_teams_per_user": int(os.getenv("MAX_TEAMS_PER_USER", 3)),
         "history_days": int(os.getenv("HISTORY_DAYS", 180)),
+        "reference_time": os.getenv("REFERENCE_TIME", ""),
         "random_seed": int(os.getenv("RANDOM_SEED", 42)),
+        "batch_size": int(os.getenv("BATCH_SIZE", 10000)),
+        "workers": int(os.getenv("WORKERS", 1)),
+        "storage_profile": os.getenv("STORAGE_PROFILE", "standard"),
+        "backend": os.getenv("GENERATION_BACKEND", "python"),
+        "load_mode": os.getenv("LOAD_MODE", "standard"),
+        "run_report_path": os.getenv(
+            "RUN_REPORT_PATH", "output/run_report.json"
+        ),
+        "prometheus_path": os.getenv("PROMETHEUS_PATH", ""),
+        "output_sinks": os.getenv("OUTPUT_SINKS", "sqlite"),
+        "output_dir": os.getenv("OUTPUT_DIR", "output/export"),
+        "output_gzip": os.getenv("OUTPUT_GZIP", "false").lower()
+        in ("1", "true", "yes"),
+        "parquet_compression": os.getenv("PARQUET_COMPRESSION", "zstd"),
+        "checkpoints": os.getenv("CHECKPOINTS", "true").lower()
+        in ("1", "true", "yes"),
+        "resume": os.getenv("RESUME", "false").lower() in ("1", "true", "yes"),
+        "activity_events": os.getenv("ACTIVITY_EVENTS", "false").lower()
+        in ("1", "true", "yes"),
+        "advance_days": int(os.getenv("ADVANCE_DAYS", 0)),
+        "in_memory": os.getenv("IN_MEMORY", "false").lower()
+        in ("1", "true", "yes"),
+        "num_orgs": int(os.getenv("NUM_ORGS", 1)),
+        "org_shard_dir": os.getenv("ORG_SHARD_DIR", "output/orgs"),
+        "org_scale_jitter": float(os.getenv("ORG_SCALE_JITTER", 0.5)),
+        "api_host": os.getenv("API_HOST", "127.0.0.1"),
+        "api_port": int(os.getenv("API_PORT", 8080)),
+        "api_pool_size": int(os.getenv("API_POOL_SIZE", 4)),
+        "api_cache_size": int(os.getenv("API_CACHE_SIZE", 1024)),
     }
 
     return config
 
 
-def init_database(db_path: str):
-    """Create SQLite database and execute schema.sql."""
+def init_database(
+    db_path: str,
+    storage_profile: str = "standard",
+    load_mode: str = "standard",
+    resume: bool = False,
+):
+    """
+    Create SQLite database and execute the schema of the storage profile.
+
+    With resume set, an existing database keeps its schema and rows so an
+    interrupted run can continue in it.
+    """
+    from utils.compact import SCHEMA_FILES
+    from utils.db import (
+        BULK_LOAD,
+        LoadConnection,
+        begin_bulk_load,
+        split_index_statements,
+    )
+
     logger.info("Initializing SQLite database")
 
     db_path = Path(db_path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
+    existing = resume and str(db_path) != ":memory:" and db_path.exists()
 
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, factory=LoadConnection)
     conn.execute("PRAGMA foreign_keys = ON;")
 
-    schema_file = BASE_DIR.parent / "schema.sql"
+    if storage_profile not in SCHEMA_FILES:
+        raise ValueError(f"Unknown storage profile: {storage_profile}")
+
+    schema_file = BASE_DIR.parent / SCHEMA_FILES[storage_profile]
     if not schema_file.exists():
-        raise FileNotFoundError("schema.sql not found")
+        raise FileNotFoundError(f"{schema_file.name} not found")
 
     with open(schema_file, "r", encoding="utf-8") as f:
-        conn.executescript(f.read())
+        schema_sql = f.read()
+
+    # Secondary indexes are built after the data, in one pass each
+    schema_sql, conn.deferred_indexes = split_index_statements(schema_sql)
+
+    if existing:
+        logger.info(f"Resuming in existing database {db_path}")
+    else:
+        conn.executescript(schema_sql)
+        conn.commit()
+
+    if load_mode == BULK_LOAD:
+        begin_bulk_load(conn)
+
+    return conn
 
+
+def generate_in_memory(config: dict):
+    """
+    Generate the whole workspace into an in-memory database.
+
+    Args:
+        config (dict): Configuration values (db_path and sinks are ignored)
+
+    Returns:
+        sqlite3.Connection: The generated, committed ":memory:" database
+    """
+    from utils.dates import parse_reference_time, set_reference_time
+
+    conn = init_database(
+        ":memory:", config["storage_profile"], config["load_mode"]
+    )
+    set_reference_time(parse_reference_time(config["reference_time"]))
+
+    run_pipeline(conn, config)
     conn.commit()
+
     return conn
 
 
+def generate_bytes(config: dict) -> bytes:
+    """
+    Generate the workspace without touching the disk and return it as a
+    serialized SQLite database (what the .sqlite file would contain).
+
+    Load it with sqlite3.connect(":memory:").deserialize(data).
+    """
+    conn = generate_in_memory(config)
+    data = conn.serialize()
+    conn.close()
+
+    return data
+
+
+def generate_snapshot(config: dict):
+    """
+    Generate the workspace once, in memory, for fast episode resets.
+
+    Args:
+        config (dict): Configuration values (db_path and sinks are ignored)
+
+    Returns:
+        WorkspaceSnapshot: Hands out pristine copies via reset()
+    """
+    from utils.episodes import WorkspaceSnapshot
+
+    conn = generate_in_memory(config)
+    snapshot = WorkspaceSnapshot.from_connection(conn)
+    conn.close()
+
+    return snapshot
+
+
+# Tables each pipeline stage writes (the compact profile exposes them as views)
+STAGE_TABLES = {
+    "organizations": ("organizations",),
+    "users": ("users",),
+    "teams": ("teams", "team_memberships"),
+    "projects": ("projects",),
+    "sections": ("sections",),
+    "tasks": ("tasks",),
+    "subtasks": ("subtasks",),
+    "tags": ("tags", "task_tags"),
+    "comments": ("comments",),
+    "activity": ("activity_events",),
+    "custom_fields": ("custom_fields", "custom_field_values"),
+    "finalize": (),
+}
+
+# WorkspaceGraph fields each stage fills in (saved with its checkpoint)
+STAGE_GRAPH_FIELDS = {
+    "organizations": ("org_id",),
+    "users": ("user_ids",),
+    "teams": ("team_ids", "team_members"),
+    "projects": ("project_ids", "project_teams", "project_types"),
+    "sections": ("section_ids", "project_sections"),
+    "tasks": (
+        "task_ids",
+        "project_tasks",
+        "task_created_at",
+        "task_active_until",
+        "task_sections",
+        "task_assignees",
+        "task_completed_at",
+    ),
+    "subtasks": ("subtask_ids", "task_subtasks"),
+    "tags": (),
+    "comments": ("task_comments", "comment_authors", "comment_created_at"),
+    "activity": (),
+    "custom_fields": (),
+    "finalize": (),
+}
+
+
+def _run_stage(name, func, *args):
+    return func(*args)
+
+
+def run_pipeline(conn, config: dict, stage=_run_stage, checkpoints=None):
+    """
+    Run the generation stages in dependency order.
+
+    Args:
+        conn: SQLite connection (from init_database)
+        config (dict): Configuration values
+        stage: Called as stage(name, func, *args) for every STAGE_TABLES
+            stage; must return func(*args). Lets callers time or observe
+            individual stages.
+        checkpoints (Checkpoints): Optional stage checkpoints; completed
+            stages are skipped and every stage that finishes is recorded
+
+    Returns:
+        WorkspaceGraph: Registry of the generated entities
+    """
+
+    # Import generators lazily (after DB is ready)
+    from generators.organizations import generate_organization
+    from generators.users import generate_users
+    from generators.teams import generate_teams
+    from generators.projects import generate_projects
+    from generators.sections import generate_sections
+    from generators.tasks import generate_tasks
+    from generators.subtasks import generate_subtasks
+    from generators.tags import generate_tags
+    from generators.comments import generate_comments
+    from generators.activity import generate_activity
+    from generators.custom_fields import generate_custom_fields
+    from utils.db import build_indexes, finish_bulk_load
+    from utils.graph import WorkspaceGraph
+
+    # Every stage records what it generates in the shared registry and
+    # reads earlier stages' entities from it
+    graph = WorkspaceGraph()
+
+    # Generation pipeline
+    stages = [
+        ("organizations", generate_organization),
+        ("users", generate_users),
+        ("teams", generate_teams),
+        ("projects", generate_projects),
+        ("sections", generate_sections),
+        ("tasks", generate_tasks),
+        ("subtasks", generate_subtasks),
+        ("tags", generate_tags),
+        ("comments", generate_comments),
+        ("activity", generate_activity),
+        ("custom_fields", generate_custom_fields),
+    ]
+
+    if checkpoints is not None:
+        checkpoints.restore(graph)
+        checkpoints.discard_incomplete(STAGE_TABLES)
+
+    for name, func in stages:
+        if checkpoints is not None and checkpoints.is_complete(name):
+            logger.info(f"Skipping {name}: completed by an earlier run")
+            continue
+
+        stage(name, func, conn, graph, config)
+
+        if checkpoints is not None:
+            checkpoints.record(
+                name,
+                {f: getattr(graph, f) for f in STAGE_GRAPH_FIELDS[name]},
+            )
+
+    if conn.bulk_load:
+        logger.info("Building indexes and checking foreign keys")
+        stage("finalize", finish_bulk_load, conn)
+    else:
+        logger.info("Building indexes")
+        stage("finalize", build_indexes, conn)
+
+    if checkpoints is not None:
+        checkpoints.clear()
+
+    return graph
+
+
+def advance(config: dict):
+    """Advance the clock of the existing database by ADVANCE_DAYS days."""
+    from generators.advance import advance_workspace
+    from utils.db import LoadConnection
+
+    db_path = Path(config["db_path"])
+    if not db_path.exists():
+        raise FileNotFoundError(f"{db_path} not found; generate it first")
+
+    conn = sqlite3.connect(db_path, factory=LoadConnection)
+    conn.execute("PRAGMA foreign_keys = ON;")
+
+    advance_workspace(conn, config, config["advance_days"])
+    conn.close()
+
+
 def main():
     logger.remove()
     logger.add(sys.stderr, level="INFO")
@@ -58,45 +321,106 @@ def main():
         config = load_config()
         logger.info("Configuration loaded")
 
-        conn = init_database(config["db_path"])
-        logger.info("Database schema created")
+        if config["advance_days"]:
+            advance(config)
+            logger.success("Asana simulation database advanced successfully")
+            return
+
+        if config["num_orgs"] > 1:
+            from multi_org import generate_organizations
+            generate_organizations(config)
+            logger.success(
+                f"Generated {config['num_orgs']} organization databases"
+            )
+            return
+
+        from utils.sinks import SQLITE_SINK, open_sinks, parse_sink_names
+
+        # Without the sqlite sink the schema only lives in memory; with
+        # IN_MEMORY the database is built there and persisted at the end
+        sinks = parse_sink_names(config["output_sinks"])
+        persist = config["in_memory"] and SQLITE_SINK in sinks
+        db_path = (
+            config["db_path"]
+            if SQLITE_SINK in sinks and not persist
+            else ":memory:"
+        )
+
+        # Checkpoints live in the database, so they only cover runs whose
+        # sole output is that database, written as it is generated. A bulk
+        # load is one unjournaled transaction: committing per stage would
+        # split it, and a crash could leave a corrupt file to resume from
+        from utils.db import BULK_LOAD
+        bulk = config["load_mode"] == BULK_LOAD
+        checkpointed = (
+            config["checkpoints"]
+            and sinks == [SQLITE_SINK]
+            and not persist
+            and not bulk
+        )
+        if config["resume"] and not checkpointed:
+            raise ValueError(
+                "RESUME needs CHECKPOINTS=true, OUTPUT_SINKS=sqlite, "
+                "IN_MEMORY=false and LOAD_MODE=standard"
+            )
+        if config["checkpoints"] and not checkpointed and not persist:
+            if bulk:
+                logger.warning(
+                    "Stage checkpoints are not kept with LOAD_MODE=bulk"
+                )
+            else:
+                logger.warning(
+                    "Stage checkpoints are only kept with OUTPUT_SINKS=sqlite"
+                )
 
-        # Import generators lazily (after DB is ready)
-        from generators.organizations import generate_organization
-        from generators.users import generate_users
-        from generators.teams import generate_teams
-        from generators.projects import generate_projects
-        from generators.sections import generate_sections
-        from generators.tasks import generate_tasks
-        from generators.subtasks import generate_subtasks
-        from generators.tags import generate_tags
-        from generators.comments import generate_comments
-        from generators.custom_fields import generate_custom_fields
-
-        # Generation pipeline
-        org_id = generate_organization(conn)
-        user_ids = generate_users(conn, org_id, config)
-        team_ids = generate_teams(conn, org_id, user_ids, config)
-        project_ids = generate_projects(conn, team_ids, config)
-        # section_ids = generate_sections(conn, project_ids)
-        # task_ids = generate_tasks(conn, project_ids, section_ids, user_ids, config)
-        section_map = generate_sections(conn, project_ids)
-        task_ids = generate_tasks(
-            conn,
-            project_ids,
-            section_map,
-            user_ids,
-            config
+        conn = init_database(
+            db_path,
+            config["storage_profile"],
+            config["load_mode"],
+            resume=config["resume"],
         )
+        logger.info("Database schema created")
 
-        generate_subtasks(conn, task_ids, user_ids, config)
-        generate_tags(conn, task_ids)
-        generate_comments(conn, task_ids, user_ids)
-        generate_custom_fields(conn, project_ids, task_ids)
+        checkpoints = None
+        if checkpointed:
+            from utils.checkpoint import Checkpoints
+            checkpoints = Checkpoints(conn, config)
 
+        conn.sink = open_sinks(conn, config)
+        logger.info(f"Output sinks: {', '.join(sinks)}")
+
+        # Pin the clock so every worker measures timestamps from one instant;
+        # a resumed run keeps the instant the interrupted run started with
+        from utils.dates import parse_reference_time, set_reference_time
+        if checkpoints is not None and checkpoints.reference is not None:
+            reference = set_reference_time(checkpoints.reference)
+        else:
+            reference = set_reference_time(
+                parse_reference_time(config["reference_time"])
+            )
+        logger.info(f"Reference time: {reference.isoformat()}")
+
+        from utils.metrics import RunMetrics
+        metrics = RunMetrics(conn)
+
+        run_pipeline(conn, config, stage=metrics.stage, checkpoints=checkpoints)
+
+        conn.sink.close()
         conn.commit()
+
+        if persist:
+            from utils.db import persist_database
+            logger.info(f"Persisting the in-memory database to {config['db_path']}")
+            metrics.stage("persist", persist_database, conn, config["db_path"])
+
         conn.close()
 
+        metrics.write(
+            config["run_report_path"],
+            config,
+            config["prometheus_path"],
+        )
+
         logger.success("Asana simulation database generated successfully")
 
     except Exception as e:
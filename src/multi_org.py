@@ -0,0 +1,168 @@
+"""Generate NUM_ORGS organizations as SQLite shards plus a catalog."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from loguru import logger
+
+from generators.organizations import org_identity
+from main import STAGE_TABLES, generate_in_memory
+from utils.dates import parse_reference_time, set_reference_time
+from utils.db import persist_database
+from utils.parallel import map_shards
+from utils.random import derive_seed, entity_rng
+
+
+CATALOG_FILE = "catalog.json"
+
+# Settings scaled per organization by ORG_SCALE_JITTER
+SCALE_KEYS = ("num_users", "num_teams", "projects_per_team", "tasks_per_project")
+
+# Settings recorded in the catalog for every shard
+CATALOG_KEYS = (
+    "random_seed",
+    *SCALE_KEYS,
+    "subtask_ratio",
+    "membership_model",
+    "max_teams_per_user",
+    "history_days",
+    "reference_time",
+    "storage_profile",
+    "backend",
+)
+
+
+def shard_path(config: dict, index: int) -> Path:
+    return Path(config["org_shard_dir"]) / f"org_{index:05d}.sqlite"
+
+
+def org_config(config: dict, index: int) -> dict:
+    """
+    Return the configuration of organization #index of a multi-org run.
+
+    Args:
+        config (dict): Configuration values of the run
+        index (int): Organization index
+
+    Returns:
+        dict: config with the organization's seed, identity, jittered
+            scale and shard path
+    """
+    seed = derive_seed(config["random_seed"], "organization", index)
+    name, domain = org_identity(config["random_seed"], index)
+
+    rng = entity_rng(config["random_seed"], "org_scale", index)
+    jitter = config["org_scale_jitter"]
+
+    scale = {
+        key: max(1, round(config[key] * rng.uniform(1 - jitter, 1 + jitter)))
+        for key in SCALE_KEYS
+    }
+
+    return {
+        **config,
+        **scale,
+        "random_seed": seed,
+        "org_name": name,
+        "org_domain": domain,
+        "db_path": str(shard_path(config, index)),
+        # Organizations are the unit of parallelism; stages run inline
+        "workers": 1,
+    }
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _org_shard(index: int, config: dict) -> dict:
+    """
+    Generate organization #index into its shard and describe it.
+
+    Returns:
+        dict: The shard's catalog entry
+    """
+    org = org_config(config, index)
+    path = Path(org["db_path"])
+
+    conn = generate_in_memory(org)
+
+    org_id = conn.execute("SELECT org_id FROM organizations").fetchone()[0]
+    rows = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for tables in STAGE_TABLES.values()
+        for table in tables
+    }
+
+    persist_database(conn, path)
+    conn.close()
+
+    return {
+        "org_index": index,
+        "org_id": org_id,
+        "name": org["org_name"],
+        "domain": org["org_domain"],
+        "path": path.name,
+        "config": {key: org[key] for key in CATALOG_KEYS},
+        "rows": rows,
+        "bytes": path.stat().st_size,
+        "sha256": file_sha256(path),
+    }
+
+
+def generate_organizations(config: dict) -> list:
+    """
+    Generate config["num_orgs"] organization shards and their catalog.
+
+    Args:
+        config (dict): Configuration values
+
+    Returns:
+        list: Catalog entries, in organization order
+    """
+    shard_dir = Path(config["org_shard_dir"])
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    # Every organization measures time from the same pinned instant
+    reference = set_reference_time(
+        parse_reference_time(config["reference_time"])
+    )
+    config = {**config, "reference_time": reference.isoformat()}
+
+    num_orgs = config["num_orgs"]
+    logger.info(
+        f"Generating {num_orgs} organizations into {shard_dir} "
+        f"({config['workers']} workers)"
+    )
+
+    shards = []
+    for entry in map_shards(_org_shard, range(num_orgs), config, config):
+        shards.append(entry)
+        logger.info(
+            f"[{len(shards)}/{num_orgs}] {entry['name']}: "
+            f"{sum(entry['rows'].values()):,} rows, {entry['bytes']:,} bytes"
+        )
+
+    catalog = {
+        "num_orgs": num_orgs,
+        "base_seed": config["random_seed"],
+        "scale_jitter": config["org_scale_jitter"],
+        "reference_time": config["reference_time"],
+        "storage_profile": config["storage_profile"],
+        "shards": shards,
+    }
+
+    catalog_path = shard_dir / CATALOG_FILE
+    partial = catalog_path.with_name(f"{CATALOG_FILE}.partial")
+    partial.write_text(json.dumps(catalog, indent=2), encoding="utf-8")
+    os.replace(partial, catalog_path)
+
+    logger.info(f"Catalog written to {catalog_path}")
+
+    return shards
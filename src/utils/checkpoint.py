@@ -0,0 +1,267 @@
+"""Stage checkpoints for resumable runs (CHECKPOINTS / RESUME)."""
+
+import base64
+import hashlib
+import json
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from loguru import logger
+
+from utils.dates import reference_time
+from utils.graph import Adjacency, PackedUuids
+
+
+CHECKPOINT_TABLE = "pipeline_checkpoints"
+
+# Config keys that do not change the generated data; they may differ
+# between the interrupted and the resumed run
+RUNTIME_KEYS = {
+    "db_path",
+    "workers",
+    "batch_size",
+    "run_report_path",
+    "prometheus_path",
+    "output_sinks",
+    "output_dir",
+    "output_gzip",
+    "parquet_compression",
+    "checkpoints",
+    "resume",
+    "num_orgs",
+    "org_shard_dir",
+    "org_scale_jitter",
+    "api_host",
+    "api_port",
+    "api_pool_size",
+    "api_cache_size",
+}
+
+# Rows generators insert into compact-profile lookup tables
+LOOKUP_TABLES = {
+    "sections": ("section_names",),
+    "custom_fields": ("field_options",),
+}
+
+
+def _encode_array(values: array) -> dict:
+    return {
+        "typecode": values.typecode,
+        "data": base64.b64encode(values.tobytes()).decode("ascii"),
+    }
+
+
+def _decode_array(encoded: dict) -> array:
+    values = array(encoded["typecode"])
+    values.frombytes(base64.b64decode(encoded["data"]))
+    return values
+
+
+def _encode_field(value) -> dict:
+    """
+    Encode a WorkspaceGraph field as JSON-compatible data (no pickle, so a
+    tampered database cannot run code on resume).
+    """
+    if value is None or isinstance(value, (str, int)):
+        return {"value": value}
+    if isinstance(value, range):
+        return {"range": [value.start, value.stop, value.step]}
+    if isinstance(value, PackedUuids):
+        return {"uuids": base64.b64encode(value.to_bytes()).decode("ascii")}
+    if isinstance(value, array):
+        return {"array": _encode_array(value)}
+    if isinstance(value, Adjacency):
+        return {
+            "adjacency": {
+                "offsets": _encode_array(value.offsets),
+                "targets": (
+                    None if value.targets is None
+                    else _encode_array(value.targets)
+                ),
+            }
+        }
+    raise TypeError(f"Cannot checkpoint a {type(value).__name__} field")
+
+
+def _decode_field(encoded: dict):
+    """
+    Rebuild a field encoded by _encode_field.
+    """
+    (kind, data), = encoded.items()
+
+    if kind == "value":
+        return data
+    if kind == "range":
+        return range(*data)
+    if kind == "uuids":
+        return PackedUuids.from_bytes(base64.b64decode(data))
+    if kind == "array":
+        return _decode_array(data)
+    if kind == "adjacency":
+        adjacency = Adjacency()
+        adjacency.offsets = _decode_array(data["offsets"])
+        adjacency.targets = (
+            None if data["targets"] is None else _decode_array(data["targets"])
+        )
+        return adjacency
+    raise ValueError(f"Unknown checkpoint field encoding: {kind!r}")
+
+
+def config_digest(config: dict) -> str:
+    """
+    Hash the configuration values that determine the generated data.
+    """
+    relevant = {k: v for k, v in config.items() if k not in RUNTIME_KEYS}
+    material = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Checkpoints:
+    """
+    Completed-stage records of one database.
+
+    Args:
+        conn: SQLite connection of the run
+        config (dict): Configuration values
+
+    Raises:
+        ValueError: If the database holds checkpoints of a different
+            configuration, or generated rows without any checkpoints (a
+            finished run)
+    """
+
+    def __init__(self, conn, config: dict):
+        self.conn = conn
+        self.digest = config_digest(config)
+
+        if self._physical_table(CHECKPOINT_TABLE) is None:
+            organizations = self._physical_table("organizations")
+            if conn.execute(
+                f"SELECT EXISTS (SELECT 1 FROM {organizations})"
+            ).fetchone()[0]:
+                raise ValueError(
+                    "Database already holds a finished run; nothing to resume"
+                )
+
+        conn.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                stage TEXT PRIMARY KEY,
+                config_digest TEXT NOT NULL,
+                reference_time TEXT NOT NULL,
+                completed_at TEXT NOT NULL,
+                state TEXT NOT NULL
+            )
+            """
+        )
+
+        rows = conn.execute(
+            f"SELECT stage, config_digest, reference_time "
+            f"FROM {CHECKPOINT_TABLE} ORDER BY rowid"
+        ).fetchall()
+
+        if any(digest != self.digest for _, digest, _ in rows):
+            raise ValueError(
+                f"{CHECKPOINT_TABLE} was written with a different "
+                f"configuration; delete the database or unset RESUME"
+            )
+
+        self.completed = [stage for stage, _, _ in rows]
+        self.reference = (
+            datetime.fromisoformat(rows[0][2]) if rows else None
+        )
+
+    def is_complete(self, stage: str) -> bool:
+        return stage in self.completed
+
+    def restore(self, graph):
+        """
+        Put the registry fields of every completed stage back into graph.
+        """
+        for stage, state in self.conn.execute(
+            f"SELECT stage, state FROM {CHECKPOINT_TABLE} ORDER BY rowid"
+        ):
+            for field, value in json.loads(state).items():
+                setattr(graph, field, _decode_field(value))
+
+        if self.completed:
+            logger.info(
+                f"Resuming after {len(self.completed)} completed stages "
+                f"({', '.join(self.completed)})"
+            )
+
+    def _physical_table(self, table: str) -> Optional[str]:
+        kind = self.conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = ?", (table,)
+        ).fetchone()
+
+        if kind is None:
+            return None
+        if kind[0] == "view":
+            # Compact profile: the stage writes <table>_compact
+            return f"{table}_compact"
+        return table
+
+    def discard_incomplete(self, stage_tables: Dict[str, Iterable[str]]):
+        """
+        Delete rows an interrupted run left in the tables of stages that
+        have no checkpoint, children before parents.
+
+        Args:
+            stage_tables (dict): Stage name -> tables it writes, in
+                pipeline order
+        """
+        discarded = 0
+
+        for stage in reversed(list(stage_tables)):
+            if self.is_complete(stage):
+                continue
+
+            tables = [*LOOKUP_TABLES.get(stage, ()), *stage_tables[stage]]
+            for table in reversed(tables):
+                physical = self._physical_table(table)
+                if physical is not None:
+                    discarded += self.conn.execute(
+                        f"DELETE FROM {physical}"
+                    ).rowcount
+
+        self.conn.commit()
+
+        if discarded:
+            logger.info(f"Discarded {discarded} rows of an interrupted stage")
+
+    def record(self, stage: str, state: dict):
+        """
+        Mark stage as complete and commit it together with its data.
+
+        Args:
+            stage (str): Stage name
+            state (dict): WorkspaceGraph fields the stage filled in
+        """
+        self.conn.execute(
+            f"""
+            INSERT INTO {CHECKPOINT_TABLE} (
+                stage, config_digest, reference_time, completed_at, state
+            )
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (
+                stage,
+                self.digest,
+                reference_time().isoformat(),
+                datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                json.dumps(
+                    {field: _encode_field(value) for field, value in state.items()}
+                ),
+            ),
+        )
+        self.conn.commit()
+        self.completed.append(stage)
+
+    def clear(self):
+        """
+        Drop the checkpoints once the whole pipeline has run.
+        """
+        self.conn.execute(f"DROP TABLE IF EXISTS {CHECKPOINT_TABLE}")
+        self.conn.commit()
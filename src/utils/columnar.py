@@ -0,0 +1,178 @@
+"""Parquet output sink (OUTPUT_SINKS=parquet)."""
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as e:  # pragma: no cover - optional dependency
+    raise ImportError(
+        "OUTPUT_SINKS=parquet requires pyarrow (pip install pyarrow)"
+    ) from e
+
+from pathlib import Path
+from typing import List, Sequence
+
+from loguru import logger
+
+from utils.sinks import Sink
+
+
+# Rows buffered per table before a Parquet row group is written
+ROW_GROUP_ROWS = 128 * 1024
+
+# Low-cardinality text columns (templates, enums, tag/section names).
+# Rendered texts (tasks.description, comments.body) are mostly unique, so
+# a dictionary would only add a page per row group.
+# Compact tables (<table>_compact) share the entries of their base table.
+DICTIONARY_COLUMNS = {
+    "users": {"role"},
+    "teams": {"name"},
+    "projects": {"name", "project_type"},
+    "sections": {"name"},
+    "tasks": {"name"},
+    "subtasks": {"name"},
+    "tags": {"name"},
+    "custom_fields": {"name", "field_type"},
+    "custom_field_values": {"value"},
+}
+
+# SQLite declared type -> Arrow type
+ARROW_TYPES = {
+    "TEXT": pa.string(),
+    "INTEGER": pa.int64(),
+    "BOOLEAN": pa.bool_(),
+    "TIMESTAMP": pa.timestamp("us"),
+    "DATE": pa.date32(),
+}
+
+_DICTIONARY_TEXT = pa.dictionary(pa.int32(), pa.string())
+
+
+def arrow_schema(conn, table: str, columns: Sequence[str]):
+    """
+    Build the Arrow schema of `columns` of `table` from its declared types.
+
+    Args:
+        conn: SQLite connection holding the run's schema
+        table (str): Table name
+        columns (Sequence[str]): Columns in insert order
+
+    Returns:
+        pyarrow.Schema: Arrow schema (dictionary types for low-cardinality text)
+    """
+
+    declared = {
+        row[1]: row[2].upper()
+        for row in conn.execute(f"PRAGMA table_info({table})")
+    }
+    dictionary = DICTIONARY_COLUMNS.get(table.removesuffix("_compact"), set())
+
+    fields = []
+    for column in columns:
+        arrow_type = ARROW_TYPES.get(declared.get(column, "TEXT"), pa.string())
+        if column in dictionary and arrow_type == pa.string():
+            arrow_type = _DICTIONARY_TEXT
+        fields.append(pa.field(column, arrow_type))
+
+    return pa.schema(fields)
+
+
+def _column_array(values: list, arrow_type):
+    if arrow_type == _DICTIONARY_TEXT:
+        return pa.array(values, pa.string()).dictionary_encode()
+    if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+        # Generators emit ISO-8601 strings; Arrow parses them in C
+        return pa.array(values, pa.string()).cast(arrow_type)
+    if pa.types.is_integer(arrow_type):
+        # Compact tables keep Python booleans in INTEGER columns
+        return pa.array(values).cast(arrow_type)
+    return pa.array(values, arrow_type)
+
+
+def record_batch(schema, rows: List[tuple]):
+    """
+    Transpose row tuples into an Arrow record batch of `schema`.
+    """
+    columns = zip(*rows)
+    return pa.RecordBatch.from_arrays(
+        [
+            _column_array(list(values), field.type)
+            for values, field in zip(columns, schema)
+        ],
+        schema=schema,
+    )
+
+
+class _ParquetTable:
+    __slots__ = ("schema", "writer", "pending", "pending_rows", "rows")
+
+    def __init__(self, schema, writer):
+        self.schema = schema
+        self.writer = writer
+        self.pending = []
+        self.pending_rows = 0
+        self.rows = 0
+
+
+class ParquetSink(Sink):
+    """
+    Stream batches to <table>.parquet, one row group per ROW_GROUP_ROWS rows.
+
+    Args:
+        conn: SQLite connection holding the run's schema (column types)
+        directory (str): Output directory
+        compression (str): Parquet codec (zstd, snappy, gzip, none, ...)
+    """
+
+    def __init__(self, conn, directory: str, compression: str = "zstd"):
+        self.conn = conn
+        self.directory = Path(directory)
+        self.compression = compression
+        self._tables = {}
+
+    def _table(self, table: str, columns: Sequence[str]) -> _ParquetTable:
+        state = self._tables.get(table)
+
+        if state is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            schema = arrow_schema(self.conn, table, columns)
+            writer = pq.ParquetWriter(
+                self.directory / f"{table}.parquet",
+                schema,
+                compression=self.compression,
+                use_dictionary=True,
+            )
+            state = self._tables[table] = _ParquetTable(schema, writer)
+
+        return state
+
+    def _flush(self, state: _ParquetTable):
+        if state.pending:
+            state.writer.write_table(
+                pa.Table.from_batches(state.pending, schema=state.schema),
+                row_group_size=state.pending_rows,
+            )
+            state.rows += state.pending_rows
+            state.pending = []
+            state.pending_rows = 0
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        if not rows:
+            return
+
+        state = self._table(table, columns)
+        state.pending.append(record_batch(state.schema, rows))
+        state.pending_rows += len(rows)
+
+        if state.pending_rows >= ROW_GROUP_ROWS:
+            self._flush(state)
+
+    def close(self):
+        for state in self._tables.values():
+            self._flush(state)
+            state.writer.close()
+
+        if self._tables:
+            logger.info(
+                f"Wrote {len(self._tables)} parquet files to {self.directory}"
+            )
+        self._tables = {}
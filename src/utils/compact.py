@@ -0,0 +1,66 @@
+from datetime import date, datetime
+
+
+STANDARD_PROFILE = "standard"
+COMPACT_PROFILE = "compact"
+
+SCHEMA_FILES = {
+    STANDARD_PROFILE: "schema.sql",
+    COMPACT_PROFILE: "schema_compact.sql",
+}
+
+# Static enum lookups; must match the INSERTs in schema_compact.sql
+ROLE_IDS = {"admin": 1, "member": 2}
+PROJECT_TYPE_IDS = {"engineering": 1, "marketing": 2, "operations": 3}
+FIELD_TYPE_IDS = {"text": 1, "number": 2, "enum": 3}
+EVENT_TYPE_IDS = {
+    "created": 1,
+    "assigned": 2,
+    "unassigned": 3,
+    "section_changed": 4,
+    "commented": 5,
+    "completed": 6,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_DATE = _EPOCH.date()
+
+
+def is_compact(config: dict = None) -> bool:
+    """
+    Return True when the run uses the compact storage profile.
+    """
+    return bool(config) and config.get("storage_profile") == COMPACT_PROFILE
+
+
+def entity_keys(count: int) -> range:
+    """
+    Integer surrogate keys of the first `count` entities (index + 1).
+
+    A range is a sequence, so it can stand in for a list of UUIDs anywhere
+    the generators pick or sample IDs; the same random draws then select
+    the same entities in either profile.
+    """
+    return range(1, count + 1)
+
+
+def to_epoch(value):
+    """
+    Convert an ISO-8601 string or datetime (naive UTC) to epoch seconds.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return int((value - _EPOCH).total_seconds())
+
+
+def to_epoch_day(value):
+    """
+    Convert a date (or ISO date string) to days since 1970-01-01.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return (value - _EPOCH_DATE).days
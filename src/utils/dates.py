@@ -1,38 +1,154 @@
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 
-def random_past_datetime(days_back: int) -> datetime:
+SECONDS_PER_DAY = 86400
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DATE = EPOCH.date()
+
+
+class TimestampFormatter:
+    """
+    Fast ISO-8601 formatting of integer epoch seconds / epoch days.
+
+    Every generated timestamp is the reference time shifted by whole
+    seconds, so it shares the reference's sub-second suffix. A timestamp is
+    therefore a cached "YYYY-MM-DD" day prefix plus one of 86,400
+    precomputed "HH:MM:SS" strings, with no datetime objects involved.
+    """
+
+    def __init__(self, microsecond: int = 0):
+        self.microsecond = microsecond
+        self._suffix = f".{microsecond:06d}" if microsecond else ""
+        self._days = {}
+        self._clock = None
+
+    def date(self, day: int) -> str:
+        """Format days since 1970-01-01 as YYYY-MM-DD."""
+        text = self._days.get(day)
+        if text is None:
+            text = (EPOCH_DATE + timedelta(days=day)).isoformat()
+            self._days[day] = text
+        return text
+
+    def timestamp(self, seconds: int) -> str:
+        """Format epoch seconds as YYYY-MM-DDTHH:MM:SS[.ffffff]."""
+        if self._clock is None:
+            self._clock = [
+                f"{h:02d}:{m:02d}:{s:02d}{self._suffix}"
+                for h in range(24)
+                for m in range(60)
+                for s in range(60)
+            ]
+        day, second = divmod(seconds, SECONDS_PER_DAY)
+        return f"{self.date(day)}T{self._clock[second]}"
+
+
+_reference_time = None
+_reference_epoch = None
+_formatter = TimestampFormatter()
+
+
+def set_reference_time(reference: datetime = None) -> datetime:
+    """
+    Pin the instant that all generated timestamps are measured from.
+
+    Defaults to the current UTC time, truncated to the second. Worker
+    processes receive the same value so that sharded runs produce
+    identical output.
+    """
+    global _reference_time, _reference_epoch, _formatter
+    _reference_time = reference or datetime.utcnow().replace(microsecond=0)
+    _reference_epoch = (_reference_time - EPOCH) // timedelta(seconds=1)
+    # The formatter's tables only depend on the sub-second suffix
+    if _formatter.microsecond != _reference_time.microsecond:
+        _formatter = TimestampFormatter(_reference_time.microsecond)
+    return _reference_time
+
+
+def parse_reference_time(value: str):
+    """
+    Parse a REFERENCE_TIME value (ISO-8601) to a naive UTC datetime.
+
+    Empty values return None (meaning "now"). Offsets, including a
+    trailing "Z", are converted to UTC.
+    """
+    if not value:
+        return None
+
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+    return parsed
+
+
+def reference_time() -> datetime:
+    """
+    Return the pinned reference time (pinning it to now on first use).
+    """
+    if _reference_time is None:
+        set_reference_time()
+    return _reference_time
+
+
+def reference_epoch() -> int:
+    """
+    Return the pinned reference time as whole epoch seconds.
+    """
+    if _reference_time is None:
+        set_reference_time()
+    return _reference_epoch
+
+
+def iso_timestamp(seconds: int) -> str:
+    """
+    Format epoch seconds (from this module's helpers) as an ISO timestamp.
+    """
+    return _formatter.timestamp(seconds)
+
+
+def iso_date(day: int) -> str:
     """
-    Generate a random datetime within the past N days.
+    Format days since 1970-01-01 as an ISO date.
     """
-    now = datetime.utcnow()
-    delta_days = random.randint(0, days_back)
-    delta_seconds = random.randint(0, 86400)
-    return now - timedelta(days=delta_days, seconds=delta_seconds)
+    return _formatter.date(day)
 
 
-def random_future_date(max_days: int = 90):
+def random_past_timestamp(days_back: int, rng=random) -> int:
     """
-    Generate a random future date (or None).
+    Epoch seconds of a random instant within the past N days.
     """
-    return (datetime.utcnow() + timedelta(days=random.randint(1, max_days))).date()
+    delta_days = rng.randint(0, days_back)
+    delta_seconds = rng.randint(0, SECONDS_PER_DAY)
+    return reference_epoch() - delta_days * SECONDS_PER_DAY - delta_seconds
 
 
-def maybe_due_date():
+def random_future_day(max_days: int = 90, rng=random) -> int:
     """
-    Realistic due-date distribution:
+    Epoch day of a random date 1..max_days after the reference date.
+    """
+    return reference_epoch() // SECONDS_PER_DAY + rng.randint(1, max_days)
+
+
+def maybe_due_day(rng=random):
+    """
+    Realistic due-date distribution (as an epoch day, or None):
     - 10% no due date
     - 90% has due date within 1–90 days
     """
-    if random.random() < 0.1:
+    if rng.random() < 0.1:
         return None
-    return random_future_date()
+    return random_future_day(rng=rng)
 
 
-def completion_time(created_at: datetime):
+def completion_timestamp(created_at: int, rng=random) -> int:
     """
-    Generate a realistic completion timestamp after creation.
+    Epoch seconds of a realistic completion 1–14 days after creation.
     """
-    delta_days = random.randint(1, 14)
-    return created_at + timedelta(days=delta_days)
+    return created_at + rng.randint(1, 14) * SECONDS_PER_DAY
+
@@ -1,5 +1,83 @@
+import os
+import re
 import sqlite3
-from typing import Iterable, Tuple
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+
+from utils.sinks import parse_insert
+
+
+DEFAULT_BATCH_SIZE = 10_000
+
+STANDARD_LOAD = "standard"
+BULK_LOAD = "bulk"
+
+# Page cache used while bulk loading (negative = KiB, per SQLite convention)
+BULK_CACHE_SIZE = -512 * 1024
+
+# Settings begin_bulk_load() overrides, in the order they are restored
+BULK_PRAGMAS = {
+    "foreign_keys": "OFF",
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": BULK_CACHE_SIZE,
+    "temp_store": "MEMORY",
+}
+
+_INDEX_STATEMENT = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\b[^;]*;", re.IGNORECASE
+)
+
+
+class LoadConnection(sqlite3.Connection):
+    """
+    sqlite3 connection that knows whether it is bulk loading.
+
+    While bulk_load is set, execute_many/execute_one leave the transaction
+    open so the whole run is committed once by finish_bulk_load() (or the
+    block by single_transaction()).
+    deferred_indexes holds the schema's CREATE INDEX statements, which
+    build_indexes() runs once the data is loaded (in every load mode).
+
+    saved_pragmas holds the settings begin_bulk_load() overrode, which
+    finish_bulk_load() restores.
+
+    write_seconds and rows_written accumulate the time spent in (and rows
+    inserted by) execute_many/execute_one, for per-stage run metrics.
+
+    When sink is set (see utils/sinks.py), INSERT batches are handed to it
+    instead of being executed directly, so the same run can feed SQLite
+    and flat files.
+    """
+
+    bulk_load = False
+    deferred_indexes = ()
+    saved_pragmas = ()
+    write_seconds = 0.0
+    rows_written = 0
+    sink = None
+
+
+def _track_write(conn: sqlite3.Connection, start: float, rowcount: int):
+    if isinstance(conn, LoadConnection):
+        conn.write_seconds += time.perf_counter() - start
+        conn.rows_written += max(rowcount, 0)
+
+
+def _sink_target(conn: sqlite3.Connection, query: str):
+    """Return (sink, table, columns) when the query should go to a sink."""
+    sink = getattr(conn, "sink", None)
+    if sink is None:
+        return None
+
+    target = parse_insert(query)
+    if target is None:
+        return None
+
+    return (sink, *target)
 
 
 def execute_many(
@@ -10,9 +88,23 @@ def execute_many(
     """
     Execute a parameterized INSERT query with multiple rows.
     """
+    start = time.perf_counter()
+
+    target = _sink_target(conn, query)
+    if target is not None:
+        sink, table, columns = target
+        rows = rows if isinstance(rows, list) else list(rows)
+        sink.write(table, columns, rows)
+        _track_write(conn, start, len(rows))
+        return
+
     cursor = conn.cursor()
     cursor.executemany(query, rows)
-    conn.commit()
+
+    if not getattr(conn, "bulk_load", False):
+        conn.commit()
+
+    _track_write(conn, start, cursor.rowcount)
 
 
 def execute_one(
@@ -23,9 +115,42 @@ def execute_one(
     """
     Execute a single parameterized query.
     """
+    start = time.perf_counter()
+
+    target = _sink_target(conn, query)
+    if target is not None:
+        sink, table, columns = target
+        sink.write(table, columns, [params])
+        _track_write(conn, start, 1)
+        return
+
     cursor = conn.cursor()
     cursor.execute(query, params)
-    conn.commit()
+
+    if not getattr(conn, "bulk_load", False):
+        conn.commit()
+
+    _track_write(conn, start, cursor.rowcount)
+
+
+@contextmanager
+def single_transaction(conn: LoadConnection):
+    """
+    Hold the commits of execute_many/execute_one until the block ends, so
+    everything written inside it is committed at once (or rolled back if
+    the block raises).
+    """
+    previous = conn.bulk_load
+    conn.bulk_load = True
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+    finally:
+        conn.bulk_load = previous
 
 
 def fetch_all(
@@ -39,3 +164,164 @@ def fetch_all(
     cursor = conn.cursor()
     cursor.execute(query, params)
     return cursor.fetchall()
+
+
+def get_batch_size(config: dict = None) -> int:
+    """
+    Return the configured row batch size (falls back to the default).
+    """
+    if config and config.get("batch_size"):
+        return int(config["batch_size"])
+    return DEFAULT_BATCH_SIZE
+
+
+def iter_batches(
+    rows: Iterable[Tuple],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[Tuple]]:
+    """
+    Group a (possibly lazy) row iterable into lists of at most batch_size rows.
+    """
+    iterator = iter(rows)
+
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def execute_batches(
+    conn: sqlite3.Connection,
+    query: str,
+    rows: Iterable[Tuple],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Stream rows into a parameterized INSERT query, one batch at a time.
+
+    Only a single batch is held in memory, so peak memory stays flat
+    regardless of how many rows the iterable produces.
+
+    Returns:
+        int: Total number of rows written
+    """
+    total = 0
+
+    for batch in iter_batches(rows, batch_size):
+        execute_many(conn, query, batch)
+        total += len(batch)
+
+    return total
+
+
+def split_index_statements(schema_sql: str) -> Tuple[str, List[str]]:
+    """
+    Separate CREATE INDEX statements from a schema script.
+
+    Returns:
+        Tuple[str, List[str]]: (schema without indexes, index statements)
+    """
+    indexes = [m.group(0) for m in _INDEX_STATEMENT.finditer(schema_sql)]
+    return _INDEX_STATEMENT.sub("", schema_sql), indexes
+
+
+def index_if_not_exists(statement: str) -> str:
+    """
+    Rewrite a CREATE [UNIQUE] INDEX statement as CREATE ... IF NOT EXISTS.
+    """
+    return re.sub(
+        r"^(\s*CREATE\s+(?:UNIQUE\s+)?INDEX)\s+(?!IF\s+NOT\s+EXISTS\b)",
+        r"\1 IF NOT EXISTS ",
+        statement,
+        count=1,
+        flags=re.IGNORECASE,
+    )
+
+
+def build_indexes(conn: LoadConnection):
+    """
+    Post-load phase: build the schema's deferred indexes over the loaded
+    tables, one sorted pass each, then gather planner statistics with
+    ANALYZE.
+
+    Indexes that already exist (a resumed run) are left as they are.
+    """
+    conn.commit()
+
+    for statement in conn.deferred_indexes:
+        conn.execute(index_if_not_exists(statement))
+
+    conn.execute("ANALYZE;")
+    conn.commit()
+
+
+def begin_bulk_load(conn: LoadConnection):
+    """
+    Switch a freshly created database into bulk-load mode.
+
+    Foreign keys are disabled, the rollback journal is kept in memory,
+    fsyncs are skipped and the page cache is enlarged. The previous values
+    are saved on the connection for finish_bulk_load() to restore.
+    Everything that follows runs in a single transaction until
+    finish_bulk_load().
+    """
+    conn.commit()
+    conn.saved_pragmas = tuple(
+        (name, conn.execute(f"PRAGMA {name};").fetchone()[0])
+        for name in BULK_PRAGMAS
+    )
+    for name, value in BULK_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value};")
+    conn.bulk_load = True
+
+
+def finish_bulk_load(conn: LoadConnection):
+    """
+    Commit the bulk-load transaction, then run the deferred post-load phase:
+    build secondary indexes and statistics (build_indexes), restore the
+    settings begin_bulk_load() overrode and validate the whole database
+    with PRAGMA foreign_key_check.
+
+    Raises:
+        sqlite3.IntegrityError: If any foreign key is violated
+    """
+    build_indexes(conn)
+
+    conn.bulk_load = False
+    for name, value in conn.saved_pragmas:
+        conn.execute(f"PRAGMA {name} = {value};")
+
+    violation = conn.execute("PRAGMA foreign_key_check;").fetchone()
+    if violation:
+        table, rowid, parent, _ = violation
+        raise sqlite3.IntegrityError(
+            f"Foreign key violation after bulk load: "
+            f"{table} rowid {rowid} -> {parent}"
+        )
+
+
+def persist_database(conn: sqlite3.Connection, db_path: str):
+    """
+    Write a database built in memory to db_path in one pass.
+
+    Pages are copied with the SQLite backup API into a temporary file
+    beside db_path, which then replaces it, so readers never see a
+    partly written database.
+    """
+    conn.commit()
+    start = time.perf_counter()
+
+    target = Path(db_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f"{target.name}.partial")
+    partial.unlink(missing_ok=True)
+
+    disk = sqlite3.connect(partial)
+    try:
+        conn.backup(disk)
+    finally:
+        disk.close()
+
+    os.replace(partial, target)
+    _track_write(conn, start, 0)
@@ -0,0 +1,254 @@
+"""Episode resets from one generated workspace."""
+
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+
+RESET_METHODS = ("deserialize", "backup")
+
+# Database header bytes holding the file format write/read versions
+# (2 = WAL, which an in-memory copy cannot use; 1 = rollback journal)
+_FORMAT_VERSIONS = slice(18, 20)
+
+# Linux FICLONE ioctl: share the source file's extents (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+
+
+def reflink(source: Path, target: Path) -> bool:
+    """
+    Clone source to target as a copy-on-write reflink.
+
+    Returns:
+        bool: False when the platform or filesystem cannot reflink
+            (target is then left absent)
+    """
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - not available on Windows
+        return False
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            return True
+        except OSError:
+            pass
+
+    os.unlink(target)
+    return False
+
+
+def rollback_image(image: bytes) -> bytes:
+    """
+    Return a serialized database marked for rollback journaling.
+
+    Images of WAL-mode databases keep the WAL format versions in their
+    header, and connections deserialized from them fail on their first
+    write.
+    """
+    if image[_FORMAT_VERSIONS] == b"\x01\x01":
+        return image
+    image = bytearray(image)
+    image[_FORMAT_VERSIONS] = b"\x01\x01"
+    return bytes(image)
+
+
+class WorkspaceSnapshot:
+    """
+    Generated workspace image that hands out isolated episode copies.
+
+    Args:
+        image (bytes): Serialized SQLite database
+        path (Path, optional): Database file the image was read from
+            (lets clone() reflink it)
+    """
+
+    def __init__(self, image: bytes, path: Optional[Path] = None):
+        self.image = rollback_image(image)
+        self.path = path
+        self._template = None
+        # reset(method="backup") may run in an EpisodePool thread too
+        self._template_lock = threading.Lock()
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "WorkspaceSnapshot":
+        """
+        Snapshot the committed state of an open database.
+        """
+        conn.commit()
+        return cls(conn.serialize())
+
+    @classmethod
+    def from_file(cls, path) -> "WorkspaceSnapshot":
+        """
+        Snapshot a generated database file.
+        """
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"{path} not found")
+
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            image = conn.serialize()
+        finally:
+            conn.close()
+
+        return cls(image, path)
+
+    @property
+    def size(self) -> int:
+        return len(self.image)
+
+    def reset(
+        self,
+        method: str = "deserialize",
+        factory=sqlite3.Connection,
+        check_same_thread: bool = True,
+    ) -> sqlite3.Connection:
+        """
+        Return a new in-memory connection holding a pristine copy of the
+        workspace.
+
+        Args:
+            method (str): "deserialize" (copy the image) or "backup"
+                (SQLite backup API from a template connection)
+            factory: sqlite3.Connection subclass to open
+            check_same_thread (bool): Passed to sqlite3.connect
+
+        Returns:
+            sqlite3.Connection: Writable, independent of every other reset
+
+        Raises:
+            ValueError: On an unknown method
+        """
+        if method not in RESET_METHODS:
+            raise ValueError(
+                f"Unknown reset method {method!r}; expected {list(RESET_METHODS)}"
+            )
+
+        conn = sqlite3.connect(
+            ":memory:", factory=factory, check_same_thread=check_same_thread
+        )
+
+        if method == "deserialize":
+            conn.deserialize(self.image)
+        else:
+            with self._template_lock:
+                if self._template is None:
+                    self._template = sqlite3.connect(
+                        ":memory:", check_same_thread=False
+                    )
+                    self._template.deserialize(self.image)
+                self._template.backup(conn)
+
+        conn.execute("PRAGMA foreign_keys = ON;")
+        return conn
+
+    def clone(self, target) -> str:
+        """
+        Write a copy of the workspace to the database file target.
+
+        Reflinks the snapshot's source file when possible and otherwise
+        writes the image. The image is also written for WAL-mode sources,
+        whose file alone may miss committed pages.
+
+        Returns:
+            str: "reflink" or "copy"
+        """
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        path = self.path
+        if path is not None:
+            with open(path, "rb") as f:
+                if f.read(20)[_FORMAT_VERSIONS] != b"\x01\x01":
+                    path = None
+
+        if path is not None and reflink(path, target):
+            return "reflink"
+
+        if path is not None:
+            shutil.copyfile(path, target)
+        else:
+            target.write_bytes(self.image)
+        return "copy"
+
+    def close(self):
+        with self._template_lock:
+            if self._template is not None:
+                self._template.close()
+                self._template = None
+
+
+class EpisodePool:
+    """
+    Pristine workspace copies prepared ahead of the episodes using them.
+
+    A background thread keeps up to size copies ready (sqlite3 releases
+    the GIL while it copies the image), so acquire() returns at once as
+    long as an episode outlasts one reset.
+
+    Args:
+        snapshot (WorkspaceSnapshot): Workspace to copy
+        size (int): Copies kept ready
+        method (str): Reset method (see WorkspaceSnapshot.reset)
+    """
+
+    def __init__(
+        self,
+        snapshot: WorkspaceSnapshot,
+        size: int = 1,
+        method: str = "deserialize",
+    ):
+        if method not in RESET_METHODS:
+            raise ValueError(
+                f"Unknown reset method {method!r}; expected {list(RESET_METHODS)}"
+            )
+
+        self.snapshot = snapshot
+        self.method = method
+        self._ready = queue.Queue(maxsize=max(1, size))
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._fill, name="episode-pool", daemon=True
+        )
+        self._thread.start()
+
+    def _fill(self):
+        while not self._closed.is_set():
+            conn = self.snapshot.reset(self.method, check_same_thread=False)
+
+            while True:
+                try:
+                    self._ready.put(conn, timeout=0.1)
+                    break
+                except queue.Full:
+                    if self._closed.is_set():
+                        conn.close()
+                        return
+
+    def acquire(self) -> sqlite3.Connection:
+        """
+        Return the next pristine connection (waits if none is ready yet).
+
+        The connection belongs to the caller, who closes it after the
+        episode.
+        """
+        if self._closed.is_set():
+            raise RuntimeError("EpisodePool is closed")
+        return self._ready.get()
+
+    def close(self):
+        """
+        Stop refilling and close the copies nobody acquired.
+        """
+        self._closed.set()
+        self._thread.join()
+
+        while not self._ready.empty():
+            self._ready.get_nowait().close()
@@ -0,0 +1,290 @@
+"""In-memory registry of the generated workspace (WorkspaceGraph)."""
+
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate
+
+
+class PackedUuids(Sequence):
+    """
+    Append-only sequence of UUID strings stored as 16 raw bytes each.
+
+    Indexing returns the canonical string form, so it stands in for a list
+    of IDs anywhere the generators pick or sample them.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, ids=()):
+        self._data = bytearray()
+        self.extend(ids)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PackedUuids":
+        """Rebuild a sequence from its to_bytes() form."""
+        packed = cls()
+        packed._data = bytearray(data)
+        return packed
+
+    def to_bytes(self) -> bytes:
+        """Return the raw 16-byte UUIDs, concatenated."""
+        return bytes(self._data)
+
+    def append(self, value: str):
+        self._data += bytes.fromhex(value.replace("-", ""))
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        return len(self._data) // 16
+
+    @staticmethod
+    def _format(raw: bytes) -> str:
+        h = raw.hex()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            data = self._data[start * 16:stop * 16]
+            return [
+                self._format(data[i:i + 16]) for i in range(0, len(data), 16)
+            ]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ID index out of range")
+        return self._format(self._data[index * 16:index * 16 + 16])
+
+
+class IdView(Sequence):
+    """
+    Read-only view of ids[indices[0]], ids[indices[1]], ...
+    """
+
+    __slots__ = ("ids", "indices")
+
+    def __init__(self, ids: Sequence, indices: Sequence):
+        self.ids = ids
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.ids[i] for i in self.indices[index]]
+        return self.ids[self.indices[index]]
+
+
+class Adjacency:
+    """
+    CSR adjacency list: row i's targets are targets[offsets[i]:offsets[i + 1]].
+
+    Children generated contiguously (a project's tasks, a task's subtasks)
+    need no targets array: row i then owns the index range
+    offsets[i]..offsets[i + 1] - 1 of the child kind.
+
+    Args:
+        contiguous (bool): Rows are runs of consecutive child indices
+    """
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, contiguous: bool = False):
+        self.offsets = array("q", [0])
+        self.targets = None if contiguous else array("i")
+
+    def add_row(self, targets):
+        """Append the next row given its target indices."""
+        self.targets.extend(targets)
+        self.offsets.append(len(self.targets))
+
+    def add_run(self, count: int):
+        """Append the next row of a contiguous adjacency (count children)."""
+        self.offsets.append(self.offsets[-1] + count)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row: int):
+        start, stop = self.offsets[row], self.offsets[row + 1]
+        if self.targets is None:
+            return range(start, stop)
+        return self.targets[start:stop]
+
+    def degree(self, row: int) -> int:
+        return self.offsets[row + 1] - self.offsets[row]
+
+    @property
+    def num_edges(self) -> int:
+        return self.offsets[-1]
+
+    def transpose(self, num_targets: int) -> "Adjacency":
+        """
+        Return the reverse adjacency (target -> rows), by counting sort.
+
+        Args:
+            num_targets (int): Number of target entities (rows of the result)
+
+        Returns:
+            Adjacency: Row t lists, in ascending order, the rows pointing at t
+        """
+        counts = array("q", bytes(8 * (num_targets + 1)))
+        for target in self.targets:
+            counts[target + 1] += 1
+
+        reverse = Adjacency()
+        reverse.offsets = array("q", accumulate(counts))
+        reverse.targets = array("i", bytes(4 * len(self.targets)))
+
+        cursor = reverse.offsets[:-1]
+        targets, sources = self.targets, reverse.targets
+        for row in range(len(self)):
+            for target in targets[self.offsets[row]:self.offsets[row + 1]]:
+                sources[cursor[target]] = row
+                cursor[target] += 1
+
+        return reverse
+
+
+class WorkspaceGraph:
+    """
+    Entities generated so far, shared by every pipeline stage.
+
+    ID tables (org_id, user_ids, team_ids, project_ids, section_ids,
+    task_ids, subtask_ids) are filled by the stage generating that kind.
+    Entity #i of a kind is position i of its table and of every per-kind
+    attribute array.
+
+    Attributes:
+        project_teams (array): Owning team index of each project
+        project_types (array): PROJECT_TYPES position of each project
+        task_created_at (array): Creation time of each task (epoch s)
+        task_active_until (array): End of each task's activity window:
+            its completion time, or the reference time while open
+        task_sections (array): Section position of each task in its
+            project
+        task_assignees (array): Position of each task's assignee in its
+            project's assignees(), -1 when unassigned
+        task_completed_at (array): Completion time of each task (epoch
+            s), -1 while open
+        comment_authors (array): User index of each comment's author
+        comment_created_at (array): Posting time of each comment (epoch s)
+        team_members (Adjacency): team -> member user indices
+        user_teams (Adjacency): user -> team indices (the transpose of
+            team_members, derived on first access)
+        project_sections (Adjacency): project -> section indices
+        project_tasks (Adjacency): project -> task indices
+        task_subtasks (Adjacency): task -> subtask indices
+        task_comments (Adjacency): task -> comment indices
+
+    The task_sections .. comment_created_at fields and task_comments are
+    only filled in when activity events are simulated (ACTIVITY_EVENTS);
+    the activity stage reads them instead of rebuilding task and comment
+    rows.
+    """
+
+    __slots__ = (
+        "org_id",
+        "user_ids",
+        "team_ids",
+        "project_ids",
+        "section_ids",
+        "task_ids",
+        "subtask_ids",
+        "project_teams",
+        "project_types",
+        "task_created_at",
+        "task_active_until",
+        "task_sections",
+        "task_assignees",
+        "task_completed_at",
+        "comment_authors",
+        "comment_created_at",
+        "team_members",
+        "_user_teams",
+        "project_sections",
+        "project_tasks",
+        "task_subtasks",
+        "task_comments",
+    )
+
+    def __init__(self):
+        self.org_id = None
+        self.user_ids = ()
+        self.team_ids = ()
+        self.project_ids = ()
+        self.section_ids = ()
+        self.task_ids = ()
+        self.subtask_ids = ()
+
+        self.project_teams = array("i")
+        self.project_types = array("b")
+        self.task_created_at = array("q")
+        self.task_active_until = array("q")
+        self.task_sections = array("b")
+        self.task_assignees = array("i")
+        self.task_completed_at = array("q")
+        self.comment_authors = array("i")
+        self.comment_created_at = array("q")
+
+        self.team_members = Adjacency()
+        self._user_teams = None
+        self.project_sections = Adjacency(contiguous=True)
+        self.project_tasks = Adjacency(contiguous=True)
+        self.task_subtasks = Adjacency(contiguous=True)
+        self.task_comments = Adjacency(contiguous=True)
+
+    @property
+    def user_teams(self) -> Adjacency:
+        if self._user_teams is None:
+            self._user_teams = self.team_members.transpose(len(self.user_ids))
+        return self._user_teams
+
+    def members(self, team_index: int) -> IdView:
+        """Return the user IDs of team #team_index."""
+        return IdView(self.user_ids, self.team_members[team_index])
+
+    def teams_of(self, user_index: int) -> IdView:
+        """Return the team IDs user #user_index belongs to."""
+        return IdView(self.team_ids, self.user_teams[user_index])
+
+    def assignees(self, team_index: int) -> Sequence:
+        """
+        Return the users work in team #team_index's projects is assigned
+        to: its members, or every user when the team is empty.
+        """
+        members = self.members(team_index)
+        return members if len(members) else self.user_ids
+
+    def sections(self, project_index: int) -> list:
+        """Return the section IDs of project #project_index, in position order."""
+        run = self.project_sections[project_index]
+        return self.section_ids[run.start:run.stop]
+
+    def tasks(self, project_index: int) -> Sequence:
+        """Return the task IDs of project #project_index."""
+        run = self.project_tasks[project_index]
+        return self.task_ids[run.start:run.stop]
+
+    def subtasks(self, task_index: int) -> Sequence:
+        """Return the subtask IDs of task #task_index."""
+        run = self.task_subtasks[task_index]
+        return self.subtask_ids[run.start:run.stop]
+
+    def comments(self, task_index: int) -> list:
+        """
+        Return (author user ID, epoch s) of each comment on task
+        #task_index, in posting order (activity events runs only).
+        """
+        run = self.task_comments[task_index]
+        return [
+            (self.user_ids[self.comment_authors[i]], self.comment_created_at[i])
+            for i in run
+        ]
@@ -0,0 +1,196 @@
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+PROMETHEUS_PREFIX = "asana_seed"
+
+# (metric name, stage key, help text) of the Prometheus dump
+PROMETHEUS_METRICS = [
+    ("stage_wall_seconds", "wall_seconds", "Wall-clock time of the stage"),
+    (
+        "stage_cpu_seconds",
+        "cpu_seconds",
+        "CPU time of the stage (main process plus reaped workers)",
+    ),
+    ("stage_rows", "rows", "Rows inserted by the stage"),
+    ("stage_rows_per_second", "rows_per_second", "Stage throughput"),
+    (
+        "stage_write_seconds",
+        "write_seconds",
+        "Time spent in execute_many/execute_one",
+    ),
+    (
+        "stage_build_seconds",
+        "build_seconds",
+        "Time outside execute_many/execute_one (row construction)",
+    ),
+    (
+        "stage_peak_rss_delta_bytes",
+        "peak_rss_delta_bytes",
+        "Growth of the main process peak RSS during the stage",
+    ),
+]
+
+
+def cpu_seconds() -> float:
+    """
+    CPU time (user + system) of this process and its reaped children.
+    """
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def peak_rss_bytes():
+    """
+    Peak resident set size of this process, or None where unsupported.
+    """
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RunMetrics:
+    """
+    Per-stage metrics of one generation run.
+
+    Pass `metrics.stage` as the stage hook of run_pipeline(). For every
+    stage it records wall and CPU time, rows inserted, rows/sec, the time
+    spent inside execute_many/execute_one (write) versus everything else
+    (build: row construction, waiting on workers, post-load work) and how
+    much the process peak RSS grew.
+
+    Args:
+        conn: LoadConnection the pipeline writes to (its write counters
+            are read before and after every stage)
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.stages = []
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._cpu_start = cpu_seconds()
+
+    def stage(self, name: str, func, *args):
+        """
+        Run func(*args) as pipeline stage `name` and record its metrics.
+        """
+        conn = self.conn
+
+        writes_before = getattr(conn, "write_seconds", 0.0)
+        rows_before = getattr(conn, "rows_written", 0)
+        rss_before = peak_rss_bytes()
+        cpu_before = cpu_seconds()
+        start = time.perf_counter()
+
+        result = func(*args)
+
+        wall = time.perf_counter() - start
+        cpu = cpu_seconds() - cpu_before
+        write = getattr(conn, "write_seconds", 0.0) - writes_before
+        rows = getattr(conn, "rows_written", 0) - rows_before
+        rss_after = peak_rss_bytes()
+
+        record = {
+            "stage": name,
+            "wall_seconds": round(wall, 6),
+            "cpu_seconds": round(cpu, 6),
+            "rows": rows,
+            "rows_per_second": round(rows / wall, 1) if wall > 0 else 0.0,
+            "write_seconds": round(write, 6),
+            "build_seconds": round(max(wall - write, 0.0), 6),
+            "peak_rss_delta_bytes": (
+                rss_after - rss_before if rss_after is not None else None
+            ),
+        }
+        self.stages.append(record)
+
+        logger.info(
+            f"[metrics] {name}: {rows:,} rows in {wall:.2f}s "
+            f"({record['rows_per_second']:,.0f} rows/s; "
+            f"write {write:.2f}s, build {record['build_seconds']:.2f}s)"
+        )
+
+        return result
+
+    def report(self, config: dict = None) -> dict:
+        """
+        Build the machine-readable run report.
+
+        Returns:
+            dict: Run totals, per-stage records and the slowest stage
+        """
+        wall = time.perf_counter() - self._start
+        rows = sum(stage["rows"] for stage in self.stages)
+        slowest = max(
+            self.stages, key=lambda stage: stage["wall_seconds"], default=None
+        )
+
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "config": config or {},
+            "totals": {
+                "wall_seconds": round(wall, 6),
+                "cpu_seconds": round(cpu_seconds() - self._cpu_start, 6),
+                "rows": rows,
+                "rows_per_second": round(rows / wall, 1) if wall > 0 else 0.0,
+                "write_seconds": round(
+                    sum(stage["write_seconds"] for stage in self.stages), 6
+                ),
+                "peak_rss_bytes": peak_rss_bytes(),
+            },
+            "bottleneck": slowest["stage"] if slowest else None,
+            "stages": self.stages,
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render the stage metrics in the Prometheus text exposition format.
+        """
+        lines = []
+
+        for metric, key, help_text in PROMETHEUS_METRICS:
+            name = f"{PROMETHEUS_PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+
+            for stage in self.stages:
+                if stage[key] is not None:
+                    lines.append(f'{name}{{stage="{stage["stage"]}"}} {stage[key]}')
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, config: dict = None, prometheus_path: str = None):
+        """
+        Write the JSON run report (and optionally the Prometheus dump).
+
+        Args:
+            path (str): JSON report path (skipped when empty)
+            config (dict): Configuration values embedded in the report
+            prometheus_path (str): Prometheus text file path (optional)
+        """
+        if path:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(self.report(config), indent=2))
+            logger.info(f"Run report written to {path}")
+
+        if prometheus_path:
+            prometheus_path = Path(prometheus_path)
+            prometheus_path.parent.mkdir(parents=True, exist_ok=True)
+            prometheus_path.write_text(self.to_prometheus())
+            logger.info(f"Prometheus metrics written to {prometheus_path}")
@@ -0,0 +1,119 @@
+import json
+import random
+import re
+import unicodedata
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+
+from loguru import logger
+
+
+NAME_POOLS_FILE = Path(__file__).resolve().parents[2] / "data" / "name_pools.json"
+
+_NON_EMAIL_CHARS = re.compile(r"[^a-z0-9.]+")
+
+
+class NamePool:
+    """
+    A weighted pool of names with precomputed cumulative weights.
+
+    The cumulative weights are what rng.choices() (or numpy.searchsorted)
+    bisects, so drawing any number of names never re-normalizes the pool.
+    """
+
+    def __init__(self, weights: dict):
+        self.names = list(weights)
+        self.cum_weights = list(accumulate(weights.values()))
+
+    def __len__(self):
+        return len(self.names)
+
+    def draw(self, rng=random, k: int = 1) -> list:
+        """Draw k names (with replacement) by frequency."""
+        return rng.choices(self.names, cum_weights=self.cum_weights, k=k)
+
+
+def extract_faker_pools() -> dict:
+    """
+    Extract the en_US first/last-name frequency tables from Faker.
+
+    Faker is imported here, and only here, so it is needed solely to
+    rebuild a missing name_pools.json.
+    """
+    from faker.providers.person.en_US import Provider
+
+    return {
+        "first_names": dict(Provider.first_names),
+        "last_names": dict(Provider.last_names),
+    }
+
+
+@lru_cache(maxsize=None)
+def load_name_pools(path: Path = NAME_POOLS_FILE) -> tuple:
+    """
+    Load the (first names, last names) pools, building the cache if missing.
+
+    Args:
+        path (Path): Cached name-pool file
+
+    Returns:
+        tuple: (NamePool of first names, NamePool of last names)
+    """
+
+    path = Path(path)
+
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            pools = json.load(f)
+    else:
+        logger.info(f"{path.name} not found; extracting name pools from Faker")
+        pools = extract_faker_pools()
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(pools, f, separators=(",", ":"))
+        except OSError as e:
+            logger.warning(f"Could not cache name pools at {path}: {e}")
+
+    return NamePool(pools["first_names"]), NamePool(pools["last_names"])
+
+
+def full_name(rng=random) -> str:
+    """
+    Draw one "First Last" name.
+    """
+    first_names, last_names = load_name_pools()
+    return f"{first_names.draw(rng)[0]} {last_names.draw(rng)[0]}"
+
+
+def full_names(n: int, rng=random) -> list:
+    """
+    Draw n "First Last" names in two bulk draws.
+    """
+    first_names, last_names = load_name_pools()
+    return [
+        f"{first} {last}"
+        for first, last in zip(first_names.draw(rng, n), last_names.draw(rng, n))
+    ]
+
+
+def email_address(name: str, index: int, domain: str) -> str:
+    """
+    Build the email of user #index.
+
+    The local part is the ASCII-folded name plus the user index, so
+    addresses are unique without tracking the ones already issued and any
+    single user's email can be rebuilt on its own.
+    """
+    local = (
+        unicodedata.normalize("NFKD", name)
+        .encode("ascii", "ignore")
+        .decode("ascii")
+        .lower()
+        .replace(" ", ".")
+    )
+    local = _NON_EMAIL_CHARS.sub("", local)
+
+    return f"{local}.{index}@{domain}"
@@ -0,0 +1,99 @@
+import multiprocessing
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List
+
+from utils.dates import reference_time, set_reference_time
+
+
+# Number of tasks handled by one shard in the task-level stages. Every entity
+# draws from its own keyed random stream, so with the default backend this
+# only affects scheduling granularity. (The NumPy backend keys its streams per
+# shard, so it must stay a constant, never derived from WORKERS.)
+TASK_SHARD_SIZE = 1000
+
+# Shards queued per worker; bounds how many finished results can pile up
+# in front of the single writer.
+MAX_INFLIGHT_PER_WORKER = 4
+
+_worker_context = None
+
+
+def get_workers(config: dict = None) -> int:
+    """
+    Return the configured number of worker processes (at least 1).
+    """
+    if config and config.get("workers"):
+        return max(1, int(config["workers"]))
+    return 1
+
+
+def iter_chunks(items: List[Any], size: int = TASK_SHARD_SIZE) -> Iterator[tuple]:
+    """
+    Lazily split a list into (offset, chunk) pairs of at most size items,
+    where offset is the index of the chunk's first item.
+    """
+    for start in range(0, len(items), size):
+        yield start, items[start:start + size]
+
+
+def _init_worker(context: Any, pinned_time):
+    global _worker_context
+    _worker_context = context
+    set_reference_time(pinned_time)
+
+
+def _run_shard(func: Callable, shard: Any):
+    return func(shard, _worker_context)
+
+
+def map_shards(
+    func: Callable,
+    shards: Iterable[Any],
+    config: dict = None,
+    context: Any = None,
+) -> Iterator[Any]:
+    """
+    Apply func(shard, context) to every shard, yielding results in order.
+
+    With WORKERS > 1 the shards are spread over a process pool while the
+    caller (which owns the SQLite connection) consumes results as the single
+    writer. Results are yielded in shard order and at most
+    MAX_INFLIGHT_PER_WORKER shards per worker are outstanding at once.
+
+    Args:
+        func (callable): Module-level function taking (shard, context)
+        shards (iterable): Shard descriptors
+        config (dict, optional): Configuration values
+        context: Read-only data shared by every shard (sent once per worker)
+
+    Yields:
+        The return value of func for each shard
+    """
+    workers = get_workers(config)
+
+    if workers <= 1:
+        for shard in shards:
+            yield func(shard, context)
+        return
+
+    shards = iter(shards)
+    max_inflight = workers * MAX_INFLIGHT_PER_WORKER
+
+    with multiprocessing.Pool(
+        workers,
+        initializer=_init_worker,
+        initargs=(context, reference_time()),
+    ) as pool:
+        pending = deque(
+            pool.apply_async(_run_shard, (func, shard))
+            for shard in islice(shards, max_inflight)
+        )
+
+        while pending:
+            result = pending.popleft().get()
+
+            for shard in islice(shards, 1):
+                pending.append(pool.apply_async(_run_shard, (func, shard)))
+
+            yield result
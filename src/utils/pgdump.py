@@ -0,0 +1,395 @@
+"""PostgreSQL dump output sink (OUTPUT_SINKS=postgres)."""
+
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Sequence
+
+from loguru import logger
+
+from utils.sinks import Sink
+
+
+# SQLite declared type -> PostgreSQL type
+PG_TYPES = {
+    "TEXT": "text",
+    "INTEGER": "bigint",
+    "BOOLEAN": "boolean",
+    "TIMESTAMP": "timestamp",
+    "DATE": "date",
+}
+
+_COPY_ESCAPES = str.maketrans(
+    {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"}
+)
+
+_CHECK_START = re.compile(r"\bCHECK\s*\(", re.IGNORECASE)
+
+
+def copy_text(value: str) -> str:
+    """
+    Escape a text value for the COPY text format.
+    """
+    return value.translate(_COPY_ESCAPES)
+
+
+def _format_boolean(value) -> str:
+    return "t" if value else "f"
+
+
+def _format_integer(value) -> str:
+    # Compact tables keep Python booleans in INTEGER columns
+    return str(int(value))
+
+
+def _format_text(value) -> str:
+    return copy_text(str(value))
+
+
+_FORMATTERS = {
+    "boolean": _format_boolean,
+    "bigint": _format_integer,
+}
+
+
+def check_constraints(create_sql: str) -> List[str]:
+    """
+    Extract the CHECK (...) expressions of a CREATE TABLE statement.
+    """
+    checks = []
+
+    for match in _CHECK_START.finditer(create_sql):
+        depth, start = 1, match.end()
+        for i in range(start, len(create_sql)):
+            if create_sql[i] == "(":
+                depth += 1
+            elif create_sql[i] == ")":
+                depth -= 1
+                if depth == 0:
+                    checks.append(" ".join(create_sql[start:i].split()))
+                    break
+
+    return checks
+
+
+def dependency_order(conn, tables: List[str]) -> List[str]:
+    """
+    Order tables so that every table follows the tables it references.
+
+    Ties keep the schema's creation order.
+    """
+    parents = {
+        table: {
+            row[2]
+            for row in conn.execute(f"PRAGMA foreign_key_list({table})")
+            if row[2] != table
+        }
+        for table in tables
+    }
+
+    ordered, placed = [], set()
+    while len(ordered) < len(tables):
+        ready = [
+            table
+            for table in tables
+            if table not in placed and parents[table] <= placed
+        ]
+        if not ready:
+            raise ValueError("Foreign key cycle between tables")
+        ordered.extend(ready)
+        placed.update(ready)
+
+    return ordered
+
+
+class _PgTable:
+    __slots__ = ("columns", "formatters", "spool", "rows", "key_index", "next_key")
+
+    def __init__(self, columns, formatters, spool, key_index=None):
+        self.columns = columns
+        self.formatters = formatters
+        self.spool = spool
+        self.rows = 0
+        # Position of an INTEGER PRIMARY KEY column SQLite would fill in
+        self.key_index = key_index
+        self.next_key = 1
+
+
+class PostgresDumpSink(Sink):
+    """
+    Write a PostgreSQL dump (schema + COPY data + constraints) of the run.
+
+    Args:
+        conn: SQLite connection holding the run's schema
+        path (str): Output .sql file
+    """
+
+    def __init__(self, conn, path: str):
+        self.conn = conn
+        self.path = Path(path)
+        self._spool_dir = None
+        self._tables = {}
+
+    # --------------------
+    # Schema introspection
+    # --------------------
+    def _schema_tables(self) -> List[str]:
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' "
+                "ORDER BY rowid"
+            )
+        ]
+
+    def _column_types(self, table: str) -> dict:
+        return {
+            row[1]: PG_TYPES.get(row[2].upper(), "text")
+            for row in self.conn.execute(f"PRAGMA table_info({table})")
+        }
+
+    def _rowid_column(self, table: str):
+        """
+        Return the INTEGER PRIMARY KEY column aliasing the rowid, if any.
+
+        SQLite assigns it when a row omits it (NULL); Postgres will not.
+        """
+        info = list(self.conn.execute(f"PRAGMA table_info({table})"))
+        primary_key = [row for row in info if row[5]]
+
+        if len(primary_key) != 1 or primary_key[0][2].upper() != "INTEGER":
+            return None
+
+        create_sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        ).fetchone()[0]
+        if re.search(r"WITHOUT\s+ROWID", create_sql, re.IGNORECASE):
+            return None
+
+        return primary_key[0][1]
+
+    def _create_table(self, table: str) -> str:
+        columns = []
+
+        for _, name, declared, notnull, default, _ in self.conn.execute(
+            f"PRAGMA table_info({table})"
+        ):
+            pg_type = PG_TYPES.get(declared.upper(), "text")
+            column = f"    {name} {pg_type}"
+
+            if notnull:
+                column += " NOT NULL"
+            if default is not None:
+                if pg_type == "boolean":
+                    default = "true" if default.strip("'") not in ("0", "") else "false"
+                column += f" DEFAULT {default}"
+
+            columns.append(column)
+
+        return f"CREATE TABLE {table} (\n" + ",\n".join(columns) + "\n);\n"
+
+    def _constraints(self, table: str) -> tuple:
+        """Return the (keys, checks, foreign keys) ALTER TABLE statements."""
+        conn = self.conn
+        keys, checks, foreign_keys = [], [], []
+
+        primary_key = [
+            row[1]
+            for row in sorted(
+                conn.execute(f"PRAGMA table_info({table})"), key=lambda r: r[5]
+            )
+            if row[5]
+        ]
+        if primary_key:
+            keys.append(
+                f"ALTER TABLE ONLY {table} "
+                f"ADD PRIMARY KEY ({', '.join(primary_key)});"
+            )
+
+        for _, index, unique, origin, _ in conn.execute(
+            f"PRAGMA index_list({table})"
+        ):
+            if unique and origin == "u":
+                columns = [
+                    row[2] for row in conn.execute(f"PRAGMA index_info({index})")
+                ]
+                keys.append(
+                    f"ALTER TABLE ONLY {table} ADD UNIQUE ({', '.join(columns)});"
+                )
+
+        create_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (table,),
+        ).fetchone()[0]
+        for expression in check_constraints(create_sql):
+            checks.append(f"ALTER TABLE ONLY {table} ADD CHECK ({expression});")
+
+        references = {}
+        for row in conn.execute(f"PRAGMA foreign_key_list({table})"):
+            fk_id, _, parent, column, parent_column = row[:5]
+            references.setdefault(fk_id, (parent, [], []))
+            references[fk_id][1].append(column)
+            references[fk_id][2].append(parent_column)
+
+        for fk_id in sorted(references):
+            parent, columns, parent_columns = references[fk_id]
+            foreign_keys.append(
+                f"ALTER TABLE ONLY {table} ADD FOREIGN KEY ({', '.join(columns)}) "
+                f"REFERENCES {parent} ({', '.join(parent_columns)});"
+            )
+
+        return keys, checks, foreign_keys
+
+    def _indexes(self, table: str) -> List[str]:
+        return [
+            " ".join(row[0].split()) + ";"
+            for row in self.conn.execute(
+                "SELECT sql FROM sqlite_master "
+                "WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,),
+            )
+        ]
+
+    # -------------
+    # Sink protocol
+    # -------------
+    def _table(self, table: str, columns: Sequence[str]) -> _PgTable:
+        state = self._tables.get(table)
+
+        if state is None:
+            if self._spool_dir is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._spool_dir = tempfile.TemporaryDirectory(
+                    prefix=f"{self.path.stem}-", dir=self.path.parent
+                )
+
+            types = self._column_types(table)
+            formatters = [
+                _FORMATTERS.get(types.get(column), _format_text)
+                for column in columns
+            ]
+            spool = open(
+                Path(self._spool_dir.name) / f"{table}.copy",
+                "w",
+                encoding="utf-8",
+                newline="\n",
+            )
+            key_column = self._rowid_column(table)
+            state = self._tables[table] = _PgTable(
+                tuple(columns),
+                formatters,
+                spool,
+                columns.index(key_column) if key_column in columns else None,
+            )
+
+        return state
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        if not rows:
+            return
+
+        state = self._table(table, columns)
+        formatters = state.formatters
+
+        if state.key_index is not None:
+            rows = self._fill_keys(state, rows)
+
+        state.spool.write(
+            "".join(
+                "\t".join(
+                    "\\N" if value is None else fmt(value)
+                    for fmt, value in zip(formatters, row)
+                )
+                + "\n"
+                for row in rows
+            )
+        )
+        state.rows += len(rows)
+
+    @staticmethod
+    def _fill_keys(state: _PgTable, rows: List[tuple]) -> List[tuple]:
+        """Assign NULL rowid keys the way SQLite does (max key + 1)."""
+        k = state.key_index
+        filled = []
+
+        for row in rows:
+            key = row[k]
+            if key is None:
+                key = state.next_key
+                row = (*row[:k], key, *row[k + 1:])
+            state.next_key = max(state.next_key, key + 1)
+            filled.append(row)
+
+        return filled
+
+    def _static_rows(self, table: str):
+        """Copy rows the schema script itself inserted (lookup tables)."""
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        rows = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM {table}"
+        ).fetchall()
+        if rows:
+            self.write(table, columns, rows)
+
+    def close(self):
+        tables = self._schema_tables()
+
+        for table in tables:
+            if table not in self._tables:
+                self._static_rows(table)
+
+        ordered = dependency_order(self.conn, tables)
+
+        with open(self.path, "w", encoding="utf-8", newline="\n") as out:
+            out.write(
+                "-- Asana workspace seed data: PostgreSQL dump\n"
+                "-- Load with: psql -v ON_ERROR_STOP=1 -f <this file>\n\n"
+                "SET client_encoding = 'UTF8';\n"
+                "SET standard_conforming_strings = on;\n\n"
+                "BEGIN;\n\n"
+            )
+
+            for table in ordered:
+                out.write(self._create_table(table) + "\n")
+
+            for table in ordered:
+                state = self._tables.get(table)
+                if state is None:
+                    continue
+
+                state.spool.close()
+                out.write(
+                    f"COPY {table} ({', '.join(state.columns)}) FROM stdin;\n"
+                )
+                with open(state.spool.name, "r", encoding="utf-8") as spool:
+                    shutil.copyfileobj(spool, out, 1024 * 1024)
+                out.write("\\.\n\n")
+
+            keys, checks, foreign_keys, indexes = [], [], [], []
+            for table in ordered:
+                table_keys, table_checks, table_fks = self._constraints(table)
+                keys += table_keys
+                checks += table_checks
+                foreign_keys += table_fks
+                indexes += self._indexes(table)
+
+            for statement in keys + checks + foreign_keys + indexes:
+                out.write(statement + "\n")
+
+            out.write("\nCOMMIT;\n\nANALYZE;\n")
+
+        if self._spool_dir is not None:
+            self._spool_dir.cleanup()
+            self._spool_dir = None
+
+        skipped = self.conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'view'"
+        ).fetchone()[0]
+        logger.info(
+            f"Wrote PostgreSQL dump of {len(self._tables)} tables to {self.path}"
+            + (f" ({skipped} SQLite views not translated)" if skipped else "")
+        )
+        self._tables = {}
@@ -1,7 +1,15 @@
+import hashlib
 import random
+import struct
+import uuid
+from collections.abc import Sequence
 from typing import List, Any
 
 
+_RECIP_BPF = 2 ** -53
+_BLOCK = struct.Struct("<8Q")
+
+
 def seed_everything(seed: int):
     """
     Seed all randomness for reproducibility.
@@ -9,15 +17,139 @@ def seed_everything(seed: int):
     random.seed(seed)
 
 
-def weighted_choice(items: List[Any], weights: List[float]) -> Any:
+def derive_seed(seed: int, *keys: Any) -> int:
+    """
+    Derive a stable 64-bit seed from a base seed and a sequence of keys.
+
+    Used to seed generators that keep their own state (such as the NumPy
+    backend's Philox streams) from the same keys as the entity streams below.
+    """
+    material = ":".join(str(part) for part in (seed, *keys)).encode("utf-8")
+    digest = hashlib.blake2b(material, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class KeyedRandom(random.Random):
+    """
+    Counter-based random stream keyed by (seed, entity type, entity index).
+
+    Draw n of the stream is a pure function of the key and n (BLAKE2b over
+    key + block counter), so the stream of any entity can be opened in O(1)
+    without generating the entities before it. All random.Random helpers
+    (choice, choices, sample, randint, ...) work on top of it unchanged.
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return super().__new__(cls)
+
+    def __init__(self, seed: int = 0, kind: str = "", index: int = 0):
+        self.rekey(seed, kind, index)
+
+    def rekey(self, seed: int, kind: str, index: int):
+        """
+        Point the stream at a new (seed, kind, index) key, from draw 0.
+        """
+        self._key = f"{seed}:{kind}:{index}:".encode("utf-8")
+        self._counter = 0
+        self._words = []
+        self.gauss_next = None
+
+    def seed(self, *args, **kwargs):
+        # Streams are addressed by key; see rekey()
+        pass
+
+    def getstate(self):
+        return self._key, self._counter, tuple(self._words)
+
+    def setstate(self, state):
+        key, counter, words = state
+        self._key = key
+        self._counter = counter
+        self._words = list(words)
+
+    def _next_word(self) -> int:
+        if not self._words:
+            block = hashlib.blake2b(
+                self._key + self._counter.to_bytes(8, "little"),
+                digest_size=64,
+            ).digest()
+            self._counter += 1
+            self._words = list(reversed(_BLOCK.unpack(block)))
+        return self._words.pop()
+
+    def random(self) -> float:
+        return (self._next_word() >> 11) * _RECIP_BPF
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            return self._next_word() >> (64 - k)
+
+        value = 0
+        for shift in range(0, k, 64):
+            value |= self._next_word() << shift
+        return value & ((1 << k) - 1)
+
+
+def entity_rng(seed: int, kind: str, index: int) -> KeyedRandom:
+    """
+    Open the random stream of entity #index of the given kind.
+    """
+    return KeyedRandom(seed, kind, index)
+
+
+def random_uuid(rng=random) -> str:
+    """
+    Return a version-4 UUID string drawn from the given (seeded) stream.
+    """
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def entity_id(seed: int, kind: str, index: int) -> str:
+    """
+    Return the UUID of entity #index of the given kind.
+
+    The first 128 bits of every entity stream are its UUID, so this matches
+    the ID the entity's generator assigns.
+    """
+    return random_uuid(entity_rng(seed, kind, index))
+
+
+class EntityIds(Sequence):
+    """
+    Lazy, read-only sequence of the UUIDs of the first `count` entities
+    of a kind. Usable anywhere a list of IDs is (len, indexing, slicing,
+    random.choice/sample) without materializing the IDs.
+    """
+
+    __slots__ = ("seed", "kind", "count")
+
+    def __init__(self, seed: int, kind: str, count: int):
+        self.seed = seed
+        self.kind = kind
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(f"{self.kind} index out of range")
+        return entity_id(self.seed, self.kind, index)
+
+
+def weighted_choice(items: List[Any], weights: List[float], rng=random) -> Any:
     """
     Select a single item based on weights.
     """
-    return random.choices(items, weights=weights, k=1)[0]
+    return rng.choices(items, weights=weights, k=1)[0]
 
 
-def probability(p: float) -> bool:
+def probability(p: float, rng=random) -> bool:
     """
     Return True with probability p.
     """
-    return random.random() < p
+    return rng.random() < p
@@ -0,0 +1,283 @@
+import csv
+import gzip
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+
+SQLITE_SINK = "sqlite"
+CSV_SINK = "csv"
+NDJSON_SINK = "ndjson"
+PARQUET_SINK = "parquet"
+POSTGRES_SINK = "postgres"
+
+SINK_TYPES = (SQLITE_SINK, CSV_SINK, NDJSON_SINK, PARQUET_SINK, POSTGRES_SINK)
+
+# File name of the PostgreSQL dump inside OUTPUT_DIR
+POSTGRES_DUMP_FILE = "asana_simulation.pg.sql"
+
+# gzip level for flat files (9 costs ~3x the CPU for a few % smaller files)
+GZIP_LEVEL = 6
+
+_INSERT_STATEMENT = re.compile(
+    r"^\s*INSERT\s+INTO\s+(\w+)\s*\(([^)]*)\)", re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=None)
+def parse_insert(query: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Extract (table, columns) from an "INSERT INTO table (cols) ..." query.
+
+    Returns:
+        Optional[Tuple[str, Tuple[str, ...]]]: None for any other statement
+    """
+    match = _INSERT_STATEMENT.match(query)
+    if match is None:
+        return None
+
+    columns = tuple(
+        column.strip() for column in match.group(2).split(",") if column.strip()
+    )
+    return match.group(1), columns
+
+
+@lru_cache(maxsize=None)
+def insert_query(table: str, columns: Tuple[str, ...]) -> str:
+    """
+    Build the parameterized INSERT of a table/column list.
+    """
+    placeholders = ", ".join("?" for _ in columns)
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+class Sink:
+    """
+    Destination for generated row batches.
+
+    Generators keep writing through utils.db.execute_many(); when the
+    connection carries a sink, each batch is handed to it as
+    write(table, columns, rows) instead of being inserted directly.
+    """
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteSink(Sink):
+    """
+    Insert batches into the SQLite connection (honours bulk-load mode).
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        self.conn.executemany(insert_query(table, tuple(columns)), rows)
+
+        if not getattr(self.conn, "bulk_load", False):
+            self.conn.commit()
+
+
+class FileSink(Sink):
+    """
+    Base for streaming flat-file sinks: one file per table under `directory`,
+    opened on its first batch and appended to until close().
+    """
+
+    extension = ""
+
+    def __init__(self, directory: str, compress: bool = False):
+        self.directory = Path(directory)
+        self.compress = compress
+        self._files = {}
+
+    def _open(self, table: str):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{table}.{self.extension}"
+
+        if self.compress:
+            return gzip.open(
+                f"{path}.gz",
+                "wt",
+                encoding="utf-8",
+                newline="",
+                compresslevel=GZIP_LEVEL,
+            )
+        return open(path, "w", encoding="utf-8", newline="")
+
+    def _file(self, table: str, columns: Sequence[str]):
+        handle = self._files.get(table)
+        if handle is None:
+            handle = self._files[table] = self._start_table(
+                self._open(table), table, columns
+            )
+        return handle
+
+    def _start_table(self, f, table: str, columns: Sequence[str]):
+        return f
+
+    def close(self):
+        for handle in self._files.values():
+            getattr(handle, "file", handle).close()
+        if self._files:
+            logger.info(
+                f"Wrote {len(self._files)} {self.extension} files to {self.directory}"
+            )
+        self._files = {}
+
+
+class _CSVTable:
+    __slots__ = ("file", "writer", "bool_columns")
+
+    def __init__(self, f, columns):
+        self.file = f
+        self.writer = csv.writer(f)
+        self.writer.writerow(columns)
+        self.bool_columns = None
+
+
+class CSVSink(FileSink):
+    """
+    Stream batches to <table>.csv[.gz] with a header row.
+
+    NULLs are written as empty fields and booleans as 1/0, matching what
+    SQLite stores.
+    """
+
+    extension = "csv"
+
+    def _start_table(self, f, table: str, columns: Sequence[str]):
+        return _CSVTable(f, columns)
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        if not rows:
+            return
+
+        handle = self._file(table, columns)
+
+        if handle.bool_columns is None:
+            handle.bool_columns = [
+                i for i, value in enumerate(rows[0]) if isinstance(value, bool)
+            ]
+
+        if handle.bool_columns:
+            bool_columns = handle.bool_columns
+            rows = [
+                tuple(
+                    int(value) if i in bool_columns and value is not None else value
+                    for i, value in enumerate(row)
+                )
+                for row in rows
+            ]
+
+        handle.writer.writerows(rows)
+
+
+class NDJSONSink(FileSink):
+    """
+    Stream batches to <table>.ndjson[.gz], one JSON object per row.
+    """
+
+    extension = "ndjson"
+
+    _encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        if not rows:
+            return
+
+        f = self._file(table, columns)
+        encode = self._encode
+
+        f.write("\n".join(encode(dict(zip(columns, row))) for row in rows))
+        f.write("\n")
+
+
+class FanOutSink(Sink):
+    """
+    Write every batch to several sinks, in order.
+    """
+
+    def __init__(self, sinks: List[Sink]):
+        self.sinks = list(sinks)
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]):
+        for sink in self.sinks:
+            sink.write(table, columns, rows)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def parse_sink_names(value: str) -> List[str]:
+    """
+    Parse a comma-separated OUTPUT_SINKS value.
+
+    Raises:
+        ValueError: On an unknown sink name or an empty list
+    """
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+
+    if not names:
+        raise ValueError("OUTPUT_SINKS must name at least one sink")
+
+    unknown = [name for name in names if name not in SINK_TYPES]
+    if unknown:
+        raise ValueError(
+            f"Unknown output sink(s) {unknown}; expected {list(SINK_TYPES)}"
+        )
+
+    return names
+
+
+def open_sinks(conn, config: dict) -> Sink:
+    """
+    Build the sink (or fan-out of sinks) configured by OUTPUT_SINKS.
+
+    Args:
+        conn: SQLite connection (used by the sqlite sink)
+        config (dict): Configuration values
+
+    Returns:
+        Sink: A single sink, or a FanOutSink over all configured ones
+    """
+
+    directory = config.get("output_dir", "output/export")
+    compress = config.get("output_gzip", False)
+
+    sinks = []
+    for name in parse_sink_names(config.get("output_sinks", SQLITE_SINK)):
+        if name == SQLITE_SINK:
+            sinks.append(SQLiteSink(conn))
+        elif name == CSV_SINK:
+            sinks.append(CSVSink(directory, compress))
+        elif name == NDJSON_SINK:
+            sinks.append(NDJSONSink(directory, compress))
+        elif name == POSTGRES_SINK:
+            from utils.pgdump import PostgresDumpSink
+
+            sinks.append(
+                PostgresDumpSink(conn, Path(directory) / POSTGRES_DUMP_FILE)
+            )
+        else:
+            # Optional dependency, only imported when requested
+            from utils.columnar import ParquetSink
+
+            sinks.append(
+                ParquetSink(
+                    conn,
+                    directory,
+                    config.get("parquet_compression", "zstd"),
+                )
+            )
+
+    return sinks[0] if len(sinks) == 1 else FanOutSink(sinks)
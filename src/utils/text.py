@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from loguru import logger
+
+
+# Bump when the compiled layout changes (invalidates cached tables)
+COMPILED_FORMAT = 1
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Refill the random word once fewer than this many outcomes are left in it
+_MIN_ROOM = 1 << 16
+
+_REFERENCE = re.compile(r"\{(\w+)\}")
+
+
+def grammar_digest(grammar: dict, contexts: Sequence[str], slots: Sequence[str]) -> str:
+    """
+    Return the digest that identifies a grammar's compiled tables.
+    """
+    material = json.dumps(
+        [COMPILED_FORMAT, grammar, list(contexts), list(slots)],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _resolve(grammar: dict, context: str, name: str, slots: Sequence[str]):
+    """Map a {name} reference to its grammar key, or its slot position."""
+    scoped = f"{context}.{name}"
+    if scoped in grammar:
+        return scoped
+    if name in grammar:
+        return name
+    if name in slots:
+        return -1 - list(slots).index(name)
+    raise ValueError(f"Undefined symbol {{{name}}} in context {context!r}")
+
+
+def _compile_context(grammar: dict, context: str, slots: Sequence[str]) -> dict:
+    """
+    Compile the grammar as seen from one context (e.g. a project type).
+    """
+    ids = {}
+    symbols = []
+
+    def intern(key: str, path: tuple) -> int:
+        if key in path:
+            raise ValueError(f"Recursive grammar: {' -> '.join(path + (key,))}")
+        if key in ids:
+            return ids[key]
+
+        # Reserve the id before compiling, so references can point at it
+        symbol_id = ids[key] = len(symbols)
+        symbols.append(None)
+
+        alternatives = []
+        for template in grammar[key]:
+            parts = []
+            for i, piece in enumerate(_REFERENCE.split(template)):
+                if i % 2 == 0:
+                    if piece:
+                        # Merge with a preceding literal
+                        if parts and isinstance(parts[-1], str):
+                            parts[-1] += piece
+                        else:
+                            parts.append(piece)
+                    continue
+
+                target = _resolve(grammar, context, piece, slots)
+                parts.append(
+                    target if isinstance(target, int) else intern(target, path + (key,))
+                )
+
+            if len(parts) == 1 and isinstance(parts[0], str):
+                alternatives.append(parts[0])
+            else:
+                # Rendered from a stack, so stored last part first
+                alternatives.append(parts[::-1])
+
+        symbols[symbol_id] = alternatives
+        return symbol_id
+
+    roots = {}
+    for key in grammar:
+        if "." not in key:
+            roots[key] = intern(_resolve(grammar, context, key, ()), ())
+
+    return {"symbols": symbols, "roots": roots}
+
+
+def compile_grammar(
+    grammar: dict,
+    contexts: Sequence[str],
+    slots: Sequence[str] = (),
+) -> dict:
+    """
+    Compile a template grammar into flat, JSON-serializable tables.
+
+    A grammar maps symbol names to lists of alternative templates, in
+    which {name} refers to another symbol or to a runtime slot. Symbols
+    named "<context>.<name>" override <name> within that context, so one
+    grammar yields per-context text (e.g. per project type). Compiling
+    resolves every reference for every context, interns symbols to
+    integer ids and pre-parses templates, so rendering does no string
+    parsing or lookups.
+
+    Args:
+        grammar (dict): Symbol -> list of template strings
+        contexts (Sequence[str]): Contexts to compile
+        slots (Sequence[str]): Runtime slot names, filled per call
+
+    Returns:
+        dict: Compiled tables (see TextEngine)
+
+    Raises:
+        ValueError: On undefined or recursive symbols
+    """
+    return {
+        "digest": grammar_digest(grammar, contexts, slots),
+        "slots": list(slots),
+        "contexts": {
+            context: _compile_context(grammar, context, slots)
+            for context in contexts
+        },
+    }
+
+
+def _mix(state: int) -> int:
+    """SplitMix64 output function."""
+    z = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+class TextEngine:
+    """
+    Renders texts from compiled grammar tables.
+
+    A text is a pure function of (context, root, key, slots): choices are
+    drawn from a SplitMix64 stream seeded with the 64-bit key, several
+    choices per 64-bit word, so rendering needs no Random object and any
+    text can be regenerated from its key alone.
+
+    Args:
+        compiled (dict): Output of compile_grammar()
+    """
+
+    def __init__(self, compiled: dict):
+        self.digest = compiled["digest"]
+        self.slots = tuple(compiled["slots"])
+        self._contexts = {}
+
+        for context, tables in compiled["contexts"].items():
+            symbols = [
+                [alt if isinstance(alt, str) else tuple(alt) for alt in alts]
+                for alts in tables["symbols"]
+            ]
+            self._contexts[context] = (symbols, dict(tables["roots"]))
+
+    @property
+    def contexts(self) -> list:
+        return list(self._contexts)
+
+    def render(self, context: str, root: str, key: int, *slots) -> str:
+        """
+        Render one text.
+
+        Args:
+            context (str): Compiled context (e.g. project type)
+            root (str): Root symbol (e.g. "description")
+            key (int): 64-bit key; equal keys give equal texts
+            *slots: Values of the runtime slots, in compile order
+
+        Returns:
+            str: The text
+        """
+        symbols, roots = self._contexts[context]
+
+        out = []
+        append = out.append
+        stack = [roots[root]]
+        pop = stack.pop
+        extend = stack.extend
+
+        state = key & _MASK
+        bits = room = 0
+
+        while stack:
+            part = pop()
+
+            if part.__class__ is str:
+                append(part)
+                continue
+            if part < 0:
+                append(slots[-1 - part])
+                continue
+
+            alternatives = symbols[part]
+            n = len(alternatives)
+
+            if n == 1:
+                alternative = alternatives[0]
+            else:
+                if room < _MIN_ROOM:
+                    state = (state + _GOLDEN) & _MASK
+                    bits = _mix(state)
+                    room = 1 << 64
+                alternative = alternatives[bits % n]
+                bits //= n
+                room //= n
+
+            if alternative.__class__ is str:
+                append(alternative)
+            else:
+                extend(alternative)
+
+        return "".join(out)
+
+    def render_many(
+        self,
+        context: str,
+        root: str,
+        keys: Iterable[int],
+        slot_rows: Iterable[tuple] = None,
+    ) -> list:
+        """
+        Render one text per key (with slot_rows[i] as the slots of key i).
+        """
+        render = self.render
+        if slot_rows is None:
+            return [render(context, root, key) for key in keys]
+        return [
+            render(context, root, key, *slots)
+            for key, slots in zip(keys, slot_rows)
+        ]
+
+
+def load_text_engine(
+    grammar: dict,
+    contexts: Sequence[str],
+    slots: Sequence[str],
+    path: Path,
+) -> TextEngine:
+    """
+    Load the compiled tables of a grammar from path, compiling (and
+    caching) them when the file is missing or was built from a different
+    grammar.
+
+    Args:
+        grammar (dict): Symbol -> list of template strings
+        contexts (Sequence[str]): Contexts to compile
+        slots (Sequence[str]): Runtime slot names
+        path (Path): Cached compiled tables
+
+    Returns:
+        TextEngine: Engine over the compiled tables
+    """
+    path = Path(path)
+    digest = grammar_digest(grammar, contexts, slots)
+
+    compiled = None
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                compiled = json.load(f)
+        except ValueError:
+            compiled = None
+
+    if compiled is None or compiled.get("digest") != digest:
+        logger.info(f"Compiling text grammar into {path.name}")
+        compiled = compile_grammar(grammar, contexts, slots)
+
+        # Written to a temporary file of this process and renamed into
+        # place, so workers compiling at the same time never collide
+        partial = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=path.parent,
+                prefix=f"{path.name}.",
+                suffix=".partial",
+                delete=False,
+            ) as f:
+                partial = f.name
+                json.dump(compiled, f, ensure_ascii=False, separators=(",", ":"))
+            # NamedTemporaryFile creates the file 0600; the cache is
+            # shared by every user running the generator
+            os.chmod(partial, 0o644)
+            os.replace(partial, path)
+        except OSError as e:
+            if partial is not None:
+                Path(partial).unlink(missing_ok=True)
+            logger.warning(f"Could not cache compiled grammar at {path}: {e}")
+
+    return TextEngine(compiled)
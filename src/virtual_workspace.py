@@ -0,0 +1,282 @@
+from functools import lru_cache
+
+from generators.activity import prepare_task, simulate_project
+from generators.comments import build_comments
+from generators.custom_fields import build_custom_fields
+from generators.organizations import build_organization
+from generators.projects import build_project
+from generators.sections import DEFAULT_SECTIONS, project_section_ids
+from generators.subtasks import build_subtasks
+from generators.tags import build_task_tags, tag_id_map
+from generators.tasks import activity_window, build_task
+from generators.teams import BOUNDED_MODEL, build_team, draw_memberships
+from generators.users import build_user
+from utils.dates import iso_timestamp
+from utils.graph import IdView
+from utils.random import EntityIds
+
+
+ORGANIZATION_COLUMNS = ("org_id", "name", "domain", "created_at")
+USER_COLUMNS = (
+    "user_id", "org_id", "full_name", "email", "role", "joined_at",
+)
+TEAM_COLUMNS = ("team_id", "org_id", "name", "created_at")
+PROJECT_COLUMNS = (
+    "project_id", "team_id", "name", "project_type", "created_at", "due_date",
+)
+SECTION_COLUMNS = ("section_id", "project_id", "name", "position")
+TASK_COLUMNS = (
+    "task_id", "project_id", "section_id", "assignee_id", "name",
+    "description", "due_date", "completed", "created_at", "completed_at",
+)
+SUBTASK_COLUMNS = (
+    "subtask_id", "parent_task_id", "assignee_id", "name", "completed",
+    "created_at", "completed_at",
+)
+COMMENT_COLUMNS = ("comment_id", "task_id", "user_id", "body", "created_at")
+ACTIVITY_EVENT_COLUMNS = (
+    "task_id", "event_type", "actor_id", "section_id", "assignee_id",
+    "occurred_at",
+)
+CUSTOM_FIELD_COLUMNS = ("field_id", "project_id", "name", "field_type")
+CUSTOM_FIELD_VALUE_COLUMNS = ("field_id", "task_id", "value")
+
+
+class VirtualWorkspace:
+    """
+    Lazy, random-access view of the workspace main() generates for a config.
+
+    Nothing is built up front: every entity is materialized on access from
+    its own keyed random stream, so task #N costs O(1) however large the
+    workspace is. For the same config and reference time, each entity
+    matches the row written to SQLite by the generation pipeline.
+
+    Args:
+        config (dict): Configuration values (as returned by load_config)
+        cache_size (int): Recently materialized entities kept per kind
+    """
+
+    def __init__(self, config: dict, cache_size: int = 4096):
+        self.config = config
+        self.seed = config["random_seed"]
+
+        self.projects_per_team = config["projects_per_team"]
+        self.tasks_per_project = config["tasks_per_project"]
+
+        self.num_users = config["num_users"]
+        self.num_teams = config["num_teams"]
+        self.num_projects = self.num_teams * self.projects_per_team
+        self.num_tasks = self.num_projects * self.tasks_per_project
+
+        self.org_id = build_organization(config)[0]
+        self.user_ids = EntityIds(self.seed, "user", self.num_users)
+        self.team_ids = EntityIds(self.seed, "team", self.num_teams)
+        self.project_ids = EntityIds(self.seed, "project", self.num_projects)
+        self.task_ids = EntityIds(self.seed, "task", self.num_tasks)
+        self.tag_ids = tag_id_map(self.seed)
+
+        self._user = lru_cache(cache_size)(self._build_user)
+        self._team = lru_cache(cache_size)(self._build_team)
+        self._project = lru_cache(cache_size)(self._build_project)
+        self._task = lru_cache(cache_size)(self._build_task)
+        self._team_members = None
+        self._user_teams = None
+
+    # -----------------
+    # Index arithmetic
+    # -----------------
+    @staticmethod
+    def _check(index: int, count: int, kind: str) -> int:
+        if not 0 <= index < count:
+            raise IndexError(f"{kind} index {index} out of range")
+        return index
+
+    def project_index_of_task(self, task_index: int) -> int:
+        """Return the index of the project owning task #task_index."""
+        return task_index // self.tasks_per_project
+
+    def team_index_of_project(self, project_index: int) -> int:
+        """Return the index of the team owning project #project_index."""
+        return project_index // self.projects_per_team
+
+    # --------
+    # Builders
+    # --------
+    def _build_user(self, index: int) -> tuple:
+        return build_user(index, self.org_id, self.config)
+
+    def _build_team(self, index: int) -> tuple:
+        return build_team(index, self.org_id, self.num_users, self.config)
+
+    def _build_project(self, index: int) -> tuple:
+        team_id = self.team_ids[self.team_index_of_project(index)]
+        return build_project(index, team_id, self.config)
+
+    def _memberships(self) -> tuple:
+        # Both CSR directions, drawn once on first use
+        if self._team_members is None:
+            self._team_members = draw_memberships(
+                self.num_users, self.num_teams, self.config
+            )
+            self._user_teams = self._team_members.transpose(self.num_users)
+        return self._team_members, self._user_teams
+
+    def _member_indices(self, team_index: int):
+        if self.config.get("membership_model") == BOUNDED_MODEL:
+            return self._memberships()[0][team_index]
+        # Fraction model: the team's own stream, O(1) per team
+        return self._team(team_index)[1]
+
+    def _assignees(self, team_index: int):
+        # Same pool as WorkspaceGraph.assignees()
+        members = self._member_indices(team_index)
+        return IdView(self.user_ids, members) if members else self.user_ids
+
+    def _build_task(self, index: int) -> tuple:
+        # (row, *state); see build_task
+        project_index = self.project_index_of_task(index)
+        return build_task(
+            index,
+            self.project_ids[project_index],
+            self._project(project_index)[3],
+            project_section_ids(self.seed, project_index),
+            self._assignees(self.team_index_of_project(project_index)),
+            self.config,
+            with_state=True,
+        )
+
+    def _comments(self, task_index: int) -> list:
+        # build_comments() with state, for a checked task index
+        row, created_at, completed_at = self._task(task_index)[:3]
+        return build_comments(
+            task_index,
+            row[0],
+            self._project(self.project_index_of_task(task_index))[3],
+            activity_window(created_at, completed_at),
+            self.user_ids,
+            self.config,
+            with_state=True,
+        )
+
+    # ---------------
+    # Entity accessors
+    # ---------------
+    def organization(self) -> dict:
+        return dict(zip(ORGANIZATION_COLUMNS, build_organization(self.config)))
+
+    def user(self, index: int) -> dict:
+        self._check(index, self.num_users, "user")
+        return dict(zip(USER_COLUMNS, self._user(index)))
+
+    def team(self, index: int) -> dict:
+        self._check(index, self.num_teams, "team")
+        return dict(zip(TEAM_COLUMNS, self._team(index)[0]))
+
+    def team_members(self, index: int) -> list:
+        """Return the user IDs of team #index."""
+        self._check(index, self.num_teams, "team")
+        return [self.user_ids[i] for i in self._member_indices(index)]
+
+    def user_teams(self, index: int) -> list:
+        """Return the team IDs user #index belongs to."""
+        self._check(index, self.num_users, "user")
+        return [self.team_ids[i] for i in self._memberships()[1][index]]
+
+    def project(self, index: int) -> dict:
+        self._check(index, self.num_projects, "project")
+        return dict(zip(PROJECT_COLUMNS, self._project(index)))
+
+    def sections(self, project_index: int) -> list:
+        self._check(project_index, self.num_projects, "project")
+        project_id = self.project_ids[project_index]
+        section_ids = project_section_ids(self.seed, project_index)
+
+        return [
+            dict(zip(SECTION_COLUMNS, (section_id, project_id, name, position)))
+            for position, (section_id, name) in enumerate(
+                zip(section_ids, DEFAULT_SECTIONS), start=1
+            )
+        ]
+
+    def task(self, index: int) -> dict:
+        self._check(index, self.num_tasks, "task")
+        return dict(zip(TASK_COLUMNS, self._task(index)[0]))
+
+    def project_tasks(self, project_index: int):
+        """Lazily yield the tasks of project #project_index."""
+        self._check(project_index, self.num_projects, "project")
+        first = project_index * self.tasks_per_project
+
+        for index in range(first, first + self.tasks_per_project):
+            yield self.task(index)
+
+    def subtasks(self, task_index: int) -> list:
+        self._check(task_index, self.num_tasks, "task")
+        rows = build_subtasks(
+            task_index, self.task_ids[task_index], self.user_ids, self.config
+        )
+        return [dict(zip(SUBTASK_COLUMNS, row)) for row in rows]
+
+    def comments(self, task_index: int) -> list:
+        self._check(task_index, self.num_tasks, "task")
+        rows = self._comments(task_index)
+        return [dict(zip(COMMENT_COLUMNS, row)) for row, _, _ in rows]
+
+    def activity(self, task_index: int) -> list:
+        """
+        Return the activity events of task #task_index (ACTIVITY_EVENTS),
+        without event_id, in time order.
+        """
+        self._check(task_index, self.num_tasks, "task")
+        project_index = self.project_index_of_task(task_index)
+        section_ids = project_section_ids(self.seed, project_index)
+        members = self._assignees(self.team_index_of_project(project_index))
+        row, created_at, completed_at, _, section, assignee = self._task(task_index)
+
+        events = simulate_project(
+            [
+                prepare_task(
+                    row[0],
+                    task_index,
+                    activity_window(created_at, completed_at),
+                    completed_at,
+                    [
+                        (comment[2], posted_at)
+                        for comment, posted_at, _ in self._comments(task_index)
+                    ],
+                    section,
+                    members[assignee] if assignee is not None else None,
+                    members,
+                    self.config,
+                )
+            ],
+            section_ids,
+            members,
+        )
+        return [
+            dict(zip(ACTIVITY_EVENT_COLUMNS, event[:5] + (iso_timestamp(event[5]),)))
+            for event in events
+        ]
+
+    def task_tags(self, task_index: int) -> list:
+        """Return the tag names attached to task #task_index."""
+        self._check(task_index, self.num_tasks, "task")
+        return build_task_tags(task_index, self.config)
+
+    def custom_fields(self, project_index: int) -> tuple:
+        """
+        Return (field definitions, field values) of project #project_index.
+        """
+        self._check(project_index, self.num_projects, "project")
+        first = project_index * self.tasks_per_project
+        field_rows, value_rows = build_custom_fields(
+            project_index,
+            self.project_ids[project_index],
+            self._project(project_index)[3],
+            self.task_ids[first:first + self.tasks_per_project],
+            self.config,
+        )
+        return (
+            [dict(zip(CUSTOM_FIELD_COLUMNS, row)) for row in field_rows],
+            [dict(zip(CUSTOM_FIELD_VALUE_COLUMNS, row)) for row in value_rows],
+        )
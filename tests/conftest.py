@@ -0,0 +1,86 @@
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+
+# Tiny workspace, every setting pinned so a local .env cannot leak in
+SETTINGS = {
+    "NUM_USERS": "30",
+    "NUM_TEAMS": "3",
+    "PROJECTS_PER_TEAM": "2",
+    "TASKS_PER_PROJECT": "12",
+    "SUBTASK_RATIO": "0.3",
+    "MEMBERSHIP_MODEL": "fraction",
+    "HISTORY_DAYS": "180",
+    "REFERENCE_TIME": "2026-01-01T00:00:00",
+    "RANDOM_SEED": "7",
+    "BATCH_SIZE": "5",
+    "WORKERS": "1",
+    "STORAGE_PROFILE": "standard",
+    "GENERATION_BACKEND": "python",
+    "LOAD_MODE": "standard",
+    "PROMETHEUS_PATH": "",
+    "OUTPUT_SINKS": "sqlite",
+    "CHECKPOINTS": "true",
+    "RESUME": "false",
+    "ACTIVITY_EVENTS": "true",
+    "ADVANCE_DAYS": "0",
+    "IN_MEMORY": "false",
+    "NUM_ORGS": "1",
+}
+
+
+@pytest.fixture
+def generate(tmp_path, monkeypatch):
+    """
+    Return generate(name, **settings): runs main() into tmp_path/<name>.sqlite
+    and returns the database path.
+    """
+    import main
+
+    def run(name: str, **settings) -> Path:
+        db_path = tmp_path / f"{name}.sqlite"
+        env = {
+            **SETTINGS,
+            "DB_PATH": str(db_path),
+            "RUN_REPORT_PATH": str(tmp_path / f"{name}.report.json"),
+            "OUTPUT_DIR": str(tmp_path / f"{name}.export"),
+            **{key.upper(): str(value) for key, value in settings.items()},
+        }
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+
+        main.main()
+        return db_path
+
+    return run
+
+
+def dump(db_path) -> dict:
+    """
+    Return every table's rows, in insertion order (primary key order for
+    the compact profile's WITHOUT ROWID tables).
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = [
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )
+        ]
+        rows = {}
+        for table in tables:
+            try:
+                query = f"SELECT * FROM {table} ORDER BY rowid"
+                rows[table] = conn.execute(query).fetchall()
+            except sqlite3.OperationalError:
+                rows[table] = conn.execute(f"SELECT * FROM {table}").fetchall()
+        return rows
+    finally:
+        conn.close()
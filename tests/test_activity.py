@@ -0,0 +1,79 @@
+import sqlite3
+from collections import defaultdict
+
+import pytest
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_activity_events_end_in_the_generated_task_state(generate, backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    conn = sqlite3.connect(generate("activity", generation_backend=backend))
+
+    events = defaultdict(list)
+    for row in conn.execute(
+        "SELECT task_id, event_type, section_id, assignee_id, occurred_at "
+        "FROM activity_events ORDER BY occurred_at, event_id"
+    ):
+        events[row[0]].append(row[1:])
+
+    comments = defaultdict(int)
+    for (task_id,) in conn.execute("SELECT task_id FROM comments"):
+        comments[task_id] += 1
+
+    tasks = conn.execute(
+        "SELECT task_id, section_id, assignee_id, completed, created_at, "
+        "completed_at FROM tasks"
+    ).fetchall()
+    conn.close()
+
+    assert len(events) == len(tasks)
+
+    for task_id, section_id, assignee_id, completed, created_at, completed_at in tasks:
+        history = events[task_id]
+        kinds = [event[0] for event in history]
+
+        assert history[0][0] == "created"
+        assert history[0][3] == created_at
+
+        # The last move and the last (un)assignment land on the task's row
+        moves = [event for event in history if event[0] == "section_changed"]
+        if moves:
+            assert moves[-1][1] == section_id
+        assignments = [
+            event for event in history if event[0] in ("assigned", "unassigned")
+        ]
+        if assignments:
+            assert assignments[-1][2] == assignee_id
+        assert history[-1][1:3] == (section_id, assignee_id)
+
+        assert kinds.count("commented") == comments[task_id]
+        if completed:
+            assert history[-1][0] == "completed"
+            assert history[-1][3] == completed_at
+        else:
+            assert "completed" not in kinds
+
+
+def test_activity_log_is_in_time_order_within_each_project(generate):
+    conn = sqlite3.connect(generate("order", workers="2"))
+    events = conn.execute(
+        "SELECT t.project_id, e.occurred_at FROM activity_events e "
+        "JOIN tasks t ON t.task_id = e.task_id ORDER BY e.event_id"
+    ).fetchall()
+    project_order = [
+        row[0] for row in conn.execute("SELECT project_id FROM projects ORDER BY rowid")
+    ]
+    conn.close()
+
+    # One contiguous block per project, in project order
+    blocks = [
+        project_id
+        for i, (project_id, _) in enumerate(events)
+        if i == 0 or events[i - 1][0] != project_id
+    ]
+    assert blocks == project_order
+
+    for i in range(1, len(events)):
+        if events[i][0] == events[i - 1][0]:
+            assert events[i - 1][1] <= events[i][1]
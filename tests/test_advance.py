@@ -0,0 +1,94 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+from conftest import dump
+
+# A short history raises the daily rates, so a few days have every event
+BUSY = {"history_days": 10}
+
+
+def _without(tables: dict, *names) -> dict:
+    return {table: rows for table, rows in tables.items() if table not in names}
+
+
+def test_advance_logs_each_day_and_appends_only_the_delta(generate):
+    db_path = generate("advanced", **BUSY)
+    before = dump(db_path)
+    generate("advanced", **BUSY, advance_days=3)
+    after = dump(db_path)
+
+    clock = after["simulation_clock"]
+    assert [row[0] for row in clock] == [1, 2, 3]
+    start = datetime(2026, 1, 1)
+    for day, start_time, end_time, *_ in clock:
+        assert start_time == (start + timedelta(days=day - 1)).isoformat()
+        assert end_time == (start + timedelta(days=day)).isoformat()
+
+    tasks, completed, subtasks, comments = map(sum, zip(*(row[3:] for row in clock)))
+    assert len(after["tasks"]) - len(before["tasks"]) == tasks
+    assert len(after["subtasks"]) - len(before["subtasks"]) == subtasks
+    assert len(after["comments"]) - len(before["comments"]) == comments
+    assert tasks and comments
+
+    # Earlier rows only change by completing open tasks
+    assert after["comments"][: len(before["comments"])] == before["comments"]
+    newly_completed = 0
+    for old, new in zip(before["tasks"], after["tasks"]):
+        if old != new:
+            assert not old[7] and new[7]
+            assert old[:7] + old[8:9] == new[:7] + new[8:9]
+            assert new[9] > "2026-01-01T00:00:00"
+            newly_completed += 1
+    assert 0 < newly_completed <= completed
+
+
+def test_advancing_in_steps_matches_one_advance(generate):
+    generate("steps", **BUSY)
+    generate("steps", **BUSY, advance_days=3)
+    steps = generate("steps", **BUSY, advance_days=4)
+
+    generate("whole", **BUSY)
+    whole = generate("whole", **BUSY, advance_days=7)
+
+    assert _without(dump(steps), "simulation_clock") == _without(
+        dump(whole), "simulation_clock"
+    )
+
+    steps_clock = dump(steps)["simulation_clock"]
+    whole_clock = dump(whole)["simulation_clock"]
+    assert [row[0] for row in steps_clock] == list(range(1, 8))
+    assert [row[3:] for row in steps_clock] == [row[3:] for row in whole_clock]
+
+
+def test_advance_logs_events_for_workspaces_that_have_them(generate):
+    with_events = generate("events", **BUSY, activity_events="true")
+    last_event_id = sqlite3.connect(with_events).execute(
+        "SELECT MAX(event_id) FROM activity_events"
+    ).fetchone()[0]
+    # The advance run's ACTIVITY_EVENTS does not decide it
+    generate("events", **BUSY, activity_events="false", advance_days=2)
+
+    without_events = generate("no_events", **BUSY, activity_events="false")
+    generate("no_events", **BUSY, activity_events="true", advance_days=2)
+
+    conn = sqlite3.connect(with_events)
+    new_events = conn.execute(
+        "SELECT event_id, event_type, actor_id FROM activity_events "
+        "WHERE event_id > ? ORDER BY event_id",
+        (last_event_id,),
+    ).fetchall()
+    conn.close()
+
+    assert new_events[0][0] == last_event_id + 1
+    assert [row[0] for row in new_events] == list(
+        range(last_event_id + 1, last_event_id + 1 + len(new_events))
+    )
+    assert {"created", "completed", "commented"} <= {row[1] for row in new_events}
+    assert all(row[2] is not None for row in new_events)
+
+    assert dump(without_events)["activity_events"] == []
+
+    # Logging events takes no draws: every other table is the same
+    assert _without(dump(with_events), "activity_events") == _without(
+        dump(without_events), "activity_events"
+    )
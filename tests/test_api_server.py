@@ -0,0 +1,143 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from aiohttp.test_utils import TestClient, TestServer  # noqa: E402
+
+from api_server import API_PREFIX, create_app  # noqa: E402
+
+
+def _serve(db_path, scenario):
+    """Run scenario(client) against an API server over db_path."""
+
+    async def run():
+        app = create_app(db_path, pool_size=2)
+        async with TestClient(TestServer(app)) as client:
+            return await scenario(client)
+
+    return asyncio.run(run())
+
+
+def _first_project(db_path) -> str:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(
+            "SELECT project_id FROM tasks GROUP BY project_id "
+            "ORDER BY COUNT(*) DESC LIMIT 1"
+        ).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_keyset_pages_stay_consistent_across_writes(generate):
+    db_path = generate("api")
+    project_id = _first_project(db_path)
+    path = f"{API_PREFIX}/projects/{project_id}/tasks"
+
+    conn = sqlite3.connect(db_path)
+    expected = [
+        row[0]
+        for row in conn.execute(
+            "SELECT task_id FROM tasks WHERE project_id = ? ORDER BY task_id",
+            (project_id,),
+        )
+    ]
+
+    async def scenario(client):
+        seen, offset, pages = [], None, 0
+        while True:
+            params = {"limit": "5", **({"offset": offset} if offset else {})}
+            response = await client.get(path, params=params)
+            assert response.status == 200
+            document = await response.json()
+            seen += [item["gid"] for item in document["data"]]
+            pages += 1
+
+            if pages == 1:
+                # A task sorting before the next page does not shift it
+                conn.execute(
+                    "INSERT INTO tasks (task_id, project_id, name, created_at) "
+                    "VALUES ('00000000-0000-4000-8000-000000000000', ?, 'New', "
+                    "'2026-01-01T00:00:00')",
+                    (project_id,),
+                )
+                conn.commit()
+
+            if document["next_page"] is None:
+                break
+            offset = document["next_page"]["offset"]
+            assert document["next_page"]["path"].startswith("/projects/")
+
+        invalid = await client.get(path, params={"offset": "bm9wZQ"})
+        assert invalid.status == 400
+        assert "offset" in (await invalid.json())["errors"][0]["message"]
+
+        return seen, pages
+
+    seen, pages = _serve(db_path, scenario)
+    conn.close()
+
+    assert seen == expected
+    assert pages == -(-len(expected) // 5)
+
+
+def test_opt_fields_select_the_returned_fields(generate):
+    db_path = generate("api")
+    path = f"{API_PREFIX}/projects/{_first_project(db_path)}/tasks"
+
+    async def scenario(client):
+        compact = await (await client.get(path, params={"limit": "1"})).json()
+        full = await (
+            await client.get(
+                path,
+                params={"limit": "1", "opt_fields": "name,tags.name,num_subtasks"},
+            )
+        ).json()
+        unknown = await client.get(path, params={"opt_fields": "name,colour"})
+        return compact, full, unknown.status
+
+    compact, full, unknown_status = _serve(db_path, scenario)
+
+    assert set(compact["data"][0]) == {"gid", "resource_type", "name"}
+    task = full["data"][0]
+    assert set(task) == {"gid", "resource_type", "name", "tags", "num_subtasks"}
+    assert isinstance(task["tags"], list)
+    assert isinstance(task["num_subtasks"], int)
+    assert unknown_status == 400
+
+
+def test_etags_answer_304_until_the_database_changes(generate):
+    db_path = generate("api")
+    project_id = _first_project(db_path)
+    path = f"{API_PREFIX}/projects/{project_id}"
+
+    async def scenario(client):
+        first = await client.get(path)
+        etag = first.headers["ETag"]
+        assert first.status == 200 and first.headers["X-Cache"] == "miss"
+
+        cached = await client.get(path, headers={"If-None-Match": etag})
+        assert cached.status == 304 and cached.headers["X-Cache"] == "hit"
+
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE projects SET name = 'Renamed' WHERE project_id = ?",
+            (project_id,),
+        )
+        conn.commit()
+        conn.close()
+
+        changed = await client.get(path, headers={"If-None-Match": etag})
+        assert changed.status == 200 and changed.headers["X-Cache"] == "miss"
+        assert changed.headers["ETag"] != etag
+        return (await changed.json())["data"]["name"]
+
+    assert _serve(db_path, scenario) == "Renamed"
+
+    # The server puts the database's journal mode back on shutdown
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    conn.close()
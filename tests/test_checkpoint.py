@@ -0,0 +1,111 @@
+import json
+import sqlite3
+from array import array
+
+import pytest
+
+from conftest import dump
+from utils.checkpoint import CHECKPOINT_TABLE, Checkpoints, config_digest
+from utils.graph import Adjacency, PackedUuids, WorkspaceGraph
+
+CONFIG = {"random_seed": 7, "num_users": 30, "workers": 1}
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE organizations (organization_id TEXT)")
+    yield conn
+    conn.close()
+
+
+def test_config_digest_ignores_runtime_settings():
+    assert config_digest(CONFIG) == config_digest({**CONFIG, "workers": 8})
+    assert config_digest(CONFIG) != config_digest({**CONFIG, "random_seed": 8})
+
+
+def test_state_round_trips_through_json(conn):
+    adjacency = Adjacency()
+    adjacency.add_row([2, 0])
+    adjacency.add_row([])
+    runs = Adjacency(contiguous=True)
+    runs.add_run(3)
+    state = {
+        "org_id": "0b6c5e0a-3f4d-4b7e-9a59-2f1c4bd2b6a1",
+        "_user_teams": None,
+        "user_ids": PackedUuids(
+            [
+                "0b6c5e0a-3f4d-4b7e-9a59-2f1c4bd2b6a1",
+                "ffffffff-0000-4000-8000-000000000001",
+            ]
+        ),
+        # Compact profile: integer keys are a range
+        "task_ids": range(1, 13),
+        "task_completed_at": array("q", [-1, 1767225600]),
+        "team_members": adjacency,
+        "project_tasks": runs,
+    }
+
+    Checkpoints(conn, CONFIG).record("users", state)
+
+    (stored,) = conn.execute(f"SELECT state FROM {CHECKPOINT_TABLE}").fetchone()
+    assert set(json.loads(stored)) == set(state)
+
+    graph = WorkspaceGraph()
+    resumed = Checkpoints(conn, CONFIG)
+    resumed.restore(graph)
+
+    assert resumed.is_complete("users") and not resumed.is_complete("teams")
+    assert graph.org_id == state["org_id"]
+    assert graph._user_teams is None
+    assert list(graph.user_ids) == list(state["user_ids"])
+    assert graph.task_ids == range(1, 13)
+    assert graph.task_completed_at == state["task_completed_at"]
+    assert [list(graph.team_members[i]) for i in range(2)] == [[2, 0], []]
+    assert graph.project_tasks.targets is None
+    assert list(graph.project_tasks[0]) == [0, 1, 2]
+
+
+def test_other_configuration_and_finished_runs_are_refused(conn):
+    Checkpoints(conn, CONFIG).record("users", {})
+
+    with pytest.raises(ValueError):
+        Checkpoints(conn, {**CONFIG, "random_seed": 8})
+
+    finished = sqlite3.connect(":memory:")
+    finished.execute("CREATE TABLE organizations (organization_id TEXT)")
+    finished.execute("INSERT INTO organizations VALUES ('org')")
+    with pytest.raises(ValueError):
+        Checkpoints(finished, CONFIG)
+    finished.close()
+
+
+@pytest.mark.parametrize("profile", ["standard", "compact"])
+def test_resumed_run_matches_uninterrupted_run(
+    generate, monkeypatch, tmp_path, profile
+):
+    import generators.activity
+
+    expected = dump(generate("uninterrupted", storage_profile=profile))
+
+    # Fail partway through the activity stage, after some projects landed
+    project_activity = generators.activity.project_activity
+
+    def interrupted(project_index, *args):
+        if project_index == 3:
+            raise RuntimeError("interrupted")
+        return project_activity(project_index, *args)
+
+    monkeypatch.setattr(generators.activity, "project_activity", interrupted)
+    with pytest.raises(SystemExit):
+        generate("resumed", storage_profile=profile)
+
+    conn = sqlite3.connect(tmp_path / "resumed.sqlite")
+    stages = {row[0] for row in conn.execute(f"SELECT stage FROM {CHECKPOINT_TABLE}")}
+    partial = conn.execute("SELECT COUNT(*) FROM activity_events").fetchone()[0]
+    conn.close()
+    assert "comments" in stages and "activity" not in stages
+    assert partial > 0
+
+    monkeypatch.setattr(generators.activity, "project_activity", project_activity)
+    assert dump(generate("resumed", storage_profile=profile, resume="true")) == expected
@@ -0,0 +1,59 @@
+import sqlite3
+from datetime import date, datetime
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from utils.columnar import ParquetSink, arrow_schema  # noqa: E402
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE tasks (task_id TEXT, name TEXT, description TEXT, "
+        "due_date DATE, completed BOOLEAN, created_at TIMESTAMP)"
+    )
+    conn.execute("CREATE TABLE tasks_compact (task_id INTEGER, name TEXT)")
+    yield conn
+    conn.close()
+
+
+def test_schema_dictionary_encodes_low_cardinality_text(conn):
+    schema = arrow_schema(
+        conn, "tasks", ("task_id", "name", "description", "due_date", "completed")
+    )
+
+    assert pa.types.is_dictionary(schema.field("name").type)
+    # Rendered texts are mostly unique: plain strings
+    assert schema.field("description").type == pa.string()
+    assert schema.field("task_id").type == pa.string()
+    assert schema.field("due_date").type == pa.date32()
+    assert schema.field("completed").type == pa.bool_()
+
+    compact = arrow_schema(conn, "tasks_compact", ("task_id", "name"))
+    assert compact.field("task_id").type == pa.int64()
+    assert pa.types.is_dictionary(compact.field("name").type)
+
+
+def test_parquet_sink_round_trips_rows(conn, tmp_path):
+    columns = ("task_id", "name", "description", "due_date", "completed", "created_at")
+    rows = [
+        ("a", "Fix bug", "First", "2026-01-02", True, "2026-01-01T10:00:00"),
+        ("b", "Fix bug", None, None, False, "2026-01-01T11:30:00"),
+    ]
+
+    sink = ParquetSink(conn, tmp_path, compression="none")
+    sink.write("tasks", columns, rows[:1])
+    sink.write("tasks", columns, rows[1:])
+    sink.write("tasks", columns, [])
+    sink.close()
+
+    table = pq.read_table(tmp_path / "tasks.parquet")
+    assert table.column_names == list(columns)
+    assert [tuple(row.values()) for row in table.to_pylist()] == [
+        ("a", "Fix bug", "First", date(2026, 1, 2), True, datetime(2026, 1, 1, 10)),
+        ("b", "Fix bug", None, None, False, datetime(2026, 1, 1, 11, 30)),
+    ]
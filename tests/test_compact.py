@@ -0,0 +1,58 @@
+import sqlite3
+
+from utils.compact import to_epoch, to_epoch_day
+
+
+def _tables(conn, kind: str) -> list:
+    return [
+        row[0]
+        for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = ? "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name",
+            (kind,),
+        )
+    ]
+
+
+def test_epoch_conversions():
+    assert to_epoch("1970-01-02T00:00:01") == 86401
+    assert to_epoch("2026-01-01T00:00:00.250000") == to_epoch("2026-01-01T00:00:00")
+    assert to_epoch(None) is None
+    assert to_epoch_day("1970-01-11") == 10
+
+
+def test_compact_views_return_the_standard_rows(generate):
+    standard = sqlite3.connect(generate("standard"))
+    compact = sqlite3.connect(generate("compact", storage_profile="compact"))
+
+    views = _tables(compact, "view")
+    assert set(views) >= {"users", "projects", "tasks", "comments", "activity_events"}
+
+    # Entity #i of a kind has the i-th UUID (insertion order) or key i + 1
+    keys = {}
+    for table in _tables(standard, "table"):
+        primary_key = [
+            column[1]
+            for column in standard.execute(f"PRAGMA table_info({table})")
+            if column[5]
+        ]
+        if len(primary_key) != 1:
+            continue
+        for key, (value,) in enumerate(
+            standard.execute(f"SELECT {primary_key[0]} FROM {table} ORDER BY rowid"),
+            start=1,
+        ):
+            if isinstance(value, str):
+                keys[value] = key
+
+    for view in views:
+        expected = sorted(
+            tuple(keys.get(value, value) for value in row)
+            for row in standard.execute(f"SELECT * FROM {view}")
+        )
+        actual = sorted(compact.execute(f"SELECT * FROM {view}").fetchall())
+
+        assert actual == expected, view
+
+    standard.close()
+    compact.close()
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+
+from conftest import dump
+from utils.episodes import EpisodePool, WorkspaceSnapshot
+
+
+def _task_count(conn) -> int:
+    return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+
+@pytest.mark.parametrize("method", ["deserialize", "backup"])
+def test_resets_are_isolated_from_each_other_and_the_snapshot(generate, method):
+    db_path = generate("episodes")
+    expected = dump(db_path)
+    snapshot = WorkspaceSnapshot.from_file(db_path)
+
+    first = snapshot.reset(method)
+    tasks = _task_count(first)
+    first.execute("DELETE FROM activity_events")
+    first.execute("DELETE FROM comments")
+    first.execute("UPDATE tasks SET completed = 1")
+    first.commit()
+
+    second = snapshot.reset(method)
+    assert _task_count(second) == tasks
+    assert second.execute("SELECT COUNT(*) FROM comments").fetchone()[0] > 0
+    assert second.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+    first.close()
+    second.close()
+    snapshot.close()
+
+    assert dump(db_path) == expected
+
+    with pytest.raises(ValueError):
+        snapshot.reset("copy")
+
+
+def test_wal_mode_databases_reset_to_writable_copies(generate, tmp_path):
+    db_path = generate("wal")
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode = WAL").fetchone()[0] == "wal"
+
+    snapshot = WorkspaceSnapshot.from_file(db_path)
+    episode = snapshot.reset()
+    episode.execute("UPDATE tasks SET completed = 0")
+    episode.commit()
+    episode.close()
+
+    # The WAL file alone may miss committed pages: clone() writes the image
+    assert snapshot.clone(tmp_path / "clone.sqlite") == "copy"
+    assert dump(tmp_path / "clone.sqlite") == dump(db_path)
+    conn.close()
+
+
+def test_episode_pool_hands_out_pristine_copies(generate):
+    snapshot = WorkspaceSnapshot.from_file(generate("pool"))
+    pool = EpisodePool(snapshot, size=2)
+
+    first = pool.acquire()
+    tasks = _task_count(first)
+    first.execute("DELETE FROM activity_events")
+    first.execute("DELETE FROM comments")
+    first.commit()
+
+    second = pool.acquire()
+    assert _task_count(second) == tasks
+    assert second.execute("SELECT COUNT(*) FROM comments").fetchone()[0] > 0
+
+    first.close()
+    second.close()
+    pool.close()
+
+    with pytest.raises(RuntimeError):
+        pool.acquire()
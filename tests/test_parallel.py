@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from conftest import dump
+from utils.dates import reference_epoch, set_reference_time
+from utils.parallel import iter_chunks, map_shards
+
+
+def _shard(shard, context):
+    return shard * context, reference_epoch()
+
+
+def test_iter_chunks_covers_every_item_once():
+    items = list(range(10))
+
+    chunks = list(iter_chunks(items, size=4))
+
+    assert chunks == [(0, [0, 1, 2, 3]), (4, [4, 5, 6, 7]), (8, [8, 9])]
+
+
+def test_map_shards_keeps_shard_order_and_the_reference_time():
+    set_reference_time(datetime(2026, 1, 1))
+    expected = [(shard * 3, reference_epoch()) for shard in range(40)]
+
+    inline = list(map_shards(_shard, range(40), {"workers": 1}, 3))
+    pooled = list(map_shards(_shard, range(40), {"workers": 3}, 3))
+
+    assert inline == expected
+    assert pooled == expected
+
+
+def test_output_does_not_depend_on_workers(generate):
+    single = dump(generate("single", workers=1))
+    sharded = dump(generate("sharded", workers=2))
+
+    assert single["tasks"] and single["activity_events"]
+    assert sharded == single
@@ -0,0 +1,116 @@
+import re
+import sqlite3
+
+import pytest
+
+from utils.pgdump import (
+    PostgresDumpSink,
+    check_constraints,
+    copy_text,
+    dependency_order,
+)
+from utils.sinks import POSTGRES_DUMP_FILE
+
+SCHEMA = """
+CREATE TABLE teams (
+    team_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE tasks (
+    task_id INTEGER PRIMARY KEY,
+    team_id TEXT NOT NULL REFERENCES teams (team_id),
+    name TEXT NOT NULL,
+    completed BOOLEAN NOT NULL DEFAULT 0,
+    CHECK (length(name) > (0))
+);
+CREATE INDEX idx_tasks_team ON tasks (team_id);
+"""
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    yield conn
+    conn.close()
+
+
+def _copy_block(dump: str, table: str) -> list:
+    match = re.search(
+        rf"^COPY {table} \([^)]*\) FROM stdin;\n(.*?)^\\\.$", dump, re.M | re.S
+    )
+    return match.group(1).splitlines()
+
+
+def test_copy_text_escapes_backslash_tab_and_line_breaks():
+    assert copy_text("a\\b\tc\nd\re") == "a\\\\b\\tc\\nd\\re"
+    assert copy_text(r"\N") == r"\\N"
+
+
+def test_check_constraints_keep_nested_parentheses():
+    assert check_constraints(SCHEMA) == ["length(name) > (0)"]
+
+
+def test_dependency_order_puts_parents_first(conn):
+    assert dependency_order(conn, ["tasks", "teams"]) == ["teams", "tasks"]
+
+
+def test_dump_escapes_values_and_writes_constraints_after_data(conn, tmp_path):
+    path = tmp_path / "dump.sql"
+    sink = PostgresDumpSink(conn, path)
+    sink.write("teams", ("team_id", "name"), [("t1", "Ops\tand\\Infra")])
+    sink.write(
+        "tasks",
+        ("task_id", "team_id", "name", "completed"),
+        [(None, "t1", "Line one\nline two", True), (None, "t1", r"\N", False)],
+    )
+    sink.close()
+
+    dump = path.read_text(encoding="utf-8")
+
+    assert _copy_block(dump, "teams") == ["t1\tOps\\tand\\\\Infra"]
+    # INTEGER PRIMARY KEY filled the way SQLite would, NULLs and text kept apart
+    assert _copy_block(dump, "tasks") == [
+        "1\tt1\tLine one\\nline two\tt",
+        "2\tt1\t\\\\N\tf",
+    ]
+    assert "completed boolean NOT NULL DEFAULT false" in dump
+
+    positions = {
+        statement: dump.index(statement)
+        for statement in (
+            "CREATE TABLE teams",
+            "CREATE TABLE tasks",
+            "COPY teams",
+            "COPY tasks",
+            "ALTER TABLE ONLY teams ADD PRIMARY KEY (team_id);",
+            "ALTER TABLE ONLY teams ADD UNIQUE (name);",
+            "ALTER TABLE ONLY tasks ADD CHECK (length(name) > (0));",
+            "ALTER TABLE ONLY tasks ADD FOREIGN KEY (team_id) "
+            "REFERENCES teams (team_id);",
+            "CREATE INDEX idx_tasks_team ON tasks (team_id);",
+            "COMMIT;",
+        )
+    }
+    assert list(positions.values()) == sorted(positions.values())
+    assert not list(tmp_path.glob("dump-*"))
+
+
+def test_generated_dump_copies_every_row(generate, tmp_path):
+    db_path = generate("pg", output_sinks="sqlite,postgres")
+    dump = (tmp_path / "pg.export" / POSTGRES_DUMP_FILE).read_text(encoding="utf-8")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        for (table,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name NOT LIKE 'sqlite_%'"
+        ):
+            count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            if count:
+                assert len(_copy_block(dump, table)) == count, table
+    finally:
+        conn.close()
+
+    first_constraint = dump.index("ALTER TABLE")
+    assert dump.rindex("\\.\n") < first_constraint
@@ -0,0 +1,135 @@
+import csv
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+from utils.sinks import (
+    CSVSink,
+    FanOutSink,
+    NDJSONSink,
+    Sink,
+    open_sinks,
+    parse_insert,
+    parse_sink_names,
+)
+
+COLUMNS = ("task_id", "name", "completed", "completed_at")
+ROWS = [
+    ("a", "Fix bug", True, "2026-01-01T00:00:00"),
+    ("b", 'Say "hi", twice', False, None),
+]
+
+
+class _Recorder(Sink):
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write(self, table, columns, rows):
+        self.batches.append((table, tuple(columns), list(rows)))
+
+    def close(self):
+        self.closed = True
+
+
+def test_parse_insert_reads_table_and_columns():
+    query = """
+        INSERT INTO tasks (
+            task_id,
+            name
+        )
+        VALUES (?, ?)
+    """
+
+    assert parse_insert(query) == ("tasks", ("task_id", "name"))
+    assert parse_insert("UPDATE tasks SET name = ?") is None
+
+
+def test_parse_sink_names_rejects_unknown_and_empty_lists():
+    assert parse_sink_names(" SQLite , csv") == ["sqlite", "csv"]
+
+    with pytest.raises(ValueError):
+        parse_sink_names("sqlite,excel")
+    with pytest.raises(ValueError):
+        parse_sink_names(" , ")
+
+
+def test_csv_sink_writes_header_nulls_and_booleans(tmp_path):
+    sink = CSVSink(tmp_path)
+    sink.write("tasks", COLUMNS, ROWS[:1])
+    sink.write("tasks", COLUMNS, ROWS[1:])
+    sink.write("tasks", COLUMNS, [])
+    sink.close()
+
+    with open(tmp_path / "tasks.csv", encoding="utf-8", newline="") as f:
+        assert list(csv.reader(f)) == [
+            list(COLUMNS),
+            ["a", "Fix bug", "1", "2026-01-01T00:00:00"],
+            ["b", 'Say "hi", twice', "0", ""],
+        ]
+
+
+def test_ndjson_sink_writes_one_object_per_row(tmp_path):
+    sink = NDJSONSink(tmp_path, compress=True)
+    sink.write("tasks", COLUMNS, ROWS)
+    sink.close()
+
+    with gzip.open(tmp_path / "tasks.ndjson.gz", "rt", encoding="utf-8") as f:
+        objects = [json.loads(line) for line in f]
+
+    assert objects == [dict(zip(COLUMNS, row)) for row in ROWS]
+
+
+def test_fan_out_sink_writes_and_closes_every_sink():
+    first, second = _Recorder(), _Recorder()
+    sink = FanOutSink([first, second])
+
+    sink.write("tasks", COLUMNS, ROWS)
+    sink.close()
+
+    for recorder in (first, second):
+        assert recorder.batches == [("tasks", COLUMNS, ROWS)]
+        assert recorder.closed
+
+
+def test_open_sinks_fans_out_over_several_sinks(tmp_path):
+    conn = sqlite3.connect(":memory:")
+
+    single = open_sinks(conn, {"output_sinks": "csv", "output_dir": tmp_path})
+    several = open_sinks(
+        conn, {"output_sinks": "sqlite,ndjson", "output_dir": tmp_path}
+    )
+
+    assert isinstance(single, CSVSink)
+    assert isinstance(several, FanOutSink)
+    assert [type(sink).__name__ for sink in several.sinks] == [
+        "SQLiteSink",
+        "NDJSONSink",
+    ]
+    conn.close()
+
+
+def test_flat_files_hold_the_database_rows(generate, tmp_path):
+    db_path = generate("export", output_sinks="sqlite,csv,ndjson")
+    export = tmp_path / "export.export"
+
+    conn = sqlite3.connect(db_path)
+    for table in ("users", "tasks", "comments", "activity_events"):
+        cursor = conn.execute(f"SELECT * FROM {table} ORDER BY rowid")
+        columns = [column[0] for column in cursor.description]
+        rows = cursor.fetchall()
+
+        with open(export / f"{table}.csv", encoding="utf-8", newline="") as f:
+            records = list(csv.reader(f))
+        assert records[0] == columns
+        assert records[1:] == [
+            ["" if value is None else str(value) for value in row] for row in rows
+        ]
+
+        with open(export / f"{table}.ndjson", encoding="utf-8") as f:
+            objects = [json.loads(line) for line in f]
+        # Booleans come back as true/false, equal to SQLite's 1/0
+        assert [tuple(obj.values()) for obj in objects] == rows
+    conn.close()
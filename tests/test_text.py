@@ -0,0 +1,75 @@
+import json
+import stat
+
+import pytest
+
+from generators.projects import PROJECT_TYPES
+from generators.text_grammar import (
+    GRAMMAR,
+    SLOTS,
+    comment_body,
+    describe_task,
+    task_slot,
+)
+from utils.text import TextEngine, compile_grammar, load_text_engine
+
+TOY = {
+    "greeting": ["{hello}, {name}!", "{hello} {name}"],
+    "hello": ["Hi", "Hello", "Hey"],
+    "support.hello": ["Dear"],
+}
+
+
+def test_texts_are_a_function_of_the_key():
+    engine = TextEngine(compile_grammar(TOY, ["default", "support"], ["name"]))
+    keys = [i * 0x9E3779B97F4A7C15 % (1 << 64) for i in range(50)]
+
+    texts = engine.render_many("default", "greeting", keys, [("Ada",)] * 50)
+    assert texts == [engine.render("default", "greeting", key, "Ada") for key in keys]
+    assert len(set(texts)) == 6
+
+    # Overrides apply within their context only
+    assert {
+        text.split()[0].rstrip(",")
+        for text in engine.render_many("support", "greeting", keys, [("Ada",)] * 50)
+    } == {"Dear"}
+
+
+def test_grammar_errors_are_reported():
+    with pytest.raises(ValueError):
+        compile_grammar({"a": ["{b}"]}, ["default"])
+    with pytest.raises(ValueError):
+        compile_grammar({"a": ["{a}"]}, ["default"])
+
+
+def test_generated_texts_match_a_freshly_compiled_grammar():
+    engine = TextEngine(compile_grammar(GRAMMAR, PROJECT_TYPES, SLOTS))
+
+    for project_type in PROJECT_TYPES:
+        for key in (0, 42, (1 << 64) - 1):
+            assert describe_task(project_type, "Fix bug", key) == engine.render(
+                project_type, "description", key, task_slot("Fix bug")
+            )
+            assert comment_body(project_type, key) == engine.render(
+                project_type, "comment", key
+            )
+
+
+def test_compiled_grammar_cache_is_rebuilt_and_world_readable(tmp_path):
+    path = tmp_path / "cache" / "grammar.json"
+
+    engine = load_text_engine(GRAMMAR, PROJECT_TYPES, SLOTS, path)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert not list(path.parent.glob("*.partial"))
+
+    # A stale or corrupt cache is recompiled, not trusted
+    path.write_text(json.dumps({"digest": "stale"}), encoding="utf-8")
+    rebuilt = load_text_engine(GRAMMAR, PROJECT_TYPES, SLOTS, path)
+    path.write_text("{not json", encoding="utf-8")
+    recovered = load_text_engine(GRAMMAR, PROJECT_TYPES, SLOTS, path)
+
+    project_type = PROJECT_TYPES[-1]
+    expected = engine.render(project_type, "description", 7, '"Fix bug"')
+    assert rebuilt.render(project_type, "description", 7, '"Fix bug"') == expected
+    assert recovered.render(project_type, "description", 7, '"Fix bug"') == expected
+    assert json.loads(path.read_text(encoding="utf-8"))["digest"] == engine.digest
@@ -0,0 +1,39 @@
+import re
+import uuid
+
+import pytest
+
+from conftest import dump
+
+np = pytest.importorskip("numpy")
+
+from generators.vectorized import batch_rng, uuid_strings  # noqa: E402
+
+
+def test_uuid_strings_are_version_4():
+    ids = uuid_strings(batch_rng(7, "test", 0), 50)
+
+    assert len(set(ids)) == 50
+    for value in ids:
+        assert re.fullmatch(r"[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}", value)
+        assert uuid.UUID(value).version == 4
+
+
+def test_backends_write_the_configured_row_counts(generate):
+    counts = {}
+    for backend in ("python", "numpy"):
+        tables = dump(generate(backend, generation_backend=backend))
+        counts[backend] = {table: len(rows) for table, rows in tables.items()}
+
+    # Sizes fixed by the settings; the rest depend on each backend's draws
+    for table in ("organizations", "users", "teams", "projects", "sections", "tasks"):
+        assert counts["numpy"][table] == counts["python"][table]
+    assert counts["python"]["tasks"] == 3 * 2 * 12
+    assert all(counts["numpy"].values())
+
+
+def test_numpy_output_does_not_depend_on_workers(generate):
+    single = dump(generate("single", generation_backend="numpy", workers=1))
+    sharded = dump(generate("sharded", generation_backend="numpy", workers=2))
+
+    assert sharded == single
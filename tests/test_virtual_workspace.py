@@ -0,0 +1,49 @@
+import sqlite3
+
+import main
+from utils.random import EntityIds, entity_rng
+from virtual_workspace import VirtualWorkspace
+
+
+def _rows(conn, query: str, *params) -> list:
+    return conn.execute(query, params).fetchall()
+
+
+def test_entity_streams_do_not_depend_on_access_order():
+    forward = [entity_rng(7, "task", i).random() for i in range(20)]
+    backward = [entity_rng(7, "task", i).random() for i in reversed(range(20))]
+
+    assert forward == backward[::-1]
+    assert len(set(forward)) == 20
+    assert EntityIds(7, "task", 20)[13] == EntityIds(7, "task", 20)[-7]
+
+
+def test_virtual_workspace_matches_the_generated_rows(generate):
+    conn = sqlite3.connect(generate("virtual"))
+    workspace = VirtualWorkspace(main.load_config())
+
+    # Random access, last task first
+    for index in reversed(range(workspace.num_tasks)):
+        task = workspace.task(index)
+        task_id = task["task_id"]
+
+        assert _rows(conn, "SELECT * FROM tasks WHERE task_id = ?", task_id) == [
+            tuple(task.values())
+        ]
+        assert _rows(
+            conn, "SELECT * FROM comments WHERE task_id = ? ORDER BY rowid", task_id
+        ) == [tuple(comment.values()) for comment in workspace.comments(index)]
+        assert _rows(
+            conn,
+            "SELECT task_id, event_type, actor_id, section_id, assignee_id, "
+            "occurred_at FROM activity_events WHERE task_id = ? ORDER BY event_id",
+            task_id,
+        ) == [tuple(event.values()) for event in workspace.activity(index)]
+
+    for index in range(workspace.num_users):
+        user = workspace.user(index)
+        assert _rows(
+            conn, "SELECT * FROM users WHERE user_id = ?", user["user_id"]
+        ) == [tuple(user.values())]
+
+    conn.close()